@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+
+LENGTH_BUCKETS = (256, 1024, 4096, 16384)
+
+
+@dataclass(slots=True, frozen=True)
+class AttemptTimeouts:
+    connect: float
+    read: float
+    bucket: str
+    samples: int
+
+
+def length_bucket(prompt_chars: int) -> str:
+    for limit in LENGTH_BUCKETS:
+        if prompt_chars <= limit:
+            return f"le_{limit}"
+    return f"gt_{LENGTH_BUCKETS[-1]}"
+
+
+def _quantile(ordered: list[float], quantile: float) -> float:
+    index = min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))
+    return ordered[index]
+
+
+class AdaptiveTimeouts:
+    """Per-attempt read timeouts derived from recent upstream latency.
+
+    Latencies are kept in a fixed-size window per (model, prompt length bucket). Once a
+    window has ``min_samples`` entries the read timeout is ``quantile(latency) * factor``
+    clamped to ``[floor, ceiling]``; until then ``default`` is used. Timed-out attempts are
+    recorded at their timeout so a degrading upstream widens the next timeouts.
+    """
+
+    def __init__(
+        self,
+        *,
+        default: float = 15.0,
+        connect: float = 3.0,
+        floor: float = 2.0,
+        ceiling: float = 15.0,
+        quantile: float = 0.99,
+        factor: float = 1.5,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> None:
+        self._default = default
+        self._connect = connect
+        self._floor = floor
+        self._ceiling = ceiling
+        self._quantile = quantile
+        self._factor = factor
+        self._window = window
+        self._min_samples = min_samples
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    def timeouts_for(self, model: str, prompt_chars: int) -> AttemptTimeouts:
+        bucket = length_bucket(prompt_chars)
+        samples = self._samples.get((model, bucket))
+        if samples is None or len(samples) < self._min_samples:
+            read = min(self._ceiling, self._default)
+            return AttemptTimeouts(self._connect, read, bucket, len(samples) if samples else 0)
+        estimate = _quantile(sorted(samples), self._quantile) * self._factor
+        read = min(self._ceiling, max(self._floor, estimate))
+        return AttemptTimeouts(self._connect, read, bucket, len(samples))
+
+    def observe(self, model: str, prompt_chars: int, latency_seconds: float) -> None:
+        key = (model, length_bucket(prompt_chars))
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self._window)
+        samples.append(latency_seconds)
+
+    def snapshot(self) -> dict:
+        buckets = {}
+        for (model, bucket), samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            buckets[f"{model}|{bucket}"] = {
+                "samples": len(ordered),
+                "p50_seconds": round(_quantile(ordered, 0.5), 4),
+                "p99_seconds": round(_quantile(ordered, 0.99), 4),
+                "read_timeout_seconds": round(self.timeouts_for(model, _bucket_probe(bucket)).read, 4),
+            }
+        return {"connect_timeout_seconds": self._connect, "buckets": buckets}
+
+
+def _bucket_probe(bucket: str) -> int:
+    limit = int(bucket.split("_", 1)[1])
+    return limit if bucket.startswith("le_") else limit + 1
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Protocol, runtime_checkable
+
+from .models import TranslateRequest
+from .translation_memory import TranslationMemory, guard_tokens, normalize_text
+
+BACKEND_OPENROUTER = "openrouter"
+BACKEND_TRANSLATION_MEMORY = "translation_memory"
+BACKEND_PHRASE_TABLE = "phrase_table"
+
+
+@dataclass(slots=True, frozen=True)
+class BackendCapabilities:
+    prompt_based: bool = True
+    remote: bool = True
+    supports_context: bool = True
+    directions: tuple[str, ...] = ("incoming", "outgoing")
+    # Results are a near match for another text, not a translation of this one.
+    approximate: bool = False
+
+
+@runtime_checkable
+class TranslationBackend(Protocol):
+    """Anything that can turn a translation request into text.
+
+    Prompt-based backends receive the chat-completion ``messages``; other backends
+    (``capabilities().prompt_based`` is False) also receive the parsed ``request``.
+    """
+
+    name: str
+
+    async def translate(self, *, messages: list[dict[str, Any]], request_id: str, **options: Any) -> Any: ...
+
+    async def health(self) -> dict: ...
+
+    def capabilities(self) -> BackendCapabilities: ...
+
+
+class BackendMiss(Exception):
+    """Raised by offline backends that have no translation for a request."""
+
+
+_PHRASE_STRIP = re.compile(r"[\s!?.,;:…]+$")
+
+
+def _phrase_key(text: str) -> str:
+    return _PHRASE_STRIP.sub("", " ".join(text.lower().split()))
+
+
+class PhraseTableBackend:
+    """Offline exact-match lookup in a JSON phrase table ``{direction: {source: target}}``."""
+
+    def __init__(self, path: Path, *, name: str = BACKEND_PHRASE_TABLE) -> None:
+        self.name = name
+        self._path = path
+        self._table: dict[str, dict[str, str]] = {}
+        if path.exists():
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            self._table = {
+                direction: {_phrase_key(source): target for source, target in phrases.items()}
+                for direction, phrases in raw.items()
+                if isinstance(phrases, dict)
+            }
+
+    async def translate(self, *, messages, request_id, request: TranslateRequest | None = None, **_: Any) -> str:
+        if request is None:
+            raise BackendMiss("phrase table needs the request")
+        translated = self._table.get(request.direction, {}).get(_phrase_key(request.text))
+        if translated is None:
+            raise BackendMiss("no phrase table entry")
+        return translated
+
+    async def health(self) -> dict:
+        return {"ok": bool(self._table), "phrases": sum(len(phrases) for phrases in self._table.values())}
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities(prompt_based=False, remote=False, supports_context=False)
+
+
+class TranslationMemoryBackend:
+    """Offline fallback that serves the closest translation-memory match above ``min_similarity``.
+
+    Matches whose numbers or negations differ from the request are misses, as for direct hits.
+    """
+
+    def __init__(
+        self,
+        memory: TranslationMemory,
+        *,
+        min_similarity: float = 0.9,
+        name: str = BACKEND_TRANSLATION_MEMORY,
+    ) -> None:
+        self.name = name
+        self._memory = memory
+        self._min_similarity = min_similarity
+
+    async def translate(self, *, messages, request_id, request: TranslateRequest | None = None, **_: Any) -> str:
+        if request is None:
+            raise BackendMiss("translation memory needs the request")
+        matches = self._memory.lookup(request.direction, request.text, limit=1, min_similarity=self._min_similarity)
+        if not matches:
+            raise BackendMiss("no translation memory match")
+        if guard_tokens(normalize_text(request.text)) != guard_tokens(normalize_text(matches[0].source_text)):
+            raise BackendMiss("translation memory match differs in numbers or negation")
+        return matches[0].translated_text
+
+    async def health(self) -> dict:
+        return {"ok": True, "entries": len(self._memory)}
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities(prompt_based=False, remote=False, supports_context=False, approximate=True)
+
+
+@dataclass(slots=True)
+class BackendTier:
+    backend: Any
+    timeout_seconds: float | None = None
+    name: str = ""
+
+    def __post_init__(self) -> None:
+        self.name = self.name or getattr(self.backend, "name", type(self.backend).__name__)
+
+
+@dataclass(slots=True)
+class _TierStats:
+    attempts: int = 0
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    total_ms: float = 0.0
+
+    def add(self, latency_ms: float, result: str) -> None:
+        self.attempts += 1
+        self.total_ms += latency_ms
+        setattr(self, result, getattr(self, result) + 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "hit_rate": round(self.hits / self.attempts, 6) if self.attempts else 0.0,
+            "average_latency_ms": round(self.total_ms / self.attempts, 3) if self.attempts else 0.0,
+        }
+
+
+@dataclass(slots=True)
+class ChainHit:
+    backend: str
+    translated_text: str
+    usage: Any = None
+    degraded: bool = False
+
+
+class BackendChain:
+    """Ordered fallback tiers tried once each after the primary backend has given up."""
+
+    def __init__(self, tiers: list[BackendTier], *, primary_name: str = BACKEND_OPENROUTER, logger=None) -> None:
+        self.tiers = tiers
+        self._primary_name = primary_name
+        self._logger = logger
+        self._stats: dict[str, _TierStats] = {primary_name: _TierStats()}
+        for tier in tiers:
+            self._stats[tier.name] = _TierStats()
+
+    @classmethod
+    def from_config(
+        cls,
+        config: dict,
+        *,
+        remote_factory: Callable[[dict], Any],
+        translation_memory: TranslationMemory | None,
+        base_dir: Path,
+        logger=None,
+    ) -> BackendChain | None:
+        """Build the fallback tiers from the ``backends`` config section.
+
+        ``remote_factory`` turns an ``openrouter`` entry into a client; entries without a
+        model, and memory entries when translation memory is disabled, are skipped.
+        """
+        if not config or not config.get("enabled", True):
+            return None
+        tiers = []
+        for entry in config.get("chain", []):
+            kind = entry.get("type")
+            timeout = float(entry.get("timeout_seconds", 0)) or None
+            if kind == BACKEND_OPENROUTER:
+                if not entry.get("model"):
+                    continue
+                backend = remote_factory(entry)
+            elif kind == BACKEND_TRANSLATION_MEMORY:
+                if translation_memory is None:
+                    continue
+                backend = TranslationMemoryBackend(
+                    translation_memory, min_similarity=float(entry.get("min_similarity", 0.9))
+                )
+            elif kind == BACKEND_PHRASE_TABLE:
+                path = Path(entry.get("file", "config/phrase_table.json"))
+                backend = PhraseTableBackend(path if path.is_absolute() else base_dir / path)
+            else:
+                raise ValueError(f"unknown backend type {kind!r}")
+            tiers.append(BackendTier(backend, timeout, name=entry.get("name", "")))
+        return cls(tiers, logger=logger) if tiers else None
+
+    async def close(self) -> None:
+        for tier in self.tiers:
+            close = getattr(tier.backend, "close", None)
+            if close is not None:
+                await close()
+
+    def record_primary(self, latency_ms: float, success: bool) -> None:
+        self._stats[self._primary_name].add(latency_ms, "hits" if success else "errors")
+
+    async def run(
+        self,
+        request: TranslateRequest,
+        messages: list[dict[str, Any]],
+        request_id: str,
+        *,
+        validate: Callable[[str], str | None] | None = None,
+    ) -> ChainHit | None:
+        """Return the first usable tier result; ``validate`` names a failed check to skip a result."""
+        for tier in self.tiers:
+            capabilities = tier.backend.capabilities()
+            if request.direction not in capabilities.directions:
+                continue
+            kwargs: dict[str, Any] = {} if capabilities.prompt_based else {"request": request}
+            started = time.perf_counter()
+            try:
+                call = tier.backend.translate(messages=messages, request_id=request_id, **kwargs)
+                result = await asyncio.wait_for(call, tier.timeout_seconds) if tier.timeout_seconds else await call
+            except BackendMiss:
+                self._stats[tier.name].add((time.perf_counter() - started) * 1000.0, "misses")
+                continue
+            except asyncio.TimeoutError:
+                self._stats[tier.name].add((time.perf_counter() - started) * 1000.0, "timeouts")
+                self._log("request_id=%s backend=%s outcome=backend_timeout", request_id, tier.name)
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._stats[tier.name].add((time.perf_counter() - started) * 1000.0, "errors")
+                self._log("request_id=%s backend=%s outcome=backend_error error=%s", request_id, tier.name, exc)
+                continue
+            text, usage = getattr(result, "content", result), getattr(result, "usage", None)
+            if not text or not text.strip():
+                self._stats[tier.name].add((time.perf_counter() - started) * 1000.0, "misses")
+                continue
+            failed_check = validate(text.strip()) if validate is not None else None
+            if failed_check is not None:
+                self._stats[tier.name].add((time.perf_counter() - started) * 1000.0, "rejected")
+                self._log(
+                    "request_id=%s backend=%s outcome=backend_rejected check=%s", request_id, tier.name, failed_check
+                )
+                continue
+            self._stats[tier.name].add((time.perf_counter() - started) * 1000.0, "hits")
+            return ChainHit(
+                backend=tier.name, translated_text=text.strip(), usage=usage, degraded=capabilities.approximate
+            )
+        return None
+
+    async def health(self) -> dict:
+        health = {}
+        for tier in self.tiers:
+            try:
+                health[tier.name] = await tier.backend.health()
+            except Exception as exc:
+                health[tier.name] = {"ok": False, "error": str(exc)}
+        return health
+
+    def snapshot(self) -> dict:
+        return {"tiers": {name: stats.snapshot() for name, stats in self._stats.items()}}
+
+    def _log(self, message: str, *args: Any) -> None:
+        if self._logger is not None:
+            self._logger.warning(message, *args)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -11,6 +11,9 @@ CONFIG_ROOT = PROJECT_ROOT / "config"
 DEFAULT_CONFIG_FILE = CONFIG_ROOT / "proxy.config.json"
 DEFAULT_LOG_FILE = SERVER_ROOT / "server.log"
 DEFAULT_SYSTEM_PROMPT_FILE = SERVER_ROOT / "system_prompt.txt"
+DEFAULT_USAGE_ROLLUP_FILE = SERVER_ROOT / "usage_rollup.jsonl"
+DEFAULT_TRACE_FILE = SERVER_ROOT / "traces" / "translate_trace.jsonl"
+DEFAULT_SUMMARIES_MODEL = "google/gemini-2.5-flash-lite"
 
 
 @dataclass(slots=True)
@@ -25,6 +28,80 @@ class Settings:
     log_file: Path
     system_prompt_file: Path
     disable_reasoning: bool
+    translation_memory_enabled: bool = True
+    translation_memory_max_entries: int = 200_000
+    translation_memory_direct_threshold: float = 0.92
+    translation_memory_hint_threshold: float = 0.5
+    translation_memory_max_hints: int = 3
+    usage_rollup_file: Path | None = None
+    usage_rollup_interval_seconds: float = 300.0
+    usage_rollup_max_bytes: int = 5_000_000
+    usage_rollup_backup_count: int = 3
+    chat_hash_secret: str | None = None
+    result_cache_max_entries: int = 10_000
+    result_cache_ttl_seconds: float = 3600.0
+    prefetch_enabled: bool = True
+    prefetch_max_queue_size: int = 500
+    prefetch_workers: int = 1
+    prefetch_idle_inflight_threshold: int = 2
+    ws_max_inflight: int = 16
+    retry_config: dict = field(default_factory=dict)
+    adaptive_timeouts_enabled: bool = True
+    connect_timeout_seconds: float = 3.0
+    timeout_floor_seconds: float = 2.0
+    timeout_quantile: float = 0.99
+    timeout_factor: float = 1.5
+    timeout_window: int = 200
+    timeout_min_samples: int = 20
+    jobs_enabled: bool = True
+    jobs_default_slo_ms: int = 0
+    jobs_max_entries: int = 1000
+    jobs_retention_seconds: float = 600.0
+    jobs_max_wait_seconds: float = 30.0
+    summaries_enabled: bool = True
+    summaries_model: str | None = DEFAULT_SUMMARIES_MODEL
+    summaries_every_n_turns: int = 10
+    summaries_keep_raw_turns: int = 6
+    summaries_min_context_turns: int = 20
+    summaries_max_chats: int = 2000
+    summaries_max_chars: int = 1200
+    routing_config: dict = field(default_factory=dict)
+    trace_enabled: bool = False
+    trace_file: Path = DEFAULT_TRACE_FILE
+    trace_max_bytes: int = 20_000_000
+    trace_backup_count: int = 5
+    trace_sample_rate: float = 1.0
+    scheduler_enabled: bool = True
+    scheduler_max_concurrency: int = 8
+    scheduler_per_chat_inflight: int = 2
+    scheduler_quantum: float = 2.0
+    scheduler_cost_chars: int = 2000
+    scheduler_weights: dict = field(default_factory=dict)
+    scheduler_top_k: int = 10
+    drafts_enabled: bool = True
+    drafts_debounce_ms: int = 250
+    drafts_max_entries: int = 1000
+    drafts_history_size: int = 8
+    backends_config: dict = field(default_factory=dict)
+    peers_enabled: bool = False
+    peers_self_url: str = ""
+    peers_nodes: list = field(default_factory=list)
+    peers_timeout_ms: int = 150
+    peers_fill_wait_ms: int = 10_000
+    peers_lease_seconds: float = 30.0
+    peers_virtual_nodes: int = 64
+    peers_token: str = ""
+    health_probe_enabled: bool = False
+    health_probe_interval_seconds: float = 300.0
+    health_probe_timeout_seconds: float = 5.0
+    health_probe_failure_threshold: int = 3
+    health_probe_degraded_latency_ms: float = 5000.0
+    health_probe_max_per_hour: int = 12
+    validation_config: dict = field(default_factory=dict)
+    limits_max_body_bytes: int = 2 * 1024 * 1024
+    limits_max_text_bytes: int = 32 * 1024
+    limits_max_context_message_bytes: int = 4 * 1024
+    limits_max_context_bytes: int = 32 * 1024
 
     @property
     def openrouter_configured(self) -> bool:
@@ -40,6 +117,10 @@ def _load_json_config(path: Path) -> dict:
         return {}
 
 
+def _as_bool(value) -> bool:
+    return str(value).lower() in {"1", "true", "yes", "on"}
+
+
 def _resolve_path(value: str | Path, *, base: Path) -> Path:
     path = value if isinstance(value, Path) else Path(value)
     if path.is_absolute():
@@ -54,6 +135,19 @@ def load_settings(config_path: Path | None = None) -> Settings:
     server_cfg = file_config.get("server", {})
     openrouter_cfg = file_config.get("openrouter", {})
     logging_cfg = file_config.get("logging", {})
+    memory_cfg = file_config.get("translation_memory", {})
+    usage_cfg = file_config.get("usage", {})
+    cache_cfg = file_config.get("result_cache", {})
+    prefetch_cfg = file_config.get("prefetch", {})
+    timeouts_cfg = file_config.get("timeouts", {})
+    jobs_cfg = file_config.get("jobs", {})
+    summaries_cfg = file_config.get("summaries", {})
+    trace_cfg = file_config.get("trace", {})
+    scheduler_cfg = file_config.get("scheduler", {})
+    drafts_cfg = file_config.get("drafts", {})
+    peers_cfg = file_config.get("peers", {})
+    probe_cfg = file_config.get("health_probe", {})
+    limits_cfg = file_config.get("limits", {})
 
     bind_host = os.getenv("BIND_HOST", server_cfg.get("bind_host", "0.0.0.0"))
     port = int(os.getenv("PROXY_PORT", server_cfg.get("port", 8080)))
@@ -72,6 +166,7 @@ def load_settings(config_path: Path | None = None) -> Settings:
         os.getenv("SYSTEM_PROMPT_FILE", str(server_cfg.get("system_prompt_file", DEFAULT_SYSTEM_PROMPT_FILE))),
         base=PROJECT_ROOT,
     )
+    usage_rollup_file = os.getenv("USAGE_ROLLUP_FILE", usage_cfg.get("rollup_file", str(DEFAULT_USAGE_ROLLUP_FILE)))
 
     return Settings(
         bind_host=bind_host,
@@ -86,6 +181,96 @@ def load_settings(config_path: Path | None = None) -> Settings:
         log_level=log_level,
         log_file=log_file,
         system_prompt_file=system_prompt_file,
-        disable_reasoning=str(os.getenv("DISABLE_REASONING", str(openrouter_cfg.get("disable_reasoning", True)))).lower()
-        in {"1", "true", "yes", "on"},
+        disable_reasoning=_as_bool(os.getenv("DISABLE_REASONING", openrouter_cfg.get("disable_reasoning", True))),
+        translation_memory_enabled=_as_bool(
+            os.getenv("TRANSLATION_MEMORY_ENABLED", memory_cfg.get("enabled", True))
+        ),
+        translation_memory_max_entries=int(
+            os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", memory_cfg.get("max_entries", 200_000))
+        ),
+        translation_memory_direct_threshold=float(
+            os.getenv("TRANSLATION_MEMORY_DIRECT_THRESHOLD", memory_cfg.get("direct_threshold", 0.92))
+        ),
+        translation_memory_hint_threshold=float(
+            os.getenv("TRANSLATION_MEMORY_HINT_THRESHOLD", memory_cfg.get("hint_threshold", 0.5))
+        ),
+        translation_memory_max_hints=int(memory_cfg.get("max_hints", 3)),
+        usage_rollup_file=_resolve_path(usage_rollup_file, base=PROJECT_ROOT) if usage_rollup_file else None,
+        usage_rollup_interval_seconds=float(
+            os.getenv("USAGE_ROLLUP_INTERVAL_SECONDS", usage_cfg.get("rollup_interval_seconds", 300))
+        ),
+        usage_rollup_max_bytes=int(usage_cfg.get("rollup_max_bytes", 5_000_000)),
+        usage_rollup_backup_count=int(usage_cfg.get("rollup_backup_count", 3)),
+        chat_hash_secret=os.getenv("CHAT_HASH_SECRET", usage_cfg.get("chat_hash_secret")) or None,
+        result_cache_max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", cache_cfg.get("max_entries", 10_000))),
+        result_cache_ttl_seconds=float(cache_cfg.get("ttl_seconds", 3600)),
+        prefetch_enabled=_as_bool(os.getenv("PREFETCH_ENABLED", prefetch_cfg.get("enabled", True))),
+        prefetch_max_queue_size=int(prefetch_cfg.get("max_queue_size", 500)),
+        prefetch_workers=int(prefetch_cfg.get("workers", 1)),
+        prefetch_idle_inflight_threshold=int(prefetch_cfg.get("idle_inflight_threshold", 2)),
+        ws_max_inflight=int(os.getenv("WS_MAX_INFLIGHT", server_cfg.get("ws_max_inflight", 16))),
+        retry_config=file_config.get("retry", {}),
+        adaptive_timeouts_enabled=_as_bool(os.getenv("ADAPTIVE_TIMEOUTS", timeouts_cfg.get("adaptive", True))),
+        connect_timeout_seconds=float(os.getenv("CONNECT_TIMEOUT_SECONDS", timeouts_cfg.get("connect_seconds", 3))),
+        timeout_floor_seconds=float(timeouts_cfg.get("floor_seconds", 2)),
+        timeout_quantile=float(timeouts_cfg.get("quantile", 0.99)),
+        timeout_factor=float(timeouts_cfg.get("factor", 1.5)),
+        timeout_window=int(timeouts_cfg.get("window", 200)),
+        timeout_min_samples=int(timeouts_cfg.get("min_samples", 20)),
+        jobs_enabled=_as_bool(os.getenv("JOBS_ENABLED", jobs_cfg.get("enabled", True))),
+        jobs_default_slo_ms=int(os.getenv("JOBS_DEFAULT_SLO_MS", jobs_cfg.get("default_slo_ms", 0))),
+        jobs_max_entries=int(jobs_cfg.get("max_jobs", 1000)),
+        jobs_retention_seconds=float(jobs_cfg.get("retention_seconds", 600)),
+        jobs_max_wait_seconds=float(jobs_cfg.get("max_wait_seconds", 30)),
+        summaries_enabled=_as_bool(os.getenv("SUMMARIES_ENABLED", summaries_cfg.get("enabled", True))),
+        summaries_model=os.getenv("SUMMARIES_MODEL", summaries_cfg.get("model", DEFAULT_SUMMARIES_MODEL)) or None,
+        summaries_every_n_turns=int(summaries_cfg.get("every_n_turns", 10)),
+        summaries_keep_raw_turns=int(summaries_cfg.get("keep_raw_turns", 6)),
+        summaries_min_context_turns=int(summaries_cfg.get("min_context_turns", 20)),
+        summaries_max_chats=int(summaries_cfg.get("max_chats", 2000)),
+        summaries_max_chars=int(summaries_cfg.get("max_summary_chars", 1200)),
+        routing_config=file_config.get("routing", {}),
+        trace_enabled=_as_bool(os.getenv("TRACE_ENABLED", trace_cfg.get("enabled", False))),
+        trace_file=_resolve_path(
+            os.getenv("TRACE_FILE", trace_cfg.get("file", str(DEFAULT_TRACE_FILE))),
+            base=PROJECT_ROOT,
+        ),
+        trace_max_bytes=int(trace_cfg.get("max_bytes", 20_000_000)),
+        trace_backup_count=int(trace_cfg.get("backup_count", 5)),
+        trace_sample_rate=float(trace_cfg.get("sample_rate", 1.0)),
+        scheduler_enabled=_as_bool(os.getenv("SCHEDULER_ENABLED", scheduler_cfg.get("enabled", True))),
+        scheduler_max_concurrency=int(
+            os.getenv("UPSTREAM_MAX_CONCURRENCY", scheduler_cfg.get("max_concurrency", 8))
+        ),
+        scheduler_per_chat_inflight=int(scheduler_cfg.get("per_chat_inflight", 2)),
+        scheduler_quantum=float(scheduler_cfg.get("quantum", 2.0)),
+        scheduler_cost_chars=int(scheduler_cfg.get("cost_chars", 2000)),
+        scheduler_weights={str(key): float(value) for key, value in (scheduler_cfg.get("weights") or {}).items()},
+        scheduler_top_k=int(scheduler_cfg.get("top_k", 10)),
+        drafts_enabled=_as_bool(os.getenv("DRAFTS_ENABLED", drafts_cfg.get("enabled", True))),
+        drafts_debounce_ms=int(os.getenv("DRAFTS_DEBOUNCE_MS", drafts_cfg.get("debounce_ms", 250))),
+        drafts_max_entries=int(drafts_cfg.get("max_drafts", 1000)),
+        drafts_history_size=int(drafts_cfg.get("history_size", 8)),
+        backends_config=file_config.get("backends", {}),
+        peers_enabled=_as_bool(os.getenv("PEERS_ENABLED", peers_cfg.get("enabled", False))),
+        peers_self_url=os.getenv("PEER_SELF_URL", peers_cfg.get("self_url", "")),
+        peers_nodes=[str(url) for url in peers_cfg.get("nodes", [])],
+        peers_timeout_ms=int(peers_cfg.get("timeout_ms", 150)),
+        peers_fill_wait_ms=int(peers_cfg.get("fill_wait_ms", 10_000)),
+        peers_lease_seconds=float(peers_cfg.get("lease_seconds", 30.0)),
+        peers_virtual_nodes=int(peers_cfg.get("virtual_nodes", 64)),
+        peers_token=os.getenv("PEER_TOKEN", peers_cfg.get("token", "")),
+        health_probe_enabled=_as_bool(os.getenv("HEALTH_PROBE_ENABLED", probe_cfg.get("enabled", False))),
+        health_probe_interval_seconds=float(
+            os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", probe_cfg.get("interval_seconds", 300.0))
+        ),
+        health_probe_timeout_seconds=float(probe_cfg.get("timeout_seconds", 5.0)),
+        health_probe_failure_threshold=int(probe_cfg.get("failure_threshold", 3)),
+        health_probe_degraded_latency_ms=float(probe_cfg.get("degraded_latency_ms", 5000.0)),
+        health_probe_max_per_hour=int(probe_cfg.get("max_probes_per_hour", 12)),
+        validation_config=file_config.get("validation", {}),
+        limits_max_body_bytes=int(os.getenv("MAX_BODY_BYTES", limits_cfg.get("max_body_bytes", 2 * 1024 * 1024))),
+        limits_max_text_bytes=int(os.getenv("MAX_TEXT_BYTES", limits_cfg.get("max_text_bytes", 32 * 1024))),
+        limits_max_context_message_bytes=int(limits_cfg.get("max_context_message_bytes", 4 * 1024)),
+        limits_max_context_bytes=int(limits_cfg.get("max_context_bytes", 32 * 1024)),
     )
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from .models import TranslateRequest, TranslateResponse
+
+TranslateFunc = Callable[[TranslateRequest], Awaitable[TranslateResponse]]
+
+
+@dataclass(slots=True)
+class _DraftAttempt:
+    task: asyncio.Task | None = None
+    started_upstream: bool = False
+
+
+@dataclass(slots=True)
+class _DraftState:
+    current: _DraftAttempt | None = None
+    history: OrderedDict[str, TranslateResponse] = field(default_factory=OrderedDict)
+
+
+class DraftCoordinator:
+    """Translate-as-you-type previews for outgoing drafts keyed by (chat_id, draft_id).
+
+    Each draft waits ``debounce_seconds`` before it is translated. A newer draft for the
+    same key cancels the older one, including its in-flight upstream call and any pending
+    retry sleeps, and the superseded caller gets its text back with ``superseded`` set.
+    Finished translations are kept per draft, so returning to an earlier text (for example
+    after a backspace or a trailing space) needs no upstream call. Partial prefixes are
+    never spliced, because a translation of a prefix is not a prefix of the translation.
+    """
+
+    def __init__(
+        self,
+        *,
+        debounce_seconds: float = 0.25,
+        max_drafts: int = 1000,
+        history_size: int = 8,
+    ) -> None:
+        self._debounce_seconds = debounce_seconds
+        self._max_drafts = max_drafts
+        self._history_size = history_size
+        self._drafts: OrderedDict[tuple[str, str], _DraftState] = OrderedDict()
+        self._started = 0
+        self._completed = 0
+        self._reused = 0
+        self._superseded_before_upstream = 0
+        self._superseded_inflight = 0
+
+    async def run(self, request: TranslateRequest, translate: TranslateFunc) -> TranslateResponse:
+        key = (request.chat_id or "", request.draft_id or "")
+        state = self._drafts.get(key)
+        if state is None:
+            state = self._drafts[key] = _DraftState()
+            self._evict()
+        else:
+            self._drafts.move_to_end(key)
+        self._started += 1
+
+        if state.current is not None and state.current.task is not None:
+            state.current.task.cancel()
+            state.current = None
+
+        normalized = request.text.strip()
+        cached = state.history.get(normalized)
+        if cached is not None:
+            state.history.move_to_end(normalized)
+            self._reused += 1
+            return cached.model_copy(update={"original_text": request.text})
+
+        attempt = _DraftAttempt()
+        attempt.task = asyncio.create_task(self._debounced(attempt, request, translate))
+        state.current = attempt
+        try:
+            await asyncio.wait({attempt.task})
+        except asyncio.CancelledError:
+            attempt.task.cancel()
+            raise
+        finally:
+            if state.current is attempt and attempt.task.done():
+                state.current = None
+
+        if attempt.task.cancelled():
+            if attempt.started_upstream:
+                self._superseded_inflight += 1
+            else:
+                self._superseded_before_upstream += 1
+            return TranslateResponse(
+                translated_text=request.text,
+                original_text=request.text,
+                direction=request.direction,
+                translation_failed=True,
+                superseded=True,
+            )
+
+        response = attempt.task.result()
+        self._completed += 1
+        if not response.translation_failed and normalized:
+            state.history[normalized] = response
+            while len(state.history) > self._history_size:
+                state.history.popitem(last=False)
+        return response
+
+    def snapshot(self) -> dict:
+        superseded = self._superseded_before_upstream + self._superseded_inflight
+        return {
+            "active_drafts": len(self._drafts),
+            "started": self._started,
+            "completed": self._completed,
+            "superseded": superseded,
+            "superseded_before_upstream": self._superseded_before_upstream,
+            "superseded_inflight": self._superseded_inflight,
+            "reused": self._reused,
+            "upstream_calls_avoided": self._superseded_before_upstream + self._reused,
+        }
+
+    async def _debounced(
+        self,
+        attempt: _DraftAttempt,
+        request: TranslateRequest,
+        translate: TranslateFunc,
+    ) -> TranslateResponse:
+        if self._debounce_seconds > 0:
+            await asyncio.sleep(self._debounce_seconds)
+        attempt.started_upstream = True
+        return await translate(request)
+
+    def _evict(self) -> None:
+        while len(self._drafts) > self._max_drafts:
+            self._drafts.popitem(last=False)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+from .usage import hash_chat_id
+
+# Scheduler keys are namespaced so that reserved classes can never collide with a real chat_id.
+_CHAT_PREFIX = "chat:"
+_SYSTEM_PREFIX = "system:"
+ANONYMOUS_CLASS = _SYSTEM_PREFIX + "anonymous"
+
+
+@dataclass(slots=True)
+class _Waiter:
+    future: asyncio.Future
+    cost: float
+    enqueued_at: float
+
+
+@dataclass(slots=True)
+class _ChatQueue:
+    weight: float
+    waiters: deque[_Waiter] = field(default_factory=deque)
+    deficit: float = 0.0
+    inflight: int = 0
+
+
+@dataclass(slots=True)
+class _ChatWaits:
+    granted: int = 0
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+
+def _quantile(ordered: list[float], quantile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))]
+
+
+class FairScheduler:
+    """Deficit round robin over per-chat queues in front of upstream attempts.
+
+    At most ``max_concurrency`` attempts run at once. When capacity frees up, chats with
+    waiting attempts are visited in turn; each visit adds ``quantum * weight`` to the chat's
+    deficit and the chat is served while its deficit covers the cost of its oldest attempt.
+    ``per_chat_inflight`` only applies under contention: a chat at its cap is skipped while
+    another class has an attempt that can run, but a chat that is alone may use every free
+    slot. Requests without a chat_id share the ``anonymous`` class; it stands for many
+    unrelated callers, so it is exempt from ``per_chat_inflight``. Internal work such as
+    summaries runs in its own ``system_class``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        per_chat_inflight: int = 2,
+        quantum: float = 2.0,
+        weights: dict[str, float] | None = None,
+        default_weight: float = 1.0,
+        top_k: int = 10,
+        max_tracked_chats: int = 1000,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._per_chat_inflight = max(1, per_chat_inflight)
+        self._quantum = max(quantum, 0.01)
+        self._weights = {_CHAT_PREFIX + chat_id: weight for chat_id, weight in (weights or {}).items()}
+        self._default_weight = default_weight
+        self._top_k = top_k
+        self._max_tracked_chats = max_tracked_chats
+        self._clock = clock
+        self._queues: dict[str, _ChatQueue] = {}
+        self._ring: deque[str] = deque()
+        self._front_credited = False
+        self._inflight = 0
+        self._waits: OrderedDict[str, _ChatWaits] = OrderedDict()
+
+    @asynccontextmanager
+    async def slot(
+        self, chat_id: str | None, *, cost: float = 1.0, system_class: str | None = None
+    ) -> AsyncIterator[None]:
+        if system_class:
+            key = _SYSTEM_PREFIX + system_class
+        else:
+            key = _CHAT_PREFIX + chat_id if chat_id else ANONYMOUS_CLASS
+        await self.acquire(key, cost)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    async def acquire(self, key: str, cost: float = 1.0) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = _ChatQueue(weight=self._weights.get(key, self._default_weight))
+        enqueued_at = self._clock()
+        if not self._ring and self._inflight < self._max_concurrency:
+            self._grant(key, queue, enqueued_at)
+            return
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), cost, enqueued_at)
+        queue.waiters.append(waiter)
+        if key not in self._ring:
+            self._ring.append(key)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(key)
+            else:
+                self._abandon(key, waiter)
+            raise
+
+    def release(self, key: str) -> None:
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue.inflight = max(0, queue.inflight - 1)
+            if queue.inflight == 0 and not queue.waiters:
+                del self._queues[key]
+        self._inflight = max(0, self._inflight - 1)
+        self._dispatch()
+
+    def snapshot(self) -> dict:
+        busiest = sorted(self._waits.items(), key=lambda item: item[1].granted, reverse=True)[: self._top_k]
+        chats = {}
+        for key, waits in busiest:
+            ordered = sorted(waits.samples)
+            if key.startswith(_SYSTEM_PREFIX):
+                label = key[len(_SYSTEM_PREFIX) :]
+            else:
+                label = hash_chat_id(key[len(_CHAT_PREFIX) :])
+            chats[label] = {
+                "granted": waits.granted,
+                "queued": len(self._queues[key].waiters) if key in self._queues else 0,
+                "wait_p50_ms": round(_quantile(ordered, 0.50), 3),
+                "wait_p95_ms": round(_quantile(ordered, 0.95), 3),
+                "wait_p99_ms": round(_quantile(ordered, 0.99), 3),
+            }
+        return {
+            "max_concurrency": self._max_concurrency,
+            "per_chat_inflight": self._per_chat_inflight,
+            "inflight": self._inflight,
+            "queued": sum(len(queue.waiters) for queue in self._queues.values()),
+            "active_chats": len(self._ring),
+            "top_chats": chats,
+        }
+
+    def _chat_cap(self, key: str) -> int:
+        return self._max_concurrency if key == ANONYMOUS_CLASS else self._per_chat_inflight
+
+    def _grant(self, key: str, queue: _ChatQueue, enqueued_at: float) -> None:
+        queue.inflight += 1
+        self._inflight += 1
+        waits = self._waits.get(key)
+        if waits is None:
+            waits = self._waits[key] = _ChatWaits()
+            if len(self._waits) > self._max_tracked_chats:
+                self._waits.popitem(last=False)
+        else:
+            self._waits.move_to_end(key)
+        waits.granted += 1
+        waits.samples.append((self._clock() - enqueued_at) * 1000.0)
+
+    def _dispatch(self) -> None:
+        # Caps are enforced only while some other class can use the free slot; once every
+        # waiting class is at its cap they are lifted so that capacity never sits idle.
+        capped_visits = 0
+        enforce_caps = True
+        while self._inflight < self._max_concurrency and self._ring:
+            key = self._ring[0]
+            queue = self._queues[key]
+            if enforce_caps and queue.inflight >= self._chat_cap(key):
+                capped_visits += 1
+                if capped_visits >= len(self._ring):
+                    enforce_caps = False
+                self._rotate()
+                continue
+            capped_visits = 0
+            if not self._front_credited:
+                queue.deficit += self._quantum * queue.weight
+                self._front_credited = True
+            waiter = queue.waiters[0]
+            if waiter.future.done():
+                queue.waiters.popleft()
+                if not queue.waiters:
+                    self._drop_front(key, queue)
+                continue
+            if queue.deficit < waiter.cost:
+                self._rotate()
+                continue
+            queue.waiters.popleft()
+            queue.deficit -= waiter.cost
+            self._grant(key, queue, waiter.enqueued_at)
+            waiter.future.set_result(None)
+            if not queue.waiters:
+                self._drop_front(key, queue)
+
+    def _drop_front(self, key: str, queue: _ChatQueue) -> None:
+        queue.deficit = 0.0
+        self._ring.popleft()
+        self._front_credited = False
+        if queue.inflight == 0:
+            del self._queues[key]
+
+    def _rotate(self) -> None:
+        self._ring.rotate(-1)
+        self._front_credited = False
+
+    def _abandon(self, key: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(key)
+        if queue is None:
+            return
+        try:
+            queue.waiters.remove(waiter)
+        except ValueError:
+            return
+        if not queue.waiters:
+            queue.deficit = 0.0
+            if key in self._ring:
+                if self._ring[0] == key:
+                    self._front_credited = False
+                self._ring.remove(key)
+            if queue.inflight == 0:
+                del self._queues[key]
+        self._dispatch()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+UPSTREAM_UNKNOWN = "unknown"
+UPSTREAM_UP = "up"
+UPSTREAM_DEGRADED = "degraded"
+UPSTREAM_DOWN = "down"
+
+PROBE_MESSAGES = [
+    {"role": "system", "content": "Translate the user's message from German to English. Return only the translation."},
+    {"role": "user", "content": "Hallo"},
+]
+
+
+class UpstreamProber:
+    """Background task that sends a tiny translation upstream every ``interval_seconds``.
+
+    Probes use the real client, so they keep its connection pool warm, but their latencies
+    stay out of the client's adaptive timeouts: a 16-token probe says little about how long a
+    translation takes. After ``failure_threshold``
+    consecutive failures the upstream is reported ``down``, which lets the translator go to
+    its fallback backends first. Probes are capped at ``max_probes_per_hour``.
+    """
+
+    def __init__(
+        self,
+        *,
+        client,
+        logger,
+        interval_seconds: float = 300.0,
+        timeout_seconds: float = 5.0,
+        failure_threshold: int = 3,
+        degraded_latency_ms: float = 5000.0,
+        max_probes_per_hour: int = 12,
+        clock: Callable[[], float] = time.monotonic,
+        sleep_func: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._client = client
+        self._logger = logger
+        self._interval_seconds = max(interval_seconds, 0.0)
+        self._timeout_seconds = timeout_seconds
+        self._failure_threshold = max(1, failure_threshold)
+        self._degraded_latency_ms = degraded_latency_ms
+        self._max_probes_per_hour = max_probes_per_hour
+        self._clock = clock
+        self._sleep = sleep_func
+        self._task: asyncio.Task | None = None
+        self._sent_at: deque[float] = deque()
+        self._latencies: deque[float] = deque(maxlen=20)
+        self._probes = 0
+        self._failures = 0
+        self._skipped = 0
+        self._consecutive_failures = 0
+        self._last_ok: bool | None = None
+        self._last_probe_at: datetime | None = None
+        self._last_error: str | None = None
+
+    @property
+    def state(self) -> str:
+        if self._last_ok is None:
+            return UPSTREAM_UNKNOWN
+        if self._consecutive_failures >= self._failure_threshold:
+            return UPSTREAM_DOWN
+        if not self._last_ok or self._median_latency_ms() > self._degraded_latency_ms:
+            return UPSTREAM_DEGRADED
+        return UPSTREAM_UP
+
+    @property
+    def upstream_down(self) -> bool:
+        return self.state == UPSTREAM_DOWN
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def probe_once(self) -> bool | None:
+        """Send one probe unless the hourly cap is used up; returns None when skipped."""
+        now = self._clock()
+        while self._sent_at and now - self._sent_at[0] >= 3600.0:
+            self._sent_at.popleft()
+        if len(self._sent_at) >= self._max_probes_per_hour:
+            self._skipped += 1
+            return None
+        self._sent_at.append(now)
+        self._probes += 1
+        self._last_probe_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                self._client.translate(
+                    messages=PROBE_MESSAGES,
+                    request_id=f"probe-{self._probes}",
+                    max_tokens=16,
+                    disable_reasoning=True,
+                    observe_latency=False,
+                ),
+                self._timeout_seconds,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._failures += 1
+            self._consecutive_failures += 1
+            self._last_ok = False
+            self._last_error = str(exc) or type(exc).__name__
+            self._logger.warning(
+                "upstream_probe outcome=failure consecutive=%s error=%s", self._consecutive_failures, self._last_error
+            )
+            return False
+        self._latencies.append((time.perf_counter() - started) * 1000.0)
+        if self._consecutive_failures >= self._failure_threshold:
+            self._logger.info("upstream_probe outcome=recovered after=%s failures", self._consecutive_failures)
+        self._consecutive_failures = 0
+        self._last_ok = True
+        self._last_error = None
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "reachable": self._last_ok,
+            "last_probe_at": self._last_probe_at.isoformat() if self._last_probe_at else None,
+            "last_latency_ms": round(self._latencies[-1], 3) if self._latencies else None,
+            "median_latency_ms": round(self._median_latency_ms(), 3) if self._latencies else None,
+            "consecutive_failures": self._consecutive_failures,
+            "probes": self._probes,
+            "failures": self._failures,
+            "skipped": self._skipped,
+            "last_error": self._last_error,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._logger.exception("upstream_probe outcome=unexpected_error")
+            await self._sleep(self._interval_seconds)
+
+    def _median_latency_ms(self) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[max(0, math.ceil(0.5 * len(ordered)) - 1)]
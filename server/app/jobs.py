@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .models import TranslateResponse
+
+JOB_PENDING = "pending"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+@dataclass(slots=True)
+class Job:
+    job_id: str
+    request_id: str
+    created_at: float
+    status: str = JOB_PENDING
+    finished_at: float | None = None
+    result: TranslateResponse | None = None
+    task: asyncio.Task | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class JobStore:
+    """Background translations that outlived the request's latency SLO.
+
+    Finished jobs are kept for ``retention_seconds`` and at most ``max_jobs`` jobs are
+    tracked at once; when the store is full of pending work, ``create`` returns None and
+    the caller keeps waiting synchronously instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_jobs: int = 1000,
+        retention_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_jobs = max_jobs
+        self._retention_seconds = retention_seconds
+        self._clock = clock
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._created = 0
+        self._completed = 0
+        self._failed = 0
+        self._expired = 0
+        self._rejected = 0
+
+    def create(self, request_id: str, task: asyncio.Task) -> Job | None:
+        self._evict()
+        if len(self._jobs) >= self._max_jobs:
+            self._rejected += 1
+            return None
+        job = Job(job_id=uuid.uuid4().hex, request_id=request_id, created_at=self._clock(), task=task)
+        self._jobs[job.job_id] = job
+        self._created += 1
+        task.add_done_callback(lambda finished: self._finish(job, finished))
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._evict()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        if job.status == JOB_PENDING and timeout > 0:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def close(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        self._evict()
+        pending = sum(1 for job in self._jobs.values() if job.status == JOB_PENDING)
+        return {
+            "pending": pending,
+            "retained": len(self._jobs),
+            "created": self._created,
+            "completed": self._completed,
+            "failed": self._failed,
+            "expired": self._expired,
+            "rejected": self._rejected,
+        }
+
+    def _finish(self, job: Job, task: asyncio.Task) -> None:
+        job.task = None
+        job.finished_at = self._clock()
+        if task.cancelled() or task.exception() is not None:
+            job.status = JOB_FAILED
+            self._failed += 1
+        else:
+            job.status = JOB_COMPLETED
+            job.result = task.result()
+            self._completed += 1
+        job.done.set()
+
+    def _evict(self) -> None:
+        cutoff = self._clock() - self._retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at <= cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self._expired += len(expired)
+        if len(self._jobs) < self._max_jobs:
+            return
+        for job_id, job in list(self._jobs.items()):
+            if len(self._jobs) < self._max_jobs:
+                break
+            if job.finished_at is not None:
+                del self._jobs[job_id]
+                self._expired += 1
@@ -25,7 +25,7 @@ def configure_logging(log_file: Path, level: str = "INFO") -> logging.Logger:
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-    file_handler = RotatingFileHandler(log_file, maxBytes=2_000_000, backupCount=3, encoding="utf-8")
+    file_handler = RotatingFileHandler(log_file, maxBytes=2_000_000, backupCount=3, encoding="utf-8", delay=True)
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
 
@@ -1,18 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import os
 import time
 import uuid
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
 
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+import httpx
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.responses import JSONResponse, Response
 
-from .config import Settings, load_settings
+from .adaptive_timeout import AdaptiveTimeouts
+from .backends import BackendChain
+from .config import PROJECT_ROOT, Settings, load_settings
+from .drafts import DraftCoordinator
+from .fair_scheduler import FairScheduler
+from .health_probe import UpstreamProber
+from .jobs import JobStore
 from .logging_setup import configure_logging
-from .models import HealthResponse, StatsResponse, TranslateRequest, TranslateResponse
+from .model_router import ModelRouter
+from .models import (
+    HealthResponse,
+    JobResultResponse,
+    LookupRequest,
+    LookupResponse,
+    PeerCacheResponse,
+    PeerFillRequest,
+    PrefetchRequest,
+    PrefetchResponse,
+    StatsResponse,
+    TranslateRequest,
+    TranslateResponse,
+)
 from .openrouter_client import OpenRouterClient
+from .peer_cache import PEER_TOKEN_HEADER, PeerCache
+from .prefetch import Prefetcher
+from .request_limits import RequestLimits
+from .response_validator import ResponseValidator
+from .result_cache import ORIGIN_DRAFT, ResultCache
+from .retry_policy import RetryPolicy
 from .stats import StatsTracker
+from .stats_window import WINDOWS
+from .summaries import ConversationSummarizer
+from .trace import OUTCOME_CANCELLED, OUTCOME_FALLBACK, OUTCOME_SUCCESS, TraceRecorder
+from .translation_memory import TranslationMemory
 from .translator import Translator
+from .usage import UsageTracker, configure_chat_hash
+from .wire import render_model
+from .ws import TranslationSocketSession, WebSocketStats
+
+# Set per HTTP request so the access log line and the translator's outcome lines share one id.
+REQUEST_ID: ContextVar[str | None] = ContextVar("request_id", default=None)
 
 
 def create_app(
@@ -22,22 +62,221 @@ def create_app(
     stats: StatsTracker | None = None,
     openrouter_client: OpenRouterClient | None = None,
     translator: Translator | None = None,
+    usage_tracker: UsageTracker | None = None,
+    result_cache: ResultCache | None = None,
+    job_store: JobStore | None = None,
+    trace_recorder: TraceRecorder | None = None,
+    peer_http_client: httpx.AsyncClient | None = None,
+    health_prober: UpstreamProber | None = None,
 ) -> FastAPI:
     settings = settings or load_settings()
     logger = logger or configure_logging(settings.log_file, settings.log_level)
+    configure_chat_hash(settings.chat_hash_secret)
     stats = stats or StatsTracker()
-    openrouter_client = openrouter_client or OpenRouterClient(settings, logger)
+    usage_tracker = usage_tracker or UsageTracker()
+    adaptive_timeouts = None
+    if openrouter_client is None and settings.adaptive_timeouts_enabled:
+        adaptive_timeouts = AdaptiveTimeouts(
+            default=settings.request_timeout_seconds,
+            connect=settings.connect_timeout_seconds,
+            floor=settings.timeout_floor_seconds,
+            ceiling=settings.request_timeout_seconds,
+            quantile=settings.timeout_quantile,
+            factor=settings.timeout_factor,
+            window=settings.timeout_window,
+            min_samples=settings.timeout_min_samples,
+        )
+    if openrouter_client is None:
+        openrouter_client = OpenRouterClient(settings, logger, timeouts=adaptive_timeouts)
+        if health_prober is None and settings.health_probe_enabled and settings.openrouter_configured:
+            health_prober = UpstreamProber(
+                client=openrouter_client,
+                logger=logger,
+                interval_seconds=settings.health_probe_interval_seconds,
+                timeout_seconds=settings.health_probe_timeout_seconds,
+                failure_threshold=settings.health_probe_failure_threshold,
+                degraded_latency_ms=settings.health_probe_degraded_latency_ms,
+                max_probes_per_hour=settings.health_probe_max_per_hour,
+            )
+    translation_memory = None
+    if translator is None and settings.translation_memory_enabled:
+        translation_memory = TranslationMemory(
+            max_entries=settings.translation_memory_max_entries,
+            direct_threshold=settings.translation_memory_direct_threshold,
+            hint_threshold=settings.translation_memory_hint_threshold,
+            max_hints=settings.translation_memory_max_hints,
+        )
+    if result_cache is None and translator is None and settings.result_cache_max_entries > 0:
+        result_cache = ResultCache(
+            max_entries=settings.result_cache_max_entries,
+            ttl_seconds=settings.result_cache_ttl_seconds,
+        )
+    scheduler = None
+    if translator is None and settings.scheduler_enabled:
+        scheduler = FairScheduler(
+            max_concurrency=settings.scheduler_max_concurrency,
+            per_chat_inflight=settings.scheduler_per_chat_inflight,
+            quantum=settings.scheduler_quantum,
+            weights=settings.scheduler_weights,
+            top_k=settings.scheduler_top_k,
+        )
+    summarizer = None
+    if translator is None and settings.summaries_enabled:
+        summarizer = ConversationSummarizer(
+            client=openrouter_client,
+            logger=logger,
+            model=settings.summaries_model,
+            every_n_turns=settings.summaries_every_n_turns,
+            keep_raw_turns=settings.summaries_keep_raw_turns,
+            min_context_turns=settings.summaries_min_context_turns,
+            max_chats=settings.summaries_max_chats,
+            max_summary_chars=settings.summaries_max_chars,
+            usage_tracker=usage_tracker,
+            scheduler=scheduler,
+            scheduler_cost_chars=settings.scheduler_cost_chars,
+        )
+    retry_policy = RetryPolicy.from_config(settings.retry_config)
+    router = None
+    if translator is None:
+        router = ModelRouter.from_config(settings.routing_config, default_model=settings.openrouter_model)
+    response_validator = None
+    if translator is None:
+        response_validator = ResponseValidator.from_config(settings.validation_config)
+
+    def secondary_client(entry: dict) -> OpenRouterClient:
+        secondary_settings = dataclasses.replace(
+            settings,
+            openrouter_model=entry["model"],
+            openrouter_base_url=entry.get("base_url") or settings.openrouter_base_url,
+            openrouter_api_key=os.getenv(entry.get("api_key_env", ""), "") or settings.openrouter_api_key,
+        )
+        return OpenRouterClient(secondary_settings, logger, name=entry.get("name") or "secondary")
+
+    backend_chain = None
+    if translator is None:
+        backend_chain = BackendChain.from_config(
+            settings.backends_config,
+            remote_factory=secondary_client,
+            translation_memory=translation_memory,
+            base_dir=PROJECT_ROOT,
+            logger=logger,
+        )
+    peer_cache = None
+    if translator is None and settings.peers_enabled and not settings.peers_token:
+        logger.warning("peer mode disabled: peers.token (PEER_TOKEN) is required")
+    elif translator is None and settings.peers_enabled and result_cache is not None and settings.peers_self_url:
+        peer_cache = PeerCache(
+            self_url=settings.peers_self_url,
+            peers=settings.peers_nodes,
+            result_cache=result_cache,
+            http_client=peer_http_client,
+            timeout_seconds=settings.peers_timeout_ms / 1000.0,
+            fill_wait_seconds=settings.peers_fill_wait_ms / 1000.0,
+            lease_seconds=settings.peers_lease_seconds,
+            virtual_nodes=settings.peers_virtual_nodes,
+            token=settings.peers_token,
+            logger=logger,
+        )
     translator = translator or Translator(
         openrouter_client=openrouter_client,
         system_prompt_file=settings.system_prompt_file,
         logger=logger,
+        translation_memory=translation_memory,
+        usage_tracker=usage_tracker,
+        result_cache=result_cache,
+        retry_policy=retry_policy,
+        summarizer=summarizer,
+        router=router,
+        scheduler=scheduler,
+        scheduler_cost_chars=settings.scheduler_cost_chars,
+        backend_chain=backend_chain,
+        peer_cache=peer_cache,
+        upstream_health=health_prober,
+        response_validator=response_validator,
     )
+    prefetcher = None
+    if settings.prefetch_enabled and result_cache is not None:
+        prefetcher = Prefetcher(
+            translator=translator,
+            result_cache=result_cache,
+            logger=logger,
+            is_idle=lambda: stats.inflight_requests < settings.prefetch_idle_inflight_threshold,
+            max_queue_size=settings.prefetch_max_queue_size,
+            workers=settings.prefetch_workers,
+        )
+
+    if trace_recorder is None and settings.trace_enabled:
+        trace_recorder = TraceRecorder(
+            settings.trace_file,
+            max_bytes=settings.trace_max_bytes,
+            backup_count=settings.trace_backup_count,
+            sample_rate=settings.trace_sample_rate,
+        )
+    drafts = None
+    if settings.drafts_enabled:
+        drafts = DraftCoordinator(
+            debounce_seconds=settings.drafts_debounce_ms / 1000.0,
+            max_drafts=settings.drafts_max_entries,
+            history_size=settings.drafts_history_size,
+        )
+    if job_store is None and settings.jobs_enabled:
+        job_store = JobStore(max_jobs=settings.jobs_max_entries, retention_seconds=settings.jobs_retention_seconds)
+
+    def write_usage_rollup() -> None:
+        usage_tracker.write_rollup(
+            settings.usage_rollup_file,
+            max_bytes=settings.usage_rollup_max_bytes,
+            backup_count=settings.usage_rollup_backup_count,
+        )
+
+    async def usage_rollup_loop() -> None:
+        while True:
+            await asyncio.sleep(settings.usage_rollup_interval_seconds)
+            try:
+                write_usage_rollup()
+            except OSError:
+                logger.exception("Failed to write usage rollup to %s", settings.usage_rollup_file)
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        warmup_task = None
+        start_client = getattr(app.state.openrouter_client, "start", None)
+        if start_client is not None:
+            warmup_task = asyncio.create_task(start_client())
+        rollup_task = None
+        if settings.usage_rollup_file is not None and settings.usage_rollup_interval_seconds > 0:
+            rollup_task = asyncio.create_task(usage_rollup_loop())
+        if prefetcher is not None:
+            prefetcher.start()
+        if health_prober is not None:
+            health_prober.start()
         try:
             yield
         finally:
+            if warmup_task is not None:
+                warmup_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await warmup_task
+            if health_prober is not None:
+                await health_prober.stop()
+            if prefetcher is not None:
+                await prefetcher.stop()
+            if job_store is not None:
+                await job_store.close()
+            if summarizer is not None:
+                await summarizer.close()
+            if trace_recorder is not None:
+                trace_recorder.close()
+            if backend_chain is not None:
+                await backend_chain.close()
+            if peer_cache is not None:
+                await peer_cache.close()
+            if rollup_task is not None:
+                rollup_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await rollup_task
+                with suppress(OSError):
+                    write_usage_rollup()
             await app.state.openrouter_client.close()
 
     app = FastAPI(title="AI Translation Proxy", version="1.0.0", lifespan=lifespan)
@@ -46,19 +285,47 @@ def create_app(
     app.state.stats = stats
     app.state.openrouter_client = openrouter_client
     app.state.translator = translator
+    app.state.translation_memory = translation_memory
+    app.state.usage_tracker = usage_tracker
+    app.state.result_cache = result_cache
+    app.state.prefetcher = prefetcher
+    app.state.websocket_stats = WebSocketStats()
+    app.state.retry_policy = retry_policy
+    app.state.adaptive_timeouts = adaptive_timeouts
+    app.state.job_store = job_store
+    app.state.summarizer = summarizer
+    app.state.router = router
+    app.state.response_validator = response_validator
+    app.state.request_limits = RequestLimits(
+        max_body_bytes=settings.limits_max_body_bytes,
+        max_text_bytes=settings.limits_max_text_bytes,
+        max_context_message_bytes=settings.limits_max_context_message_bytes,
+        max_context_bytes=settings.limits_max_context_bytes,
+    )
+    app.state.trace_recorder = trace_recorder
+    app.state.scheduler = scheduler
+    app.state.drafts = drafts
+    app.state.backend_chain = backend_chain
+    app.state.peer_cache = peer_cache
+    app.state.health_prober = health_prober
 
     @app.middleware("http")
     async def request_logging_middleware(request: Request, call_next):
         started = time.perf_counter()
+        request_id = uuid.uuid4().hex[:12]
+        token = REQUEST_ID.set(request_id)
         response = None
         try:
             response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
             return response
         finally:
+            REQUEST_ID.reset(token)
             elapsed_ms = (time.perf_counter() - started) * 1000.0
             status_code = response.status_code if response is not None else 500
             logger.info(
-                "http method=%s path=%s status=%s duration_ms=%.2f",
+                "http request_id=%s method=%s path=%s status=%s duration_ms=%.2f",
+                request_id,
                 request.method,
                 request.url.path,
                 status_code,
@@ -68,30 +335,210 @@ def create_app(
     @app.get("/health", response_model=HealthResponse)
     async def health() -> HealthResponse:
         payload = await app.state.stats.health_snapshot(app.state.settings.openrouter_configured)
+        if app.state.health_prober is not None:
+            payload["upstream"] = app.state.health_prober.snapshot()
         return HealthResponse(**payload)
 
     @app.get("/stats", response_model=StatsResponse)
-    async def stats_endpoint() -> StatsResponse:
+    async def stats_endpoint(window: str | None = None) -> StatsResponse:
+        if window is not None and window not in WINDOWS:
+            raise HTTPException(status_code=400, detail=f"window must be one of {', '.join(WINDOWS)}")
         payload = await app.state.stats.stats_snapshot()
+        payload["windows"] = await app.state.stats.window_snapshot(window)
+        usage = app.state.usage_tracker.snapshot()
+        payload["tokens_per_second"] = usage["total"]["tokens_per_second"]
+        payload["cost_per_successful_translation_usd"] = usage["total"]["cost_per_successful_translation_usd"]
+        payload["usage"] = usage
+        if app.state.translation_memory is not None:
+            payload["translation_memory"] = app.state.translation_memory.snapshot()
+        if app.state.result_cache is not None:
+            payload["result_cache"] = app.state.result_cache.snapshot()
+        if app.state.prefetcher is not None:
+            payload["prefetch"] = app.state.prefetcher.snapshot()
+        payload["websocket"] = app.state.websocket_stats.snapshot()
+        if app.state.adaptive_timeouts is not None:
+            payload["upstream_timeouts"] = app.state.adaptive_timeouts.snapshot()
+        if app.state.retry_policy.budget is not None:
+            payload["retry_budget"] = app.state.retry_policy.budget.snapshot()
+        if app.state.job_store is not None:
+            payload["jobs"] = app.state.job_store.snapshot()
+        if app.state.summarizer is not None:
+            payload["summaries"] = app.state.summarizer.snapshot()
+        if app.state.router is not None:
+            payload["routing"] = app.state.router.snapshot()
+        if app.state.trace_recorder is not None:
+            payload["trace"] = app.state.trace_recorder.snapshot()
+        if app.state.scheduler is not None:
+            payload["scheduler"] = app.state.scheduler.snapshot()
+        if app.state.drafts is not None:
+            payload["drafts"] = app.state.drafts.snapshot()
+        if app.state.backend_chain is not None:
+            payload["backends"] = app.state.backend_chain.snapshot()
+            payload["backends"]["health"] = await app.state.backend_chain.health()
+        if app.state.peer_cache is not None:
+            payload["peers"] = app.state.peer_cache.snapshot()
+        if app.state.response_validator is not None:
+            payload["validation"] = app.state.response_validator.snapshot()
+        payload["limits"] = app.state.request_limits.snapshot()
         return StatsResponse(**payload)
 
-    @app.post("/translate", response_model=TranslateResponse)
-    async def translate(request_body: TranslateRequest) -> TranslateResponse:
-        request_id = uuid.uuid4().hex[:12]
-        handle = await app.state.stats.record_translate_request_start()
-        outcome = await app.state.translator.translate(request_body, request_id=request_id)
+    async def execute_translate(request_body: TranslateRequest, request_id: str, handle) -> TranslateResponse:
+        try:
+            origin = {"origin": ORIGIN_DRAFT} if request_body.draft_id is not None else {}
+            outcome = await app.state.translator.translate(request_body, request_id=request_id, **origin)
+        except asyncio.CancelledError:
+            await asyncio.shield(app.state.stats.record_translate_request_cancelled(handle))
+            if app.state.trace_recorder is not None:
+                app.state.trace_recorder.record(
+                    request_body,
+                    outcome=OUTCOME_CANCELLED,
+                    latency_ms=(time.perf_counter() - handle.started_at_perf) * 1000.0,
+                )
+            raise
         await app.state.stats.record_translate_request_end(
             handle,
             success=outcome.success,
             used_fallback=outcome.used_fallback,
+            usage=outcome.usage,
+            failure_reason=outcome.failure_reason,
+            attempts=outcome.attempts,
         )
+        if app.state.trace_recorder is not None:
+            app.state.trace_recorder.record(
+                request_body,
+                outcome=OUTCOME_FALLBACK if outcome.used_fallback else OUTCOME_SUCCESS,
+                latency_ms=(time.perf_counter() - handle.started_at_perf) * 1000.0,
+                attempts=outcome.attempts,
+                failure_reason=outcome.failure_reason,
+            )
         return TranslateResponse(
             translated_text=outcome.translated_text,
             original_text=outcome.original_text,
             direction=outcome.direction,
             translation_failed=outcome.translation_failed,
+            etag=outcome.cache_key if outcome.success else None,
+            degraded=outcome.degraded,
+        )
+
+    async def run_translate(request_body: TranslateRequest) -> TranslateResponse:
+        if request_body.draft_id is not None and app.state.drafts is not None:
+            return await app.state.drafts.run(request_body, translate_now)
+        return await translate_now(request_body)
+
+    async def translate_now(request_body: TranslateRequest) -> TranslateResponse:
+        request_id = REQUEST_ID.get() or uuid.uuid4().hex[:12]
+        handle = await app.state.stats.record_translate_request_start()
+        slo_ms = request_body.slo_ms if request_body.slo_ms is not None else app.state.settings.jobs_default_slo_ms
+        if app.state.job_store is None or not slo_ms:
+            return await execute_translate(request_body, request_id, handle)
+
+        task = asyncio.create_task(execute_translate(request_body, request_id, handle))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=slo_ms / 1000.0)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if task in done:
+            return task.result()
+        job = app.state.job_store.create(request_id, task)
+        if job is None:
+            return await task
+        logger.info("request_id=%s outcome=deferred job_id=%s slo_ms=%s", request_id, job.job_id, slo_ms)
+        return TranslateResponse(
+            translated_text=request_body.text,
+            original_text=request_body.text,
+            direction=request_body.direction,
+            translation_failed=True,
+            translation_pending=True,
+            job_id=job.job_id,
         )
 
+    @app.post("/translate", response_model=TranslateResponse)
+    async def translate(request: Request) -> Response:
+        limits = app.state.request_limits
+        request_body = limits.apply(await limits.read(request, TranslateRequest))
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and request_body.text:
+            etag = app.state.translator.cache_key(request_body)
+            if etag in {tag.strip().strip('"') for tag in if_none_match.split(",")}:
+                return Response(status_code=304, headers={"ETag": f'"{etag}"'})
+        result = await run_translate(request_body)
+        response = render_model(request, result)
+        if result.etag:
+            response.headers["ETag"] = f'"{result.etag}"'
+        return response
+
+    @app.post("/translate/lookup", response_model=LookupResponse)
+    async def translate_lookup(request: Request) -> Response:
+        request_body = await app.state.request_limits.read(request, LookupRequest)
+        cache = app.state.result_cache
+        variant = app.state.translator.cache_variant()
+        valid, unknown, translations = [], [], {}
+        for key in request_body.held:
+            (valid if cache is not None and cache.peek(key, variant=variant) else unknown).append(key)
+        for key in request_body.missing:
+            entry = cache.get(key, variant=variant) if cache is not None else None
+            if entry is None:
+                unknown.append(key)
+            else:
+                translations[key] = entry.translated_text
+        return render_model(request, LookupResponse(valid=valid, unknown=unknown, translations=translations))
+
+    @app.get("/translate/result/{job_id}", response_model=JobResultResponse)
+    async def translate_result(request: Request, job_id: str, wait: float = 0.0) -> Response:
+        job = app.state.job_store.get(job_id) if app.state.job_store is not None else None
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired job")
+        wait = min(max(wait, 0.0), app.state.settings.jobs_max_wait_seconds)
+        job = await app.state.job_store.wait(job, wait)
+        return render_model(request, JobResultResponse(job_id=job.job_id, status=job.status, result=job.result))
+
+    def require_peer_cache(request: Request) -> PeerCache:
+        peer_cache = app.state.peer_cache
+        if peer_cache is None:
+            raise HTTPException(status_code=404, detail="Peer mode is disabled")
+        if not peer_cache.authorized(request.headers.get(PEER_TOKEN_HEADER)):
+            raise HTTPException(status_code=403, detail="Invalid peer token")
+        return peer_cache
+
+    @app.get("/internal/peer/cache/{key}", response_model=PeerCacheResponse)
+    async def peer_cache_get(
+        request: Request,
+        key: str,
+        variant: str = "",
+        claim: bool = False,
+        wait: float = 0.0,
+    ) -> PeerCacheResponse:
+        peer_cache = require_peer_cache(request)
+        return PeerCacheResponse(**await peer_cache.serve(key, variant=variant, claim=claim, wait=max(wait, 0.0)))
+
+    @app.put("/internal/peer/cache/{key}", status_code=204)
+    async def peer_cache_put(request: Request, key: str, body: PeerFillRequest) -> Response:
+        require_peer_cache(request).complete(key, body.translated_text, variant=body.variant)
+        return Response(status_code=204)
+
+    @app.websocket("/ws")
+    async def translate_socket(websocket: WebSocket) -> None:
+        session = TranslationSocketSession(
+            websocket,
+            run_translate=run_translate,
+            stats=app.state.websocket_stats,
+            logger=logger,
+            max_inflight=app.state.settings.ws_max_inflight,
+            limits=app.state.request_limits,
+        )
+        await session.run()
+
+    @app.post("/prefetch", response_model=PrefetchResponse, status_code=202)
+    async def prefetch(request: Request) -> Response:
+        if app.state.prefetcher is None:
+            raise HTTPException(status_code=503, detail="Prefetch is disabled")
+        limits = app.state.request_limits
+        request_body = await limits.read(request, PrefetchRequest)
+        messages = [limits.apply(message) for message in request_body.messages]
+        summary = PrefetchResponse(**app.state.prefetcher.submit(messages))
+        return render_model(request, summary, status_code=202)
+
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
         logger.exception("Unhandled exception on path %s", request.url.path)
@@ -100,4 +547,11 @@ def create_app(
     return app
 
 
-app = create_app()
+def __getattr__(name: str):
+    # Kept for ``uvicorn app.main:app``; server/run.sh uses ``--factory app.main:create_app``.
+    # Either way the app is built once at startup; this only keeps imports from tests and tools
+    # from building one (and opening server.log) as a side effect.
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
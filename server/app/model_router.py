@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import math
+import unicodedata
+from dataclasses import dataclass
+from typing import Any
+
+from .models import TranslateRequest
+
+SCRIPT_NONE = "none"
+SCRIPT_LATIN = "latin"
+SCRIPT_CYRILLIC = "cyrillic"
+SCRIPT_CJK = "cjk"
+SCRIPT_OTHER = "other"
+
+_SCRIPT_PREFIXES = (
+    ("LATIN", SCRIPT_LATIN),
+    ("CYRILLIC", SCRIPT_CYRILLIC),
+    ("CJK", SCRIPT_CJK),
+    ("HIRAGANA", SCRIPT_CJK),
+    ("KATAKANA", SCRIPT_CJK),
+    ("HANGUL", SCRIPT_CJK),
+)
+
+
+def dominant_script(text: str) -> str:
+    counts: dict[str, int] = {}
+    for char in text:
+        if not char.isalpha():
+            continue
+        name = unicodedata.name(char, "")
+        script = next((label for prefix, label in _SCRIPT_PREFIXES if name.startswith(prefix)), SCRIPT_OTHER)
+        counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return SCRIPT_NONE
+    return max(counts.items(), key=lambda item: item[1])[0]
+
+
+@dataclass(slots=True, frozen=True)
+class ModelTier:
+    name: str
+    model: str | None = None
+    max_chars: int | None = None
+    max_context_turns: int | None = None
+    scripts: tuple[str, ...] = ()
+    disable_reasoning: bool | None = None
+
+    def matches(self, chars: int, context_turns: int, script: str) -> bool:
+        if self.max_chars is not None and chars > self.max_chars:
+            return False
+        if self.max_context_turns is not None and context_turns > self.max_context_turns:
+            return False
+        if self.scripts and script not in self.scripts and script != SCRIPT_NONE:
+            return False
+        return True
+
+
+@dataclass(slots=True, frozen=True)
+class RouteDecision:
+    tier: str
+    model: str
+    max_tokens: int | None
+    disable_reasoning: bool | None = None
+
+    def client_kwargs(self) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"model": self.model}
+        if self.max_tokens is not None:
+            kwargs["max_tokens"] = self.max_tokens
+        if self.disable_reasoning is not None:
+            kwargs["disable_reasoning"] = self.disable_reasoning
+        return kwargs
+
+
+@dataclass(slots=True)
+class _TierStats:
+    requests: int = 0
+    successes: int = 0
+    fallbacks: int = 0
+    total_ms: float = 0.0
+    max_tokens_total: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": round(self.fallbacks / self.requests, 6) if self.requests else 0.0,
+            "average_latency_ms": round(self.total_ms / self.requests, 3) if self.requests else 0.0,
+            "average_max_tokens": round(self.max_tokens_total / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class ModelRouter:
+    """Picks a model tier per request from text length, dominant script and context size.
+
+    Tiers are tried in order and the first match wins; the last tier is the catch-all.
+    ``max_tokens`` grows with the UTF-8 size of the text (roughly three bytes per token)
+    so a runaway generation stops long before the request timeout.
+    """
+
+    def __init__(
+        self,
+        tiers: list[ModelTier],
+        *,
+        default_model: str,
+        max_tokens_factor: float = 2.0,
+        max_tokens_min: int = 64,
+        max_tokens_max: int | None = 2048,
+    ) -> None:
+        self.tiers = tiers or [ModelTier(name="default")]
+        self._default_model = default_model
+        self._max_tokens_factor = max_tokens_factor
+        self._max_tokens_min = max_tokens_min
+        self._max_tokens_max = max_tokens_max
+        self._stats = {tier.name: _TierStats() for tier in self.tiers}
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], *, default_model: str) -> ModelRouter | None:
+        if not config or not config.get("enabled", True):
+            return None
+        tiers = [
+            ModelTier(
+                name=str(item.get("name") or f"tier{index}"),
+                model=item.get("model") or None,
+                max_chars=item.get("max_chars"),
+                max_context_turns=item.get("max_context_turns"),
+                scripts=tuple(item.get("scripts") or ()),
+                disable_reasoning=item.get("disable_reasoning"),
+            )
+            for index, item in enumerate(config.get("tiers") or [])
+        ]
+        limits = config.get("max_tokens") or {}
+        return cls(
+            tiers,
+            default_model=default_model,
+            max_tokens_factor=float(limits.get("factor", 2.0)),
+            max_tokens_min=int(limits.get("min", 64)),
+            max_tokens_max=int(limits["max"]) if limits.get("max") else None,
+        )
+
+    @property
+    def signature(self) -> str:
+        return ",".join(f"{tier.name}={tier.model or self._default_model}" for tier in self.tiers)
+
+    def route(self, request: TranslateRequest) -> RouteDecision:
+        chars = len(request.text)
+        script = dominant_script(request.text)
+        tier = next(
+            (item for item in self.tiers if item.matches(chars, len(request.context), script)),
+            self.tiers[-1],
+        )
+        return RouteDecision(
+            tier=tier.name,
+            model=tier.model or self._default_model,
+            max_tokens=self.max_tokens_for(request.text),
+            disable_reasoning=tier.disable_reasoning,
+        )
+
+    def max_tokens_for(self, text: str) -> int | None:
+        if self._max_tokens_factor <= 0:
+            return None
+        estimate = self._max_tokens_min + math.ceil(len(text.encode("utf-8")) / 3 * self._max_tokens_factor)
+        return min(estimate, self._max_tokens_max) if self._max_tokens_max else estimate
+
+    def record(self, decision: RouteDecision, *, latency_ms: float, success: bool) -> None:
+        stats = self._stats.setdefault(decision.tier, _TierStats())
+        stats.requests += 1
+        stats.total_ms += latency_ms
+        stats.max_tokens_total += decision.max_tokens or 0
+        if success:
+            stats.successes += 1
+        else:
+            stats.fallbacks += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "tiers": {
+                tier.name: {"model": tier.model or self._default_model, **self._stats[tier.name].snapshot()}
+                for tier in self.tiers
+            }
+        }
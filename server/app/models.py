@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class ContextMessage(BaseModel):
@@ -15,6 +15,8 @@ class TranslateRequest(BaseModel):
     direction: Literal["incoming", "outgoing"]
     chat_id: str | None = None
     context: list[ContextMessage] = Field(default_factory=list)
+    slo_ms: int | None = Field(default=None, ge=0, le=600_000)
+    draft_id: str | None = Field(default=None, max_length=128)
 
     @field_validator("context")
     @classmethod
@@ -23,12 +25,74 @@ class TranslateRequest(BaseModel):
             raise ValueError("context may contain at most 100 items")
         return value
 
+    @model_validator(mode="after")
+    def validate_draft_direction(self) -> TranslateRequest:
+        if self.draft_id is not None and self.direction != "outgoing":
+            raise ValueError("draft_id is only supported for outgoing messages")
+        return self
+
+
+class PrefetchRequest(BaseModel):
+    messages: list[TranslateRequest] = Field(default_factory=list)
+
+    @field_validator("messages")
+    @classmethod
+    def validate_batch_size(cls, value: list[TranslateRequest]) -> list[TranslateRequest]:
+        if len(value) > 200:
+            raise ValueError("messages may contain at most 200 items")
+        return value
+
+
+class PrefetchResponse(BaseModel):
+    accepted: int
+    deduplicated: int
+    dropped: int
+
 
 class TranslateResponse(BaseModel):
     translated_text: str
     original_text: str
     direction: Literal["incoming", "outgoing"]
     translation_failed: bool
+    translation_pending: bool = False
+    job_id: str | None = None
+    etag: str | None = None
+    superseded: bool = False
+    degraded: bool = False
+
+
+class PeerCacheResponse(BaseModel):
+    status: Literal["hit", "pending", "miss"]
+    translated_text: str | None = None
+
+
+class PeerFillRequest(BaseModel):
+    variant: str = Field(default="", max_length=64)
+    translated_text: str | None = None
+
+
+class LookupRequest(BaseModel):
+    held: list[str] = Field(default_factory=list)
+    missing: list[str] = Field(default_factory=list)
+
+    @field_validator("held", "missing")
+    @classmethod
+    def validate_key_count(cls, value: list[str]) -> list[str]:
+        if len(value) > 1000:
+            raise ValueError("at most 1000 keys per lookup")
+        return value
+
+
+class LookupResponse(BaseModel):
+    valid: list[str]
+    unknown: list[str]
+    translations: dict[str, str]
+
+
+class JobResultResponse(BaseModel):
+    job_id: str
+    status: Literal["pending", "completed", "failed"]
+    result: TranslateResponse | None = None
 
 
 class HealthResponse(BaseModel):
@@ -36,6 +100,7 @@ class HealthResponse(BaseModel):
     uptime_seconds: float
     last_successful_translation_at: str | None
     openrouter_configured: bool
+    upstream: dict | None = None
 
 
 class StatsResponse(BaseModel):
@@ -45,3 +110,30 @@ class StatsResponse(BaseModel):
     success_rate: float
     average_response_time_ms: float
     inflight_requests: int
+    cancelled_requests: int = 0
+    prompt_tokens_total: int = 0
+    cached_prompt_tokens_total: int = 0
+    completion_tokens_total: int = 0
+    prompt_cache_hit_ratio: float = 0.0
+    prompt_tokens_per_request: float = 0.0
+    completion_tokens_per_request: float = 0.0
+    tokens_per_second: float = 0.0
+    cost_per_successful_translation_usd: float = 0.0
+    usage: dict | None = None
+    translation_memory: dict | None = None
+    result_cache: dict | None = None
+    prefetch: dict | None = None
+    websocket: dict | None = None
+    retry_budget: dict | None = None
+    upstream_timeouts: dict | None = None
+    jobs: dict | None = None
+    summaries: dict | None = None
+    routing: dict | None = None
+    trace: dict | None = None
+    scheduler: dict | None = None
+    drafts: dict | None = None
+    backends: dict | None = None
+    peers: dict | None = None
+    windows: dict | None = None
+    validation: dict | None = None
+    limits: dict | None = None
@@ -1,32 +1,95 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import time
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
+from .adaptive_timeout import AdaptiveTimeouts
+from .backends import BackendCapabilities
 from .config import Settings
 from .error_policy import (
     OpenRouterEmptyResponseError,
     OpenRouterHTTPError,
+    OpenRouterInvalidResponseError,
     OpenRouterMalformedResponseError,
     OpenRouterTimeoutError,
-    looks_like_upstream_error_text,
 )
+from .response_validator import ERROR_TEXT, TRUNCATED, find_error_marker
+from .usage import TokenUsage, parse_usage
+
+
+@dataclass(slots=True)
+class UpstreamCompletion:
+    content: str
+    usage: TokenUsage | None = None
+    model: str | None = None
 
 
 class OpenRouterClient:
-    def __init__(self, settings: Settings, logger, http_client: httpx.AsyncClient | None = None) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        logger,
+        http_client: httpx.AsyncClient | None = None,
+        timeouts: AdaptiveTimeouts | None = None,
+        name: str = "openrouter",
+    ) -> None:
+        self.name = name
         self._settings = settings
         self._logger = logger
-        self._http_client = http_client or httpx.AsyncClient(timeout=settings.request_timeout_seconds)
+        self._timeouts = timeouts
+        self._http_client = http_client
         self._owns_client = http_client is None
+        self._starting: asyncio.Future | None = None
+
+    @property
+    def model(self) -> str:
+        return self._settings.openrouter_model
+
+    async def start(self) -> None:
+        """Create the owned HTTP client off the event loop; loading CA certificates is the slow part."""
+        if self._http_client is not None:
+            return
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(
+                asyncio.to_thread(httpx.AsyncClient, timeout=self._settings.request_timeout_seconds)
+            )
+        client = await asyncio.shield(self._starting)
+        if self._http_client is None:
+            self._http_client = client
 
     async def close(self) -> None:
-        if self._owns_client:
+        if self._starting is not None and self._http_client is None:
+            self._http_client = await self._starting
+        if self._owns_client and self._http_client is not None:
             await self._http_client.aclose()
+            self._http_client = None
+        self._starting = None
+
+    async def health(self) -> dict:
+        return {
+            "ok": bool(self._settings.openrouter_api_key),
+            "model": self._settings.openrouter_model,
+            "base_url": self._settings.openrouter_base_url,
+        }
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities()
 
-    async def translate(self, *, messages: list[dict[str, Any]], request_id: str) -> str:
+    async def translate(
+        self,
+        *,
+        messages: list[dict[str, Any]],
+        request_id: str,
+        model: str | None = None,
+        max_tokens: int | None = None,
+        disable_reasoning: bool | None = None,
+        observe_latency: bool = True,
+    ) -> UpstreamCompletion:
         if not self._settings.openrouter_api_key:
             raise OpenRouterHTTPError(status_code=401, message="OpenRouter API key missing")
 
@@ -37,20 +100,58 @@ class OpenRouterClient:
             "X-Title": "Telegram AI Translation Proxy",
         }
         payload: dict[str, Any] = {
-            "model": self._settings.openrouter_model,
+            "model": model or self._settings.openrouter_model,
             "messages": messages,
             "stream": False,
             "temperature": 0.2,
+            "usage": {"include": True},
         }
-        if self._settings.disable_reasoning:
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        if self._settings.disable_reasoning if disable_reasoning is None else disable_reasoning:
             payload["reasoning"] = {"enabled": False}
 
+        model = payload["model"]
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in messages)
+        request_kwargs: dict[str, Any] = {}
+        if self._timeouts is not None:
+            chosen = self._timeouts.timeouts_for(model, prompt_chars)
+            connect_timeout, read_timeout = chosen.connect, chosen.read
+            request_kwargs["timeout"] = httpx.Timeout(read_timeout, connect=connect_timeout)
+            timeout_source = f"adaptive:{chosen.bucket}:n={chosen.samples}"
+        else:
+            connect_timeout = read_timeout = self._settings.request_timeout_seconds
+            timeout_source = "static"
+        self._logger.info(
+            "request_id=%s upstream_attempt model=%s prompt_chars=%s connect_timeout=%.2fs read_timeout=%.2fs source=%s",
+            request_id,
+            model,
+            prompt_chars,
+            connect_timeout,
+            read_timeout,
+            timeout_source,
+        )
+
+        if self._http_client is None:
+            await self.start()
+        started = time.perf_counter()
         try:
-            response = await self._http_client.post(self._settings.openrouter_base_url, headers=headers, json=payload)
+            response = await self._http_client.post(
+                self._settings.openrouter_base_url,
+                headers=headers,
+                json=payload,
+                **request_kwargs,
+            )
+        except httpx.ConnectTimeout as exc:
+            raise OpenRouterTimeoutError("OpenRouter connect timed out") from exc
         except httpx.TimeoutException as exc:
+            if self._timeouts is not None and observe_latency:
+                self._timeouts.observe(model, prompt_chars, read_timeout)
             raise OpenRouterTimeoutError("OpenRouter request timed out") from exc
         except httpx.HTTPError as exc:
             raise OpenRouterHTTPError(status_code=0, message=str(exc)) from exc
+        if self._timeouts is not None and observe_latency and response.status_code < 400:
+            self._timeouts.observe(model, prompt_chars, time.perf_counter() - started)
 
         if response.status_code >= 400:
             retry_after = _parse_retry_after(response.headers.get("Retry-After"))
@@ -72,11 +173,21 @@ class OpenRouterClient:
             message = _extract_error_message(data)
             raise OpenRouterHTTPError(status_code=response.status_code, message=message, body=data)
 
+        if _finish_reason(data) == "length":
+            raise OpenRouterInvalidResponseError(check=TRUNCATED, detail=f"max_tokens={payload.get('max_tokens')}")
         content = _extract_message_content(data)
-        if content is None or not content.strip() or looks_like_upstream_error_text(content):
-            raise OpenRouterEmptyResponseError("OpenRouter returned empty or suspicious content")
+        if content is None or not content.strip():
+            raise OpenRouterEmptyResponseError("OpenRouter returned empty content")
+        marker = find_error_marker(content)
+        if marker is not None:
+            raise OpenRouterInvalidResponseError(check=ERROR_TEXT, detail=marker)
 
-        return content.strip()
+        model = data.get("model")
+        return UpstreamCompletion(
+            content=content.strip(),
+            usage=parse_usage(data),
+            model=model if isinstance(model, str) else None,
+        )
 
 
 def _parse_retry_after(value: str | None) -> float | None:
@@ -112,6 +223,16 @@ def _extract_error_message(body: Any) -> str:
     return str(body)
 
 
+def _finish_reason(data: Any) -> str | None:
+    if not isinstance(data, dict):
+        return None
+    choices = data.get("choices")
+    if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+        return None
+    reason = choices[0].get("finish_reason")
+    return reason if isinstance(reason, str) else None
+
+
 def _extract_message_content(data: Any) -> str | None:
     if not isinstance(data, dict):
         return None
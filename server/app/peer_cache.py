@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import hmac
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+
+from .result_cache import ORIGIN_PEER, ResultCache
+
+PEER_HIT = "hit"
+PEER_PENDING = "pending"
+PEER_MISS = "miss"
+PEER_TOKEN_HEADER = "X-Peer-Token"
+PEER_CACHE_PATH = "/internal/peer/cache"
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent-hash ring with ``virtual_nodes`` points per node."""
+
+    def __init__(self, nodes: list[str], *, virtual_nodes: int = 64) -> None:
+        self.nodes = sorted(set(nodes))
+        points = sorted(
+            (_ring_hash(f"{node}#{index}"), node) for node in self.nodes for index in range(max(1, virtual_nodes))
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, _ring_hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+@dataclass(slots=True)
+class _Fill:
+    done: asyncio.Event
+    expires_at: float
+    translated_text: str | None = None
+
+
+@dataclass(slots=True)
+class PeerClaim:
+    key: str
+    variant: str
+    owner: str | None = None
+
+
+@dataclass(slots=True)
+class _PeerStats:
+    lookups: int = 0
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    errors: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=512))
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def quantile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return round(ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))], 3)
+
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round((self.hits + self.coalesced) / self.lookups, 6) if self.lookups else 0.0,
+            "latency_p50_ms": quantile(0.50),
+            "latency_p95_ms": quantile(0.95),
+        }
+
+
+class PeerCache:
+    """Shares translations between proxy nodes that own cache keys on a consistent-hash ring.
+
+    A node that misses locally asks the key's owner with a tight timeout. The owner answers
+    from its result cache, or hands the asker a lease to fill the key; while a lease is
+    outstanding, other askers (local or remote) wait for that fill instead of going upstream.
+    Unreachable peers are treated as misses.
+    """
+
+    def __init__(
+        self,
+        *,
+        self_url: str,
+        peers: list[str],
+        result_cache: ResultCache,
+        http_client: httpx.AsyncClient | None = None,
+        timeout_seconds: float = 0.15,
+        fill_wait_seconds: float = 10.0,
+        lease_seconds: float = 30.0,
+        virtual_nodes: int = 64,
+        token: str = "",
+        logger=None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.self_url = self_url.rstrip("/")
+        self._ring = HashRing([self.self_url, *(peer.rstrip("/") for peer in peers)], virtual_nodes=virtual_nodes)
+        self._result_cache = result_cache
+        self._http_client = http_client
+        self._owns_client = http_client is None
+        self._timeout_seconds = timeout_seconds
+        self._fill_wait_seconds = fill_wait_seconds
+        self._lease_seconds = lease_seconds
+        self._token = token
+        self._logger = logger
+        self._clock = clock
+        self._fills: dict[str, _Fill] = {}
+        self._publishing: set[asyncio.Task] = set()
+        self._stats: dict[str, _PeerStats] = {node: _PeerStats() for node in self._ring.nodes}
+        self._served = {PEER_HIT: 0, PEER_PENDING: 0, PEER_MISS: 0, "fills": 0}
+
+    def owner(self, key: str) -> str:
+        return self._ring.owner(key)
+
+    def authorized(self, token: str | None) -> bool:
+        return bool(self._token and token) and hmac.compare_digest(token, self._token)
+
+    async def acquire(self, key: str, variant: str) -> tuple[str | None, PeerClaim | None]:
+        """Return ``(translation, None)`` on a peer hit, otherwise ``(None, claim)``.
+
+        A non-None claim must be passed to :meth:`release` once the caller has a result.
+        """
+        owner = self.owner(key)
+        stats = self._stats[owner]
+        stats.lookups += 1
+        started = time.perf_counter()
+        if owner == self.self_url:
+            status, value = self.claim(key, variant)
+            if status == PEER_HIT:
+                stats.hits += 1
+                return value, None
+            if status == PEER_PENDING:
+                translated = await self._wait_fill(value, self._fill_wait_seconds)
+                if translated is not None:
+                    stats.coalesced += 1
+                    return translated, None
+                stats.misses += 1
+                return None, None
+            stats.misses += 1
+            return None, PeerClaim(key, variant)
+
+        try:
+            data = await self._get(owner, key, {"variant": variant, "claim": "1"}, self._timeout_seconds)
+            if data["status"] == PEER_PENDING:
+                wait = self._fill_wait_seconds
+                params = {"variant": variant, "wait": str(wait)}
+                data = await self._get(owner, key, params, wait + self._timeout_seconds)
+                if data["status"] == PEER_HIT:
+                    stats.coalesced += 1
+                    return data["translated_text"], None
+                stats.misses += 1
+                return None, None
+        except (httpx.HTTPError, ValueError, KeyError) as exc:
+            stats.errors += 1
+            self._log("peer_cache outcome=peer_error owner=%s error=%s", owner, exc)
+            return None, None
+        finally:
+            stats.latencies.append((time.perf_counter() - started) * 1000.0)
+        if data["status"] == PEER_HIT:
+            stats.hits += 1
+            return data["translated_text"], None
+        stats.misses += 1
+        return None, PeerClaim(key, variant, owner)
+
+    def release(self, claim: PeerClaim, translated_text: str | None) -> None:
+        if claim.owner is None:
+            self.complete(claim.key, translated_text, variant=claim.variant, store=False)
+            return
+        task = asyncio.create_task(self._publish(claim, translated_text))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    def claim(self, key: str, variant: str) -> tuple[str, str | _Fill | None]:
+        """Owner side: answer from the cache, point at a pending fill, or lease the key out."""
+        self._prune_fills()
+        entry = self._result_cache.peek(key, variant=variant)
+        if entry is not None:
+            return PEER_HIT, entry.translated_text
+        fill = self._fills.get(key)
+        if fill is not None and not fill.done.is_set() and fill.expires_at > self._clock():
+            return PEER_PENDING, fill
+        self._fills[key] = _Fill(asyncio.Event(), self._clock() + self._lease_seconds)
+        return PEER_MISS, None
+
+    async def serve(self, key: str, *, variant: str, claim: bool = False, wait: float = 0.0) -> dict:
+        if claim:
+            status, value = self.claim(key, variant)
+        else:
+            entry = self._result_cache.peek(key, variant=variant)
+            fill = self._fills.get(key)
+            status, value = (PEER_HIT, entry.translated_text) if entry is not None else (PEER_MISS, None)
+            if entry is None and wait > 0 and fill is not None and not fill.done.is_set():
+                value = await self._wait_fill(fill, min(wait, self._fill_wait_seconds))
+                status = PEER_HIT if value is not None else PEER_MISS
+        self._served[status] += 1
+        return {"status": status, "translated_text": value if status == PEER_HIT else None}
+
+    def complete(self, key: str, translated_text: str | None, *, variant: str, store: bool = True) -> None:
+        if translated_text and store:
+            self._result_cache.put(key, translated_text, origin=ORIGIN_PEER, variant=variant)
+            self._served["fills"] += 1
+        fill = self._fills.pop(key, None)
+        if fill is not None:
+            fill.translated_text = translated_text or None
+            fill.done.set()
+
+    async def close(self) -> None:
+        for task in list(self._publishing):
+            task.cancel()
+        if self._publishing:
+            await asyncio.gather(*self._publishing, return_exceptions=True)
+        if self._owns_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def snapshot(self) -> dict:
+        self._prune_fills()
+        return {
+            "self": self.self_url,
+            "nodes": self._ring.nodes,
+            "pending_fills": len(self._fills),
+            "served": dict(self._served),
+            "owners": {node: stats.snapshot() for node, stats in self._stats.items()},
+        }
+
+    def _prune_fills(self) -> None:
+        # Leases have one length and expired ones are dropped before a key is leased again, so
+        # insertion order is expiry order and only the oldest entries need checking.
+        now = self._clock()
+        while self._fills:
+            key, fill = next(iter(self._fills.items()))
+            if fill.expires_at > now:
+                break
+            del self._fills[key]
+            fill.done.set()
+
+    async def _wait_fill(self, fill: _Fill, timeout: float) -> str | None:
+        timeout = min(timeout, fill.expires_at - self._clock())
+        if timeout <= 0:
+            return None
+        try:
+            await asyncio.wait_for(fill.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return fill.translated_text
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient()
+        return self._http_client
+
+    async def _get(self, owner: str, key: str, params: dict, timeout: float) -> dict:
+        response = await self._client().get(
+            f"{owner}{PEER_CACHE_PATH}/{key}",
+            params=params,
+            headers={PEER_TOKEN_HEADER: self._token},
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _publish(self, claim: PeerClaim, translated_text: str | None) -> None:
+        try:
+            response = await self._client().put(
+                f"{claim.owner}{PEER_CACHE_PATH}/{claim.key}",
+                json={"variant": claim.variant, "translated_text": translated_text},
+                headers={PEER_TOKEN_HEADER: self._token},
+                timeout=self._timeout_seconds,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            self._stats[claim.owner].errors += 1
+            self._log("peer_cache outcome=publish_error owner=%s error=%s", claim.owner, exc)
+
+    def _log(self, message: str, *args) -> None:
+        if self._logger is not None:
+            self._logger.warning(message, *args)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections import deque
+from contextlib import suppress
+from typing import Callable
+
+from .models import TranslateRequest
+from .result_cache import ORIGIN_PREFETCH, ResultCache
+
+
+class Prefetcher:
+    """Low-priority background queue that pre-translates messages into the result cache.
+
+    Workers only pick up work while the number of interactive in-flight requests is
+    below ``idle_inflight_threshold``, so prefetching never competes with on-screen
+    translations for upstream capacity.
+    """
+
+    def __init__(
+        self,
+        *,
+        translator,
+        result_cache: ResultCache,
+        logger,
+        is_idle: Callable[[], bool],
+        max_queue_size: int = 500,
+        workers: int = 1,
+        idle_poll_seconds: float = 0.25,
+    ) -> None:
+        self._translator = translator
+        self._result_cache = result_cache
+        self._logger = logger
+        self._is_idle = is_idle
+        self._max_queue_size = max_queue_size
+        self._worker_count = workers
+        self._idle_poll_seconds = idle_poll_seconds
+        self._queue: deque[tuple[tuple[str, str], TranslateRequest]] = deque()
+        self._pending: set[tuple[str, str]] = set()
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._enqueued = 0
+        self._deduplicated = 0
+        self._dropped = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, requests: list[TranslateRequest]) -> dict:
+        accepted = deduplicated = dropped = 0
+        for request in requests:
+            if not request.text.strip():
+                continue
+            key = self._translator.cache_key(request)
+            dedup_key = (request.chat_id or "", key)
+            if dedup_key in self._pending or key in self._result_cache:
+                deduplicated += 1
+                continue
+            if len(self._queue) >= self._max_queue_size:
+                dropped += 1
+                continue
+            self._pending.add(dedup_key)
+            self._queue.append((dedup_key, request))
+            accepted += 1
+
+        self._enqueued += accepted
+        self._deduplicated += deduplicated
+        self._dropped += dropped
+        if accepted:
+            self._wakeup.set()
+        return {"accepted": accepted, "deduplicated": deduplicated, "dropped": dropped}
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._run_worker()) for _ in range(self._worker_count)]
+
+    async def stop(self) -> None:
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        for task in workers:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def snapshot(self) -> dict:
+        cache = self._result_cache.snapshot()
+        completed = self._completed
+        return {
+            "queued": len(self._queue),
+            "enqueued": self._enqueued,
+            "deduplicated": self._deduplicated,
+            "dropped": self._dropped,
+            "completed": completed,
+            "failed": self._failed,
+            "hits": cache["prefetch_hits"],
+            "wasted": cache["prefetch_wasted"],
+            "hit_ratio": (cache["prefetch_hits"] / completed) if completed else 0.0,
+            "waste_ratio": (cache["prefetch_wasted"] / completed) if completed else 0.0,
+        }
+
+    async def _run_worker(self) -> None:
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if not self._is_idle():
+                await asyncio.sleep(self._idle_poll_seconds)
+                continue
+
+            dedup_key, request = self._queue.popleft()
+            try:
+                if dedup_key[1] in self._result_cache:
+                    continue
+                request_id = f"pf-{uuid.uuid4().hex[:9]}"
+                outcome = await self._translator.translate(request, request_id=request_id, origin=ORIGIN_PREFETCH)
+                if outcome.success:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._failed += 1
+                self._logger.exception("Prefetch translation failed for chat_id=%s", request.chat_id)
+            finally:
+                self._pending.discard(dedup_key)
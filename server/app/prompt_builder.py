@@ -1,39 +1,69 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from .models import TranslateRequest
 
+# The system prompt and the first user message (rules, direction and the chat summary) are
+# kept byte-stable between requests so that provider-side prompt caching can reuse them. The
+# client sends a sliding window of recent turns, which shifts with every new message, so the
+# raw context goes into the final message together with hints and CURRENT_TEXT.
+_STATIC_RULES = (
+    "You are translating a chat message.\n"
+    "Rules:\n"
+    "1. Translate ONLY the CURRENT_TEXT given in the final message.\n"
+    "2. Use context only for disambiguation and tone.\n"
+    "3. Return only the translated text with no commentary, no quotes, no labels.\n"
+    "4. Preserve meaning, intent, and casual chat tone.\n"
+)
+
 
-def _language_pair(direction: str) -> tuple[str, str]:
+def language_pair(direction: str) -> tuple[str, str]:
     if direction == "outgoing":
         return ("English", "German")
     return ("German", "English")
 
 
-def build_messages(system_prompt: str, request: TranslateRequest) -> list[dict[str, str]]:
-    source_lang, target_lang = _language_pair(request.direction)
+def build_messages(
+    system_prompt: str,
+    request: TranslateRequest,
+    examples: Sequence[tuple[str, str]] = (),
+    summary: str | None = None,
+) -> list[dict[str, str]]:
+    source_lang, target_lang = language_pair(request.direction)
+
+    summary_block = "(no summary)"
+    if summary:
+        summary_block = (
+            "Conversation summary (for understanding only; DO NOT translate):\n"
+            f"Summary of earlier messages: {summary}"
+        )
+
+    prefix_prompt = (
+        f"{_STATIC_RULES}"
+        f"5. Target language: {target_lang}.\n"
+        f"Direction: {request.direction} ({source_lang} -> {target_lang})\n\n"
+        f"{summary_block}"
+    )
 
-    context_block = "(none)"
+    context_block = ""
     if request.context:
         lines = ["Conversation context (for understanding only; DO NOT translate these lines):"]
         for item in request.context:
             lines.append(f"- {item.role}: {item.text}")
-        context_block = "\n".join(lines)
-
-    user_prompt = (
-        "You are translating a chat message.\n"
-        f"Direction: {request.direction} ({source_lang} -> {target_lang})\n"
-        "Rules:\n"
-        "1. Translate ONLY the CURRENT_TEXT below.\n"
-        "2. Use context only for disambiguation and tone.\n"
-        "3. Return only the translated text with no commentary, no quotes, no labels.\n"
-        "4. Preserve meaning, intent, and casual chat tone.\n"
-        f"5. Target language: {target_lang}.\n\n"
-        f"{context_block}\n\n"
-        "CURRENT_TEXT:\n"
-        f"{request.text}"
-    )
+        context_block = "\n".join(lines) + "\n\n"
+
+    examples_block = ""
+    if examples:
+        lines = ["Reference translations of similar earlier messages (reuse wording where it fits):"]
+        for source_text, translated_text in examples:
+            lines.append(f"- source: {source_text}\n  translation: {translated_text}")
+        examples_block = "\n".join(lines) + "\n\n"
+
+    tail_prompt = f"{context_block}{examples_block}CURRENT_TEXT:\n{request.text}"
 
     return [
         {"role": "system", "content": system_prompt},
-        {"role": "user", "content": user_prompt},
+        {"role": "user", "content": prefix_prompt},
+        {"role": "user", "content": tail_prompt},
     ]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+
+from .models import ContextMessage, TranslateRequest
+from .wire import read_model
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def utf8_size(text: str) -> int:
+    # ASCII is one byte per character, so only other text pays for an encode.
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    return text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+
+
+class RequestLimits:
+    """Byte limits for request bodies and translate fields.
+
+    Bodies are counted while they stream in and rejected with 413 past ``max_body_bytes``, so
+    an oversized request is never buffered whole or parsed. A ``text`` over ``max_text_bytes``
+    is rejected; context is trimmed instead: each message is cut to ``max_context_message_bytes``
+    and the oldest messages are dropped until the rest fit in ``max_context_bytes``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_body_bytes: int = 2 * 1024 * 1024,
+        max_text_bytes: int = 32 * 1024,
+        max_context_message_bytes: int = 4 * 1024,
+        max_context_bytes: int = 32 * 1024,
+    ) -> None:
+        self.max_body_bytes = max_body_bytes
+        self.max_text_bytes = max_text_bytes
+        self.max_context_message_bytes = max_context_message_bytes
+        self.max_context_bytes = max_context_bytes
+        self._rejected_bodies = 0
+        self._rejected_texts = 0
+        self._trimmed_requests = 0
+        self._truncated_messages = 0
+        self._dropped_messages = 0
+
+    async def read(self, request: Request, model_cls: type[ModelT]) -> ModelT:
+        try:
+            return await read_model(request, model_cls, max_bytes=self.max_body_bytes)
+        except HTTPException as exc:
+            if exc.status_code == 413:
+                self._rejected_bodies += 1
+            raise
+
+    def reject_frame(self, frame: str) -> bool:
+        if utf8_size(frame) <= self.max_body_bytes:
+            return False
+        self._rejected_bodies += 1
+        return True
+
+    def apply(self, request: TranslateRequest) -> TranslateRequest:
+        if utf8_size(request.text) > self.max_text_bytes:
+            self._rejected_texts += 1
+            raise HTTPException(status_code=413, detail=f"text exceeds {self.max_text_bytes} bytes")
+        if not request.context:
+            return request
+
+        kept: list[ContextMessage] = []
+        budget = self.max_context_bytes
+        truncated = 0
+        for message in reversed(request.context):
+            size = utf8_size(message.text)
+            cut = size > self.max_context_message_bytes
+            if cut:
+                message = ContextMessage(
+                    role=message.role, text=_truncate_utf8(message.text, self.max_context_message_bytes)
+                )
+                size = utf8_size(message.text)
+            if size > budget:
+                break
+            budget -= size
+            truncated += cut
+            kept.append(message)
+        dropped = len(request.context) - len(kept)
+        if not truncated and not dropped:
+            return request
+        self._trimmed_requests += 1
+        self._truncated_messages += truncated
+        self._dropped_messages += dropped
+        kept.reverse()
+        return request.model_copy(update={"context": kept})
+
+    def snapshot(self) -> dict:
+        return {
+            "max_body_bytes": self.max_body_bytes,
+            "max_text_bytes": self.max_text_bytes,
+            "max_context_message_bytes": self.max_context_message_bytes,
+            "max_context_bytes": self.max_context_bytes,
+            "rejected_bodies": self._rejected_bodies,
+            "rejected_texts": self._rejected_texts,
+            "trimmed_requests": self._trimmed_requests,
+            "truncated_context_messages": self._truncated_messages,
+            "dropped_context_messages": self._dropped_messages,
+        }
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import string
+from collections import Counter
+from typing import Any
+
+from .prompt_builder import language_pair
+
+ERROR_TEXT = "error_text"
+TRUNCATED = "truncated"
+ECHO = "echo"
+WRONG_LANGUAGE = "wrong_language"
+
+# Provider error text is short and leads the content, so markers are looked for in a bounded
+# head only; cost stays flat however long a real translation is.
+ERROR_SCAN_CHARS = 2048
+LANGUAGE_SCAN_CHARS = 2048
+ECHO_SCAN_CHARS = 2048
+
+_ERROR_PREFIXES = (
+    "error:",
+    "openrouter",
+    "payment required",
+    "insufficient balance",
+    "rate limit",
+    "unauthorized",
+)
+_ERROR_FRAGMENTS = (
+    "insufficient balance",
+    "payment required",
+    "api key",
+    "quota exceeded",
+    "retry-after",
+    "status code",
+)
+
+_PUNCTUATION = string.punctuation + "„“”‘’«»…–—¿¡"
+
+# Frequent function words that are unambiguous between the two languages ("in", "so", "was"
+# and friends are left out).
+_STOPWORDS = {
+    "German": frozenset(
+        "der die das und ist nicht ich du wir ihr sie es ein eine einen zu mit auf für den dem des auch aber "
+        "noch wie bin hast habe hat kann mir dich mich dir sind schon doch oder wenn dass bitte danke heute "
+        "morgen gleich jetzt hier nach bei von uns euch mein dein sehr gut".split()
+    ),
+    "English": frozenset(
+        "the and is not you we they it a an to with on for of are but have has this that what can me my your "
+        "be do i at will just if or please thanks today tomorrow now here after by from us our very good".split()
+    ),
+}
+
+
+def find_error_marker(text: str) -> str | None:
+    head = text[:ERROR_SCAN_CHARS].lower()
+    stripped = head.lstrip()
+    if not stripped:
+        return "empty"
+    for prefix in _ERROR_PREFIXES:
+        if stripped.startswith(prefix):
+            return prefix
+    for fragment in _ERROR_FRAGMENTS:
+        if fragment in head:
+            return fragment
+    return None
+
+
+def _words(text: str, limit: int) -> list[str]:
+    words = (word.strip(_PUNCTUATION) for word in text[:limit].casefold().split())
+    return [word for word in words if word]
+
+
+def _has_translatable_words(words: list[str]) -> bool:
+    return any(
+        any(char.isalpha() for char in word) and "://" not in word and not word.startswith("www.") and "@" not in word
+        for word in words
+    )
+
+
+class ResponseValidator:
+    """Cheap checks on a translation before it is accepted as a success.
+
+    ``echo`` rejects output that is the source text again (after case/punctuation folding) or
+    shares nearly all of its words; ``wrong_language`` rejects output whose function words are
+    mostly from the source language (distinct words, first 2 KB). Short texts are exempt from both,
+    and sources that need no translation (already in the target language, or only links, numbers
+    and emoji) are exempt from ``echo``, since passing them through unchanged is correct.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        echo_min_chars: int = 12,
+        echo_similarity: float = 0.9,
+        echo_min_words: int = 4,
+        language_min_words: int = 4,
+        language_ratio: float = 2.0,
+    ) -> None:
+        self.enabled = enabled
+        self._echo_min_chars = echo_min_chars
+        self._echo_similarity = echo_similarity
+        self._echo_min_words = echo_min_words
+        self._language_min_words = language_min_words
+        self._language_ratio = language_ratio
+        self._checked = 0
+        self._rejected: Counter = Counter()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> ResponseValidator:
+        return cls(
+            enabled=bool(config.get("enabled", True)),
+            echo_min_chars=int(config.get("echo_min_chars", 12)),
+            echo_similarity=float(config.get("echo_similarity", 0.9)),
+            echo_min_words=int(config.get("echo_min_words", 4)),
+            language_min_words=int(config.get("language_min_words", 4)),
+            language_ratio=float(config.get("language_ratio", 2.0)),
+        )
+
+    def check(self, source: str, output: str, direction: str) -> str | None:
+        """Return the name of the failed check, or None when the output looks like a translation."""
+        if not self.enabled:
+            return None
+        self._checked += 1
+        failed = self._echo(source, output, direction) or self._wrong_language(output, direction)
+        if failed is not None:
+            self._rejected[failed] += 1
+        return failed
+
+    def record_rejection(self, check: str) -> None:
+        self._rejected[check] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "checked": self._checked,
+            "rejected": {name: self._rejected.get(name, 0) for name in (ERROR_TEXT, TRUNCATED, ECHO, WRONG_LANGUAGE)},
+        }
+
+    def _echo(self, source: str, output: str, direction: str) -> str | None:
+        if len(source) < self._echo_min_chars:
+            return None
+        # Lengths of real translations differ; skip the folding work when they clearly do.
+        if abs(len(source) - len(output)) > len(source) * (1.0 - self._echo_similarity) + 4:
+            return None
+        source_tokens = _words(source, ECHO_SCAN_CHARS)
+        if not _has_translatable_words(source_tokens) or self._in_target_language(source, direction):
+            return None
+        if source == output:
+            return ECHO
+        output_tokens = _words(output, ECHO_SCAN_CHARS)
+        if source_tokens == output_tokens:
+            return ECHO
+        source_words = set(source_tokens)
+        if len(source_words) < self._echo_min_words:
+            return None
+        output_words = set(output_tokens)
+        overlap = len(source_words & output_words) / len(source_words | output_words)
+        return ECHO if overlap >= self._echo_similarity else None
+
+    def _wrong_language(self, output: str, direction: str) -> str | None:
+        hits = self._language_hits(output, direction)
+        if hits is None:
+            return None
+        source_hits, target_hits = hits
+        if source_hits >= 2 and source_hits >= self._language_ratio * max(target_hits, 1):
+            return WRONG_LANGUAGE
+        return None
+
+    def _in_target_language(self, text: str, direction: str) -> bool:
+        hits = self._language_hits(text, direction)
+        if hits is None:
+            return False
+        source_hits, target_hits = hits
+        return target_hits >= 2 and target_hits >= self._language_ratio * max(source_hits, 1)
+
+    def _language_hits(self, text: str, direction: str) -> tuple[int, int] | None:
+        source_language, target_language = language_pair(direction)
+        words = _words(text, LANGUAGE_SCAN_CHARS)
+        if len(words) < self._language_min_words:
+            return None
+        distinct = set(words)
+        return len(distinct & _STOPWORDS[source_language]), len(distinct & _STOPWORDS[target_language])
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from .models import TranslateRequest
+
+ORIGIN_TRANSLATE = "translate"
+ORIGIN_PREFETCH = "prefetch"
+ORIGIN_DRAFT = "draft"
+ORIGIN_PEER = "peer"
+
+
+def cache_key(direction: str, text: str, variant: str = "", context: str = "") -> str:
+    digest = hashlib.sha256(f"{direction}\0{text.strip()}\0{variant}\0{context}".encode("utf-8")).hexdigest()
+    return digest[:32]
+
+
+def context_digest(request: TranslateRequest) -> str:
+    """Digest of the chat and context a translation was made with; empty without context.
+
+    A translation that used context is only reused for the same chat and the same context,
+    which also covers the summary the chat's context produces.
+    """
+    if not request.context:
+        return ""
+    digest = hashlib.sha256((request.chat_id or "").encode("utf-8"))
+    for message in request.context:
+        digest.update(f"\0{message.role}\0{message.text}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def cache_variant(model: str, system_prompt: str) -> str:
+    """Fingerprint of everything besides the request that shapes a translation."""
+    return hashlib.sha256(f"{model}\0{system_prompt}".encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(slots=True)
+class CachedTranslation:
+    translated_text: str
+    origin: str
+    stored_at: float
+    variant: str = ""
+    served: bool = False
+
+
+class ResultCache:
+    """Bounded LRU of successful translations with TTL and prefetch hit/waste accounting."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedTranslation] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._prefetch_stored = 0
+        self._prefetch_hits = 0
+        self._prefetch_wasted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._live_entry(key) is not None
+
+    def get(self, key: str, *, variant: str | None = None) -> CachedTranslation | None:
+        entry = self._live_entry(key)
+        if entry is not None and variant is not None and entry.variant != variant:
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        if entry.origin == ORIGIN_PREFETCH and not entry.served:
+            self._prefetch_hits += 1
+        entry.served = True
+        self._entries.move_to_end(key)
+        return entry
+
+    def peek(self, key: str, *, variant: str | None = None) -> CachedTranslation | None:
+        entry = self._live_entry(key)
+        if entry is None or (variant is not None and entry.variant != variant):
+            return None
+        return entry
+
+    def put(self, key: str, translated_text: str, *, origin: str = ORIGIN_TRANSLATE, variant: str = "") -> None:
+        if self._max_entries <= 0:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._discard(previous)
+        if origin == ORIGIN_PREFETCH:
+            self._prefetch_stored += 1
+        self._entries[key] = CachedTranslation(
+            translated_text=translated_text,
+            origin=origin,
+            stored_at=self._clock(),
+            variant=variant,
+        )
+        while len(self._entries) > self._max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._discard(evicted)
+
+    def snapshot(self) -> dict:
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            "prefetch_stored": self._prefetch_stored,
+            "prefetch_hits": self._prefetch_hits,
+            "prefetch_wasted": self._prefetch_wasted,
+        }
+
+    def _live_entry(self, key: str) -> CachedTranslation | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._ttl_seconds > 0 and self._clock() - entry.stored_at > self._ttl_seconds:
+            del self._entries[key]
+            self._discard(entry)
+            return None
+        return entry
+
+    def _discard(self, entry: CachedTranslation) -> None:
+        if entry.origin == ORIGIN_PREFETCH and not entry.served:
+            self._prefetch_wasted += 1
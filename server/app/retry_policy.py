@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Callable, Sequence
+
+EMPTY_RESPONSE = "empty_response"
+TIMEOUT = "timeout"
+RATE_LIMIT = "rate_limit"
+BILLING = "billing"
+INVALID_RESPONSE = "invalid_response"
+
+BACKOFF_FIXED = "fixed"
+BACKOFF_EXPONENTIAL = "exponential"
+BACKOFF_SCHEDULE = "schedule"
+
+JITTER_NONE = "none"
+JITTER_FULL = "full"
+JITTER_EQUAL = "equal"
+
+
+@dataclass(slots=True, frozen=True)
+class RetryRule:
+    max_retries: int
+    backoff: str = BACKOFF_EXPONENTIAL
+    base_delay: float = 1.0
+    multiplier: float = 2.0
+    max_delay: float = 30.0
+    schedule: tuple[float, ...] = ()
+    jitter: str = JITTER_NONE
+    max_total_delay: float | None = None
+    honor_retry_after: bool = False
+
+    def base_delay_for(self, retry_index: int) -> float:
+        if self.backoff == BACKOFF_SCHEDULE and self.schedule:
+            return float(self.schedule[min(retry_index, len(self.schedule) - 1)])
+        if self.backoff == BACKOFF_FIXED:
+            return float(self.base_delay)
+        return float(min(self.max_delay, self.base_delay * (self.multiplier**retry_index)))
+
+    def delay_for(self, retry_index: int, *, retry_after: float | None, rng: random.Random) -> float:
+        if self.honor_retry_after and retry_after is not None:
+            return float(retry_after)
+        delay = self.base_delay_for(retry_index)
+        if self.jitter == JITTER_FULL:
+            return rng.uniform(0.0, delay)
+        if self.jitter == JITTER_EQUAL:
+            return delay / 2.0 + rng.uniform(0.0, delay / 2.0)
+        return delay
+
+
+DEFAULT_RULES: dict[str, RetryRule] = {
+    EMPTY_RESPONSE: RetryRule(max_retries=5, backoff=BACKOFF_SCHEDULE, schedule=(1.0, 2.0, 4.0, 8.0, 16.0)),
+    TIMEOUT: RetryRule(max_retries=3, backoff=BACKOFF_FIXED, base_delay=1.0),
+    RATE_LIMIT: RetryRule(max_retries=3, backoff=BACKOFF_FIXED, base_delay=2.0, honor_retry_after=True),
+    BILLING: RetryRule(max_retries=3, backoff=BACKOFF_FIXED, base_delay=5.0),
+    INVALID_RESPONSE: RetryRule(max_retries=2, backoff=BACKOFF_FIXED, base_delay=0.5),
+}
+
+
+class RetryBudget:
+    """Process-wide cap on retries: at most ``ratio`` of recent first attempts, plus a small floor.
+
+    Counts live in one-second buckets over ``window_seconds`` so both recording and
+    checking are O(window) at worst and memory is fixed.
+    """
+
+    def __init__(
+        self,
+        *,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        window_seconds: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ratio = ratio
+        self._min_retries_per_second = min_retries_per_second
+        self._window = max(1, int(window_seconds))
+        self._clock = clock
+        self._first_attempts = [0] * self._window
+        self._retries = [0] * self._window
+        self._bucket_seconds = [-1] * self._window
+        self._exhausted = 0
+
+    def record_first_attempt(self) -> None:
+        self._first_attempts[self._bucket()] += 1
+
+    def try_acquire(self) -> bool:
+        index = self._bucket()
+        now_second = self._bucket_seconds[index]
+        live = [i for i, second in enumerate(self._bucket_seconds) if now_second - second < self._window]
+        first_attempts = sum(self._first_attempts[i] for i in live)
+        retries = sum(self._retries[i] for i in live)
+        allowed = self._min_retries_per_second * self._window + self._ratio * first_attempts
+        if retries + 1 > allowed:
+            self._exhausted += 1
+            return False
+        self._retries[index] += 1
+        return True
+
+    def snapshot(self) -> dict:
+        index = self._bucket()
+        now_second = self._bucket_seconds[index]
+        live = [i for i, second in enumerate(self._bucket_seconds) if now_second - second < self._window]
+        return {
+            "ratio": self._ratio,
+            "window_seconds": self._window,
+            "first_attempts_in_window": sum(self._first_attempts[i] for i in live),
+            "retries_in_window": sum(self._retries[i] for i in live),
+            "exhausted": self._exhausted,
+        }
+
+    def _bucket(self) -> int:
+        second = int(self._clock())
+        index = second % self._window
+        if self._bucket_seconds[index] != second:
+            self._bucket_seconds[index] = second
+            self._first_attempts[index] = 0
+            self._retries[index] = 0
+        return index
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        rules: dict[str, RetryRule] | None = None,
+        *,
+        budget: RetryBudget | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.rules = dict(DEFAULT_RULES if rules is None else rules)
+        self.budget = budget
+        self._rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RetryPolicy:
+        rules = dict(DEFAULT_RULES)
+        allowed = {item.name for item in fields(RetryRule)}
+        for error_class, overrides in (config.get("rules") or {}).items():
+            values = {key: value for key, value in (overrides or {}).items() if key in allowed}
+            if "schedule" in values:
+                values["schedule"] = tuple(float(item) for item in values["schedule"])
+            base = rules.get(error_class) or RetryRule(max_retries=0)
+            rules[error_class] = replace(base, **values)
+
+        budget = None
+        budget_cfg = config.get("budget")
+        if budget_cfg and budget_cfg.get("enabled", True):
+            budget = RetryBudget(
+                ratio=float(budget_cfg.get("ratio", 0.2)),
+                min_retries_per_second=float(budget_cfg.get("min_retries_per_second", 1.0)),
+                window_seconds=int(budget_cfg.get("window_seconds", 10)),
+            )
+        return cls(rules, budget=budget)
+
+    def record_first_attempt(self) -> None:
+        if self.budget is not None:
+            self.budget.record_first_attempt()
+
+    def next_delay(
+        self,
+        error_class: str,
+        *,
+        retries_so_far: int,
+        total_delay: float,
+        retry_after: float | None = None,
+        use_budget: bool = True,
+    ) -> float | None:
+        """Return the delay before the next retry, or None when the request should fall back."""
+        rule = self.rules.get(error_class)
+        if rule is None or retries_so_far >= rule.max_retries:
+            return None
+        delay = rule.delay_for(retries_so_far, retry_after=retry_after, rng=self._rng)
+        if rule.max_total_delay is not None and total_delay + delay > rule.max_total_delay:
+            return None
+        if use_budget and self.budget is not None and not self.budget.try_acquire():
+            return None
+        return delay
+
+
+@dataclass(slots=True)
+class SimulationResult:
+    outcome: str
+    attempts: int
+    mean_latency_ms: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+    max_latency_ms: float
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+
+
+def simulate(
+    policy: RetryPolicy,
+    sequence: Sequence[str],
+    *,
+    attempt_latency_ms: dict[str, float] | float = 800.0,
+    retry_after: float | None = None,
+    trials: int = 1000,
+    seed: int = 0,
+) -> SimulationResult:
+    """Replay a per-attempt outcome sequence (e.g. ``["timeout", "timeout", "success"]``).
+
+    Outcomes past the end of the sequence repeat its last entry. Jittered policies
+    are sampled ``trials`` times; the retry budget is not consulted.
+    """
+    if not sequence:
+        raise ValueError("sequence must contain at least one outcome")
+    simulated = RetryPolicy(policy.rules, rng=random.Random(seed))
+    latencies: list[float] = []
+    outcome = "success"
+    attempts = 0
+    for _ in range(trials if _is_jittered(policy, sequence) else 1):
+        elapsed_ms = 0.0
+        retries: dict[str, int] = {}
+        total_delay = 0.0
+        attempts = 0
+        while True:
+            result = sequence[min(attempts, len(sequence) - 1)]
+            attempts += 1
+            elapsed_ms += _latency_for(attempt_latency_ms, result)
+            if result == "success":
+                outcome = "success"
+                break
+            delay = simulated.next_delay(
+                result,
+                retries_so_far=retries.get(result, 0),
+                total_delay=total_delay,
+                retry_after=retry_after if result == RATE_LIMIT else None,
+                use_budget=False,
+            )
+            if delay is None:
+                outcome = f"fallback:{result}"
+                break
+            retries[result] = retries.get(result, 0) + 1
+            total_delay += delay
+            elapsed_ms += delay * 1000.0
+        latencies.append(elapsed_ms)
+
+    ordered = sorted(latencies)
+    return SimulationResult(
+        outcome=outcome,
+        attempts=attempts,
+        mean_latency_ms=round(statistics.fmean(ordered), 3),
+        p50_latency_ms=round(_percentile(ordered, 0.50), 3),
+        p95_latency_ms=round(_percentile(ordered, 0.95), 3),
+        max_latency_ms=round(ordered[-1], 3),
+        latencies_ms=ordered,
+    )
+
+
+def _latency_for(attempt_latency_ms: dict[str, float] | float, result: str) -> float:
+    if isinstance(attempt_latency_ms, dict):
+        return float(attempt_latency_ms.get(result, attempt_latency_ms.get("default", 0.0)))
+    return float(attempt_latency_ms)
+
+
+def _is_jittered(policy: RetryPolicy, sequence: Sequence[str]) -> bool:
+    rules = [policy.rules.get(item) for item in sequence]
+    return any(rule is not None and rule.jitter != JITTER_NONE for rule in rules)
+
+
+def _percentile(ordered: list[float], quantile: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(quantile * (len(ordered) - 1))))
+    return ordered[index]
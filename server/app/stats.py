@@ -5,6 +5,9 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from .stats_window import WINDOWS, WindowedStats
+from .usage import TokenUsage
+
 
 @dataclass(slots=True)
 class RequestHandle:
@@ -12,8 +15,9 @@ class RequestHandle:
 
 
 class StatsTracker:
-    def __init__(self) -> None:
+    def __init__(self, *, windows: WindowedStats | None = None) -> None:
         self._lock = asyncio.Lock()
+        self._windows = windows or WindowedStats()
         self._boot_wall = datetime.now(timezone.utc)
         self._boot_perf = time.perf_counter()
         self._total_requests = 0
@@ -21,7 +25,16 @@ class StatsTracker:
         self._fallback_count = 0
         self._total_response_time_ms = 0.0
         self._inflight_requests = 0
+        self._cancelled_requests = 0
         self._last_successful_translation_at: datetime | None = None
+        self._requests_with_usage = 0
+        self._prompt_tokens = 0
+        self._cached_prompt_tokens = 0
+        self._completion_tokens = 0
+
+    @property
+    def inflight_requests(self) -> int:
+        return self._inflight_requests
 
     async def record_translate_request_start(self) -> RequestHandle:
         async with self._lock:
@@ -29,9 +42,30 @@ class StatsTracker:
             self._inflight_requests += 1
         return RequestHandle(started_at_perf=time.perf_counter())
 
-    async def record_translate_request_end(self, handle: RequestHandle, *, success: bool, used_fallback: bool) -> None:
+    async def record_translate_request_end(
+        self,
+        handle: RequestHandle,
+        *,
+        success: bool,
+        used_fallback: bool,
+        usage: TokenUsage | None = None,
+        failure_reason: str | None = None,
+        attempts: int = 0,
+    ) -> None:
         elapsed_ms = (time.perf_counter() - handle.started_at_perf) * 1000.0
         async with self._lock:
+            self._windows.record(
+                latency_ms=elapsed_ms,
+                success=success,
+                used_fallback=used_fallback,
+                failure_reason=failure_reason,
+                attempts=attempts,
+            )
+            if usage is not None:
+                self._requests_with_usage += 1
+                self._prompt_tokens += usage.prompt_tokens
+                self._cached_prompt_tokens += usage.cached_tokens
+                self._completion_tokens += usage.completion_tokens
             self._inflight_requests = max(0, self._inflight_requests - 1)
             self._total_response_time_ms += elapsed_ms
             if used_fallback:
@@ -40,6 +74,12 @@ class StatsTracker:
                 self._successful_translations += 1
                 self._last_successful_translation_at = datetime.now(timezone.utc)
 
+    async def record_translate_request_cancelled(self, handle: RequestHandle) -> None:
+        async with self._lock:
+            self._inflight_requests = max(0, self._inflight_requests - 1)
+            self._cancelled_requests += 1
+            self._windows.record_cancelled()
+
     async def health_snapshot(self, openrouter_configured: bool) -> dict:
         async with self._lock:
             last_success = self._last_successful_translation_at.isoformat() if self._last_successful_translation_at else None
@@ -50,6 +90,10 @@ class StatsTracker:
             "openrouter_configured": openrouter_configured,
         }
 
+    async def window_snapshot(self, window: str | None = None) -> dict:
+        async with self._lock:
+            return {name: self._windows.snapshot(name) for name in WINDOWS if window in (None, name)}
+
     async def stats_snapshot(self) -> dict:
         async with self._lock:
             total = self._total_requests
@@ -57,6 +101,11 @@ class StatsTracker:
             fallback = self._fallback_count
             avg_ms = self._total_response_time_ms / total if total else 0.0
             inflight = self._inflight_requests
+            cancelled = self._cancelled_requests
+            usage_requests = self._requests_with_usage
+            prompt_tokens = self._prompt_tokens
+            cached_tokens = self._cached_prompt_tokens
+            completion_tokens = self._completion_tokens
         return {
             "total_requests": total,
             "successful_translations": success,
@@ -64,4 +113,11 @@ class StatsTracker:
             "success_rate": (success / total) if total else 0.0,
             "average_response_time_ms": round(avg_ms, 3),
             "inflight_requests": inflight,
+            "cancelled_requests": cancelled,
+            "prompt_tokens_total": prompt_tokens,
+            "cached_prompt_tokens_total": cached_tokens,
+            "completion_tokens_total": completion_tokens,
+            "prompt_cache_hit_ratio": round(cached_tokens / prompt_tokens, 6) if prompt_tokens else 0.0,
+            "prompt_tokens_per_request": round(prompt_tokens / usage_requests, 3) if usage_requests else 0.0,
+            "completion_tokens_per_request": round(completion_tokens / usage_requests, 3) if usage_requests else 0.0,
         }
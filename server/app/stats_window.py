@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import bisect
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable
+
+WINDOWS = {"1m": 60, "5m": 300, "15m": 900}
+MAX_REASONS_PER_BUCKET = 32
+OTHER_REASON = "other"
+
+# Log-spaced latency bucket upper bounds from 1 ms to about 2 minutes (each 25% wider).
+LATENCY_BOUNDS_MS = tuple(round(1.25**index, 3) for index in range(53))
+
+
+@dataclass(slots=True)
+class _Bucket:
+    epoch: int = -1
+    requests: int = 0
+    successes: int = 0
+    fallbacks: int = 0
+    cancelled: int = 0
+    latency_counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BOUNDS_MS) + 1))
+    reasons: Counter = field(default_factory=Counter)
+    attempts: Counter = field(default_factory=Counter)
+
+    def reset(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.requests = self.successes = self.fallbacks = self.cancelled = 0
+        self.latency_counts = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        self.reasons.clear()
+        self.attempts.clear()
+
+
+class WindowedStats:
+    """Fixed ring of ``bucket_seconds`` buckets covering the longest of ``WINDOWS``.
+
+    Recording touches one bucket; a window snapshot merges the buckets it covers.
+    Latency percentiles come from a log-spaced histogram, so they are upper bounds
+    accurate to one bucket width (25%).
+    """
+
+    def __init__(self, *, bucket_seconds: int = 5, clock: Callable[[], float] = time.monotonic) -> None:
+        self._bucket_seconds = max(1, bucket_seconds)
+        self._clock = clock
+        self._started_at = clock()
+        self._buckets = [_Bucket() for _ in range(math.ceil(max(WINDOWS.values()) / self._bucket_seconds))]
+
+    def record(
+        self,
+        *,
+        latency_ms: float,
+        success: bool,
+        used_fallback: bool,
+        failure_reason: str | None = None,
+        attempts: int = 0,
+    ) -> None:
+        bucket = self._current()
+        bucket.requests += 1
+        bucket.latency_counts[bisect.bisect_left(LATENCY_BOUNDS_MS, latency_ms)] += 1
+        if success:
+            bucket.successes += 1
+        if used_fallback:
+            bucket.fallbacks += 1
+            reason = failure_reason or "unknown"
+            if reason not in bucket.reasons and len(bucket.reasons) >= MAX_REASONS_PER_BUCKET:
+                reason = OTHER_REASON
+            bucket.reasons[reason] += 1
+            bucket.attempts[min(attempts, 10)] += 1
+
+    def record_cancelled(self) -> None:
+        self._current().cancelled += 1
+
+    def snapshot(self, window: str) -> dict:
+        seconds = WINDOWS[window]
+        now_epoch = self._epoch()
+        oldest_epoch = now_epoch - seconds // self._bucket_seconds + 1
+        requests = successes = fallbacks = cancelled = 0
+        latency_counts = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        reasons: Counter = Counter()
+        attempts: Counter = Counter()
+        for bucket in self._buckets:
+            if not oldest_epoch <= bucket.epoch <= now_epoch:
+                continue
+            requests += bucket.requests
+            successes += bucket.successes
+            fallbacks += bucket.fallbacks
+            cancelled += bucket.cancelled
+            for index, count in enumerate(bucket.latency_counts):
+                latency_counts[index] += count
+            reasons.update(bucket.reasons)
+            attempts.update(bucket.attempts)
+        covered = min(float(seconds), max(self._clock() - self._started_at, 1e-9))
+        return {
+            "window_seconds": seconds,
+            "requests": requests,
+            "requests_per_second": round(requests / covered, 6),
+            "successful_translations": successes,
+            "success_rate": round(successes / requests, 6) if requests else 0.0,
+            "fallback_count": fallbacks,
+            "cancelled_requests": cancelled,
+            "latency_p50_ms": _percentile(latency_counts, requests, 0.50),
+            "latency_p95_ms": _percentile(latency_counts, requests, 0.95),
+            "latency_p99_ms": _percentile(latency_counts, requests, 0.99),
+            "fallback_reasons": dict(reasons.most_common()),
+            "fallback_attempts": {str(count): total for count, total in sorted(attempts.items())},
+        }
+
+    def _epoch(self) -> int:
+        return int(self._clock() // self._bucket_seconds)
+
+    def _current(self) -> _Bucket:
+        epoch = self._epoch()
+        bucket = self._buckets[epoch % len(self._buckets)]
+        if bucket.epoch != epoch:
+            bucket.reset(epoch)
+        return bucket
+
+
+def _percentile(counts: list[int], total: int, quantile: float) -> float:
+    if not total:
+        return 0.0
+    target = max(1, math.ceil(quantile * total))
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= target:
+            return LATENCY_BOUNDS_MS[min(index, len(LATENCY_BOUNDS_MS) - 1)]
+    return LATENCY_BOUNDS_MS[-1]
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from .fair_scheduler import FairScheduler
+from .models import ContextMessage, TranslateRequest
+from .openrouter_client import UpstreamCompletion
+from .usage import UsageTracker
+
+CONTEXT_NONE = "none"
+CONTEXT_RAW = "raw"
+CONTEXT_SUMMARY = "summary"
+SCHEDULER_CLASS = "summaries"
+
+_ANCHOR_TURNS = 3
+
+_SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a chat conversation for a translator. "
+    "Keep names, relationships, open questions, tone and any terms that affect word choice. "
+    "Return only the summary."
+)
+
+
+@dataclass(slots=True)
+class ChatSummary:
+    text: str
+    anchor: tuple[str, ...]
+    covered_turns: int
+    updated_at: float
+
+
+@dataclass(slots=True)
+class ContextPlan:
+    mode: str
+    context: list[ContextMessage]
+    summary: str | None = None
+
+
+def _turn_hash(item: ContextMessage) -> str:
+    return hashlib.sha1(f"{item.role}\0{item.text}".encode("utf-8")).hexdigest()[:16]
+
+
+def _find_anchor(hashes: list[str], anchor: tuple[str, ...]) -> int | None:
+    """Index just past the last occurrence of ``anchor`` in ``hashes``."""
+    width = len(anchor)
+    for end in range(len(hashes), width - 1, -1):
+        if tuple(hashes[end - width : end]) == anchor:
+            return end
+    return None
+
+
+class ConversationSummarizer:
+    """Per-chat rolling summaries that replace the older part of long contexts.
+
+    Requests whose context exceeds ``min_context_turns`` are split into older turns and the
+    last ``keep_raw_turns``. Once a chat has a summary, prompts carry the summary, any older
+    turns it does not cover yet, and the recent raw turns. The summary is refreshed in the
+    background (one call per chat at a time) after ``every_n_turns`` uncovered turns.
+
+    Refresh calls queue in the scheduler under their own ``summaries`` class and are kept out
+    of the client's adaptive timeouts, which only track translation latency.
+    """
+
+    def __init__(
+        self,
+        *,
+        client,
+        logger,
+        model: str | None = None,
+        every_n_turns: int = 10,
+        keep_raw_turns: int = 6,
+        min_context_turns: int = 20,
+        max_chats: int = 2000,
+        max_summary_chars: int = 1200,
+        usage_tracker: UsageTracker | None = None,
+        scheduler: FairScheduler | None = None,
+        scheduler_cost_chars: int = 2000,
+    ) -> None:
+        self._client = client
+        self._logger = logger
+        self._model = model or None
+        self._every_n_turns = max(1, every_n_turns)
+        self._keep_raw_turns = max(0, keep_raw_turns)
+        self._min_context_turns = min_context_turns
+        self._max_chats = max_chats
+        self._max_summary_chars = max_summary_chars
+        self._usage_tracker = usage_tracker
+        self._scheduler = scheduler
+        self._scheduler_cost_chars = max(1, scheduler_cost_chars)
+        self._summaries: OrderedDict[str, ChatSummary] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._refreshes = 0
+        self._failures = 0
+        self._evictions = 0
+        self._summarized_requests = 0
+        self._raw_requests = 0
+
+    def plan(self, request: TranslateRequest) -> ContextPlan:
+        context = list(request.context)
+        if not context:
+            return ContextPlan(CONTEXT_NONE, context)
+        if not request.chat_id or len(context) < self._min_context_turns:
+            self._raw_requests += 1
+            return ContextPlan(CONTEXT_RAW, context)
+
+        split = max(0, len(context) - self._keep_raw_turns)
+        older, recent = context[:split], context[split:]
+        hashes = [_turn_hash(item) for item in older]
+        existing = self._summaries.get(request.chat_id)
+        covered = _find_anchor(hashes, existing.anchor) if existing is not None else None
+
+        uncovered = older if covered is None else older[covered:]
+        if len(uncovered) >= self._every_n_turns:
+            previous = existing.text if existing is not None and covered is not None else None
+            self._schedule(request.chat_id, previous, uncovered, tuple(hashes[-_ANCHOR_TURNS:]))
+
+        if covered is None:
+            self._raw_requests += 1
+            return ContextPlan(CONTEXT_RAW, context)
+        self._summaries.move_to_end(request.chat_id)
+        self._summarized_requests += 1
+        return ContextPlan(CONTEXT_SUMMARY, uncovered + recent, summary=existing.text)
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        return {
+            "chats": len(self._summaries),
+            "refreshing": len(self._tasks),
+            "refreshes": self._refreshes,
+            "failures": self._failures,
+            "evictions": self._evictions,
+            "summarized_requests": self._summarized_requests,
+            "raw_requests": self._raw_requests,
+        }
+
+    def _schedule(
+        self,
+        chat_id: str,
+        previous: str | None,
+        turns: list[ContextMessage],
+        anchor: tuple[str, ...],
+    ) -> None:
+        if chat_id in self._tasks or not anchor:
+            return
+        task = asyncio.create_task(self._refresh(chat_id, previous, turns, anchor))
+        self._tasks[chat_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(chat_id, None))
+
+    async def _refresh(
+        self,
+        chat_id: str,
+        previous: str | None,
+        turns: list[ContextMessage],
+        anchor: tuple[str, ...],
+    ) -> None:
+        lines = "\n".join(f"- {item.role}: {item.text}" for item in turns)
+        messages = [
+            {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": (
+                    f"Previous summary:\n{previous or '(none)'}\n\n"
+                    f"New messages:\n{lines}\n\n"
+                    f"Return the updated summary in at most {self._max_summary_chars} characters."
+                ),
+            },
+        ]
+        kwargs: dict[str, Any] = {"observe_latency": False}
+        if self._model:
+            kwargs["model"] = self._model
+        request_id = f"sum-{uuid.uuid4().hex[:9]}"
+        started = time.perf_counter()
+        usage = None
+        model = self._model
+        try:
+            if self._scheduler is None:
+                result = await self._client.translate(messages=messages, request_id=request_id, **kwargs)
+            else:
+                prompt_chars = sum(len(message["content"]) for message in messages)
+                cost = 1 + prompt_chars // self._scheduler_cost_chars
+                async with self._scheduler.slot(None, system_class=SCHEDULER_CLASS, cost=cost):
+                    started = time.perf_counter()
+                    result = await self._client.translate(messages=messages, request_id=request_id, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._failures += 1
+            self._record(model, started, None, success=False)
+            self._logger.warning("summary_refresh_failed chat_turns=%s error=%s", len(turns), exc)
+            return
+        if isinstance(result, UpstreamCompletion):
+            text, usage, model = result.content, result.usage, result.model or model
+        else:
+            text = result
+        self._record(model, started, usage, success=True)
+
+        previous_covered = self._summaries[chat_id].covered_turns if previous and chat_id in self._summaries else 0
+        self._summaries[chat_id] = ChatSummary(
+            text=text.strip()[: self._max_summary_chars],
+            anchor=anchor,
+            covered_turns=previous_covered + len(turns),
+            updated_at=time.time(),
+        )
+        self._summaries.move_to_end(chat_id)
+        self._refreshes += 1
+        while len(self._summaries) > self._max_chats:
+            self._summaries.popitem(last=False)
+            self._evictions += 1
+
+    def _record(self, model: str | None, started: float, usage, *, success: bool) -> None:
+        if self._usage_tracker is None:
+            return
+        self._usage_tracker.record_attempt(
+            model=model or getattr(self._client, "model", None) or "unknown",
+            direction="summary",
+            chat_id=None,
+            latency_ms=(time.perf_counter() - started) * 1000.0,
+            usage=usage,
+            success=success,
+        )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from .models import TranslateRequest
+from .usage import hash_chat_id
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FALLBACK = "fallback"
+OUTCOME_CANCELLED = "cancelled"
+
+
+class TraceRecorder:
+    """Writes one anonymized JSONL line per /translate request to a rotating file.
+
+    Lines carry arrival time, direction, text length, context size, hashed chat id,
+    outcome and latency, never message text, so traces can be replayed against a
+    stub upstream with ``tools/replay_traces.py``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = 20_000_000,
+        backup_count: int = 5,
+        sample_rate: float = 1.0,
+        rng: random.Random | None = None,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        self._sample_rate = sample_rate
+        self._rng = rng or random.Random()
+        self._recorded = 0
+        self._skipped = 0
+
+    def record(
+        self,
+        request: TranslateRequest,
+        *,
+        outcome: str,
+        latency_ms: float,
+        attempts: int = 0,
+        failure_reason: str | None = None,
+    ) -> None:
+        if self._sample_rate < 1.0 and self._rng.random() >= self._sample_rate:
+            self._skipped += 1
+            return
+        line = json.dumps(
+            {
+                "ts": round(time.time() - latency_ms / 1000.0, 6),
+                "direction": request.direction,
+                "text_chars": len(request.text),
+                "context_size": len(request.context),
+                "chat": hash_chat_id(request.chat_id),
+                "outcome": outcome,
+                "failure_reason": failure_reason,
+                "attempts": attempts,
+                "latency_ms": round(latency_ms, 3),
+            },
+            separators=(",", ":"),
+        )
+        self._handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.INFO}))
+        self._recorded += 1
+
+    def close(self) -> None:
+        self._handler.close()
+
+    def snapshot(self) -> dict:
+        return {"recorded": self._recorded, "skipped": self._skipped, "sample_rate": self._sample_rate}
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import random
+import re
+import unicodedata
+import zlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+_EMPTY_BIN = 1 << 64
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+(?:['’]\w+)*")
+_NEGATIONS = frozenset(
+    "not no never nothing nobody none neither nor cannot without "
+    "nicht kein keine keinen keinem keiner keines nie niemals nichts niemand nein weder ohne".split()
+)
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip().lower()
+
+
+def guard_tokens(normalized: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Numbers and negations of a normalized text; near-duplicates differing in these mean different things."""
+    digits: list[str] = []
+    negations: list[str] = []
+    for word in _WORD_RE.findall(normalized):
+        if any(char.isdigit() for char in word):
+            digits.append(word)
+        elif word in _NEGATIONS or word.endswith(("n't", "n’t")):
+            negations.append(word)
+    return tuple(digits), tuple(sorted(negations))
+
+
+def char_ngrams(normalized: str, size: int) -> set[str]:
+    padded = f" {normalized} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+def jaccard(left: set[str], right: set[str]) -> float:
+    if not left and not right:
+        return 1.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+@dataclass(slots=True)
+class MemoryMatch:
+    source_text: str
+    translated_text: str
+    similarity: float
+
+
+@dataclass(slots=True)
+class MemoryLookup:
+    direct: MemoryMatch | None = None
+    hints: list[MemoryMatch] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _MemoryEntry:
+    normalized: str
+    source_text: str
+    translated_text: str
+    band_keys: array
+
+
+class _DirectionIndex:
+    def __init__(self) -> None:
+        self.entries: OrderedDict[int, _MemoryEntry] = OrderedDict()
+        self.by_text: dict[str, int] = {}
+        self.buckets: dict[int, list[int]] = {}
+
+
+class TranslationMemory:
+    """Per-direction MinHash/LSH index over previously translated source texts.
+
+    A match at ``direct_threshold`` or above is served directly only when its numbers and
+    negations equal the query's; otherwise it is downgraded to a prompt hint.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 200_000,
+        direct_threshold: float = 0.92,
+        hint_threshold: float = 0.5,
+        max_hints: int = 3,
+        ngram_size: int = 3,
+        num_perm: int = 32,
+        bands: int = 16,
+        max_bucket_size: int = 32,
+        max_candidates: int = 8,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_entries = max_entries
+        self.direct_threshold = direct_threshold
+        self.hint_threshold = hint_threshold
+        self.max_hints = max_hints
+        self._ngram_size = ngram_size
+        self._rows = num_perm // bands
+        self._bands = bands
+        self._max_bucket_size = max_bucket_size
+        self._max_candidates = max_candidates
+        self._num_perm = num_perm
+        self._salt = random.Random(seed).getrandbits(32)
+        self._indexes: dict[str, _DirectionIndex] = {}
+        self._next_id = 0
+        self._lookups = 0
+        self._direct_hits = 0
+        self._hint_hits = 0
+        self._guarded = 0
+
+    def __len__(self) -> int:
+        return sum(len(index.entries) for index in self._indexes.values())
+
+    def add(self, direction: str, source_text: str, translated_text: str) -> None:
+        normalized = normalize_text(source_text)
+        if not normalized:
+            return
+        index = self._indexes.setdefault(direction, _DirectionIndex())
+        existing_id = index.by_text.get(normalized)
+        if existing_id is not None:
+            entry = index.entries[existing_id]
+            entry.source_text = source_text
+            entry.translated_text = translated_text
+            index.entries.move_to_end(existing_id)
+            return
+
+        entry_id = self._next_id
+        self._next_id += 1
+        band_keys = self._band_keys(normalized)
+        index.entries[entry_id] = _MemoryEntry(normalized, source_text, translated_text, band_keys)
+        index.by_text[normalized] = entry_id
+        for key in band_keys:
+            bucket = index.buckets.setdefault(key, [])
+            if len(bucket) >= self._max_bucket_size:
+                bucket.pop(0)
+            bucket.append(entry_id)
+
+        if len(index.entries) > self.max_entries:
+            self._evict_oldest(index)
+
+    def lookup(self, direction: str, text: str, *, limit: int = 3, min_similarity: float = 0.0) -> list[MemoryMatch]:
+        index = self._indexes.get(direction)
+        normalized = normalize_text(text)
+        if index is None or not normalized:
+            return []
+
+        exact_id = index.by_text.get(normalized)
+        if exact_id is not None:
+            entry = index.entries[exact_id]
+            index.entries.move_to_end(exact_id)
+            return [MemoryMatch(entry.source_text, entry.translated_text, 1.0)]
+
+        collisions: dict[int, int] = {}
+        for key in self._band_keys(normalized):
+            for entry_id in index.buckets.get(key, ()):
+                collisions[entry_id] = collisions.get(entry_id, 0) + 1
+        if not collisions:
+            return []
+
+        candidates = sorted(collisions, key=collisions.__getitem__, reverse=True)[: self._max_candidates]
+        grams = char_ngrams(normalized, self._ngram_size)
+        matches: list[MemoryMatch] = []
+        for entry_id in candidates:
+            entry = index.entries.get(entry_id)
+            if entry is None:
+                continue
+            similarity = jaccard(grams, char_ngrams(entry.normalized, self._ngram_size))
+            if similarity >= min_similarity:
+                matches.append(MemoryMatch(entry.source_text, entry.translated_text, similarity))
+        matches.sort(key=lambda match: match.similarity, reverse=True)
+        return matches[:limit]
+
+    def match(self, direction: str, text: str) -> MemoryLookup:
+        self._lookups += 1
+        matches = self.lookup(direction, text, limit=max(1, self.max_hints), min_similarity=self.hint_threshold)
+        if matches and matches[0].similarity >= self.direct_threshold:
+            if guard_tokens(normalize_text(text)) == guard_tokens(normalize_text(matches[0].source_text)):
+                self._direct_hits += 1
+                return MemoryLookup(direct=matches[0])
+            self._guarded += 1
+        if matches:
+            self._hint_hits += 1
+        return MemoryLookup(hints=matches[: self.max_hints])
+
+    def snapshot(self) -> dict:
+        lookups = self._lookups
+        return {
+            "entries": len(self),
+            "lookups": lookups,
+            "direct_hits": self._direct_hits,
+            "hint_hits": self._hint_hits,
+            "guarded_hits": self._guarded,
+            "direct_hit_rate": (self._direct_hits / lookups) if lookups else 0.0,
+        }
+
+    def _band_keys(self, normalized: str) -> array:
+        # One-permutation MinHash: every n-gram is hashed once and lands in one of
+        # num_perm bins; empty bins borrow from their right neighbour (rotation).
+        num_perm = self._num_perm
+        signature = [_EMPTY_BIN] * num_perm
+        for gram in char_ngrams(normalized, self._ngram_size):
+            mixed = ((zlib.crc32(gram.encode("utf-8")) ^ self._salt) * _GOLDEN64) & _MASK64
+            slot = mixed % num_perm
+            value = mixed >> 8
+            if value < signature[slot]:
+                signature[slot] = value
+        for slot in range(num_perm):
+            if signature[slot] != _EMPTY_BIN:
+                continue
+            for offset in range(1, num_perm):
+                borrowed = signature[(slot + offset) % num_perm]
+                if borrowed != _EMPTY_BIN:
+                    signature[slot] = (borrowed + offset * _GOLDEN64) & _MASK64
+                    break
+        rows = self._rows
+        return array("q", (hash((band, *signature[band * rows : (band + 1) * rows])) for band in range(self._bands)))
+
+    def _evict_oldest(self, index: _DirectionIndex) -> None:
+        entry_id, entry = index.entries.popitem(last=False)
+        index.by_text.pop(entry.normalized, None)
+        for key in entry.band_keys:
+            bucket = index.buckets.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(entry_id)
+            except ValueError:
+                continue
+            if not bucket:
+                del index.buckets[key]
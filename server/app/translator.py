@@ -1,19 +1,33 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Awaitable, Callable
 
+from .backends import BackendChain
 from .error_policy import (
     OpenRouterEmptyResponseError,
     OpenRouterError,
     OpenRouterHTTPError,
+    OpenRouterInvalidResponseError,
     OpenRouterTimeoutError,
     is_billing_related_error,
 )
+from .fair_scheduler import FairScheduler
+from .health_probe import UpstreamProber
+from .model_router import ModelRouter, RouteDecision
 from .models import TranslateRequest
+from .openrouter_client import UpstreamCompletion
 from .prompt_builder import build_messages
+from .peer_cache import PeerCache
+from .response_validator import ERROR_TEXT, TRUNCATED, ResponseValidator
+from .result_cache import ORIGIN_DRAFT, ORIGIN_PEER, ORIGIN_TRANSLATE, ResultCache, cache_key, cache_variant, context_digest
+from .retry_policy import BILLING, EMPTY_RESPONSE, INVALID_RESPONSE, RATE_LIMIT, TIMEOUT, RetryPolicy
+from .summaries import ConversationSummarizer
+from .translation_memory import TranslationMemory
+from .usage import TokenUsage, UsageTracker
 
 DEFAULT_SYSTEM_PROMPT = (
     "You are a translation engine for a messaging app. Translate accurately and naturally. "
@@ -22,6 +36,14 @@ DEFAULT_SYSTEM_PROMPT = (
 
 AsyncSleep = Callable[[float], Awaitable[None]]
 
+_RETRY_LOG_OUTCOMES = {
+    EMPTY_RESPONSE: "retry_empty",
+    TIMEOUT: "retry_timeout",
+    RATE_LIMIT: "retry_rate_limit",
+    BILLING: "retry_billing",
+    INVALID_RESPONSE: "retry_invalid",
+}
+
 
 @dataclass(slots=True)
 class TranslationOutcome:
@@ -33,6 +55,10 @@ class TranslationOutcome:
     success: bool
     failure_reason: str | None = None
     attempts: int = 0
+    usage: TokenUsage | None = None
+    cache_key: str | None = None
+    backend: str | None = None
+    degraded: bool = False
 
 
 class Translator:
@@ -43,13 +69,43 @@ class Translator:
         system_prompt_file: Path,
         logger,
         sleep_func: AsyncSleep = asyncio.sleep,
+        translation_memory: TranslationMemory | None = None,
+        usage_tracker: UsageTracker | None = None,
+        result_cache: ResultCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        summarizer: ConversationSummarizer | None = None,
+        router: ModelRouter | None = None,
+        scheduler: FairScheduler | None = None,
+        scheduler_cost_chars: int = 2000,
+        backend_chain: BackendChain | None = None,
+        peer_cache: PeerCache | None = None,
+        upstream_health: UpstreamProber | None = None,
+        response_validator: ResponseValidator | None = None,
     ) -> None:
         self._openrouter_client = openrouter_client
         self._system_prompt_file = system_prompt_file
         self._logger = logger
         self._sleep = sleep_func
+        self._translation_memory = translation_memory
+        self._usage_tracker = usage_tracker
+        self._result_cache = result_cache
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._summarizer = summarizer
+        self._router = router
+        self._scheduler = scheduler
+        self._scheduler_cost_chars = max(1, scheduler_cost_chars)
+        self._backend_chain = backend_chain
+        self._peer_cache = peer_cache
+        self._upstream_health = upstream_health
+        self._response_validator = response_validator
 
-    async def translate(self, request: TranslateRequest, request_id: str) -> TranslationOutcome:
+    async def translate(
+        self,
+        request: TranslateRequest,
+        request_id: str,
+        *,
+        origin: str = ORIGIN_TRANSLATE,
+    ) -> TranslationOutcome:
         original_text = request.text
         if original_text == "":
             return TranslationOutcome(
@@ -64,19 +120,187 @@ class Translator:
             )
 
         system_prompt = self._read_system_prompt()
-        messages = build_messages(system_prompt, request)
+        variant = self.cache_variant(system_prompt)
+        key = cache_key(request.direction, original_text, variant, context_digest(request))
+        if self._result_cache is not None:
+            cached = self._result_cache.get(key)
+            if cached is not None:
+                self._logger.info(
+                    "request_id=%s outcome=cache_hit direction=%s origin=%s",
+                    request_id,
+                    request.direction,
+                    cached.origin,
+                )
+                return TranslationOutcome(
+                    translated_text=cached.translated_text,
+                    original_text=original_text,
+                    direction=request.direction,
+                    translation_failed=False,
+                    used_fallback=False,
+                    success=True,
+                    attempts=0,
+                    cache_key=key,
+                )
+
+        examples: list[tuple[str, str]] = []
+        if self._translation_memory is not None:
+            lookup = self._translation_memory.match(request.direction, original_text)
+            if lookup.direct is not None:
+                if self._result_cache is not None:
+                    self._result_cache.put(key, lookup.direct.translated_text, origin=origin, variant=variant)
+                self._logger.info(
+                    "request_id=%s outcome=memory_hit direction=%s similarity=%.3f",
+                    request_id,
+                    request.direction,
+                    lookup.direct.similarity,
+                )
+                return TranslationOutcome(
+                    translated_text=lookup.direct.translated_text,
+                    original_text=original_text,
+                    direction=request.direction,
+                    translation_failed=False,
+                    used_fallback=False,
+                    success=True,
+                    attempts=0,
+                    cache_key=key,
+                )
+            examples = [(match.source_text, match.translated_text) for match in lookup.hints]
+
+        claim = None
+        if self._peer_cache is not None and origin != ORIGIN_DRAFT:
+            peer_text, claim = await self._peer_cache.acquire(key, variant)
+            if peer_text is not None:
+                if self._result_cache is not None:
+                    self._result_cache.put(key, peer_text, origin=ORIGIN_PEER, variant=variant)
+                self._logger.info("request_id=%s outcome=peer_hit direction=%s", request_id, request.direction)
+                return TranslationOutcome(
+                    translated_text=peer_text,
+                    original_text=original_text,
+                    direction=request.direction,
+                    translation_failed=False,
+                    used_fallback=False,
+                    success=True,
+                    attempts=0,
+                    cache_key=key,
+                )
+        outcome = None
+        try:
+            outcome = await self._translate_uncached(request, request_id, system_prompt, examples, key, variant, origin)
+        finally:
+            if claim is not None:
+                filled = outcome is not None and outcome.success and outcome.cache_key == key
+                self._peer_cache.release(claim, outcome.translated_text if filled else None)
+        return outcome
+
+    async def _translate_uncached(
+        self,
+        request: TranslateRequest,
+        request_id: str,
+        system_prompt: str,
+        examples: list[tuple[str, str]],
+        key: str,
+        variant: str,
+        origin: str,
+    ) -> TranslationOutcome:
+        prompt_request, summary, context_mode = request, None, None
+        if self._summarizer is not None:
+            plan = self._summarizer.plan(request)
+            context_mode, summary = plan.mode, plan.summary
+            if plan.summary is not None:
+                prompt_request = request.model_copy(update={"context": plan.context})
+        messages = build_messages(system_prompt, prompt_request, examples, summary=summary)
+
+        upstream_down = self._upstream_health is not None and self._upstream_health.upstream_down
+        if self._backend_chain is not None and upstream_down:
+            outcome = await self._translate_fallback_chain(request, request_id, messages, None)
+            if outcome is not None:
+                return outcome
 
-        empty_backoffs = [1, 2, 4, 8, 16]
-        empty_retry_idx = 0
-        timeout_retries = 0
-        billing_retries = 0
-        rate_limit_retries = 0
+        route = self._router.route(prompt_request) if self._router is not None else None
+        started = time.perf_counter()
+        outcome = await self._translate_upstream(
+            request,
+            request_id,
+            messages,
+            key=key,
+            variant=variant,
+            origin=origin,
+            context_mode=context_mode,
+            route=route,
+        )
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        if route is not None:
+            self._router.record(route, latency_ms=latency_ms, success=outcome.success)
+        if self._backend_chain is not None:
+            self._backend_chain.record_primary(latency_ms, outcome.success)
+            if outcome.used_fallback:
+                return await self._translate_fallback_chain(request, request_id, messages, outcome) or outcome
+        return outcome
+
+    async def _translate_fallback_chain(
+        self,
+        request: TranslateRequest,
+        request_id: str,
+        messages: list[dict[str, str]],
+        primary: TranslationOutcome | None,
+    ) -> TranslationOutcome | None:
+        validate = None
+        if self._response_validator is not None:
+            validator = self._response_validator
+
+            def validate(text: str) -> str | None:
+                return validator.check(request.text, text, request.direction)
+
+        hit = await self._backend_chain.run(request, messages, request_id, validate=validate)
+        if hit is None:
+            return None
+        self._logger.info(
+            "request_id=%s outcome=backend_fallback backend=%s direction=%s primary_reason=%s",
+            request_id,
+            hit.backend,
+            request.direction,
+            primary.failure_reason if primary is not None else "upstream_down",
+        )
+        return TranslationOutcome(
+            translated_text=hit.translated_text,
+            original_text=request.text,
+            direction=request.direction,
+            translation_failed=False,
+            used_fallback=False,
+            success=True,
+            attempts=primary.attempts if primary is not None else 0,
+            usage=hit.usage,
+            backend=hit.backend,
+            degraded=hit.degraded,
+        )
+
+    async def _translate_upstream(
+        self,
+        request: TranslateRequest,
+        request_id: str,
+        messages: list[dict[str, str]],
+        *,
+        key: str,
+        variant: str,
+        origin: str,
+        context_mode: str | None,
+        route: RouteDecision | None,
+    ) -> TranslationOutcome:
+        original_text = request.text
+        retries: dict[str, int] = {}
+        total_delay = 0.0
         attempts = 0
+        self._retry_policy.record_first_attempt()
 
         while True:
             attempts += 1
+            retry_after: float | None = None
             try:
-                translated = await self._openrouter_client.translate(messages=messages, request_id=request_id)
+                translated, usage = await self._call_upstream(request, messages, request_id, context_mode, route)
+                if self._result_cache is not None:
+                    self._result_cache.put(key, translated, origin=origin, variant=variant)
+                if self._translation_memory is not None and origin != ORIGIN_DRAFT:
+                    self._translation_memory.add(request.direction, original_text, translated)
                 self._logger.info(
                     "request_id=%s outcome=success direction=%s attempts=%s",
                     request_id,
@@ -91,72 +315,132 @@ class Translator:
                     used_fallback=False,
                     success=True,
                     attempts=attempts,
+                    usage=usage,
+                    cache_key=key,
                 )
             except OpenRouterEmptyResponseError as exc:
-                if empty_retry_idx < len(empty_backoffs):
-                    delay = float(empty_backoffs[empty_retry_idx])
-                    empty_retry_idx += 1
-                    self._logger.warning(
-                        "request_id=%s outcome=retry_empty attempt=%s delay=%ss error=%s",
-                        request_id,
-                        attempts,
-                        delay,
-                        exc,
-                    )
-                    await self._sleep(delay)
-                    continue
-                return self._fallback(request, request_id, "empty_response", attempts)
+                error_class, error = EMPTY_RESPONSE, exc
             except OpenRouterTimeoutError as exc:
-                if timeout_retries < 3:
-                    timeout_retries += 1
-                    self._logger.warning(
-                        "request_id=%s outcome=retry_timeout attempt=%s retry=%s error=%s",
-                        request_id,
-                        attempts,
-                        timeout_retries,
-                        exc,
-                    )
-                    await self._sleep(1)
-                    continue
-                return self._fallback(request, request_id, "timeout", attempts)
+                error_class, error = TIMEOUT, exc
+            except OpenRouterInvalidResponseError as exc:
+                if self._response_validator is not None and exc.check in (ERROR_TEXT, TRUNCATED):
+                    self._response_validator.record_rejection(exc.check)
+                if exc.check == TRUNCATED and route is not None and route.max_tokens is not None:
+                    # The output hit the token cap; give the retry twice the budget.
+                    route = replace(route, max_tokens=route.max_tokens * 2)
+                error_class, error = INVALID_RESPONSE, exc
             except OpenRouterHTTPError as exc:
                 if exc.status_code == 429:
-                    if rate_limit_retries < 3:
-                        rate_limit_retries += 1
-                        delay = exc.retry_after_seconds if exc.retry_after_seconds is not None else 2.0
-                        self._logger.warning(
-                            "request_id=%s outcome=retry_rate_limit attempt=%s retry=%s delay=%ss status=%s",
-                            request_id,
-                            attempts,
-                            rate_limit_retries,
-                            delay,
-                            exc.status_code,
-                        )
-                        await self._sleep(delay)
-                        continue
-                    return self._fallback(request, request_id, "rate_limit", attempts)
-
-                if is_billing_related_error(exc):
-                    if billing_retries < 3:
-                        billing_retries += 1
-                        self._logger.warning(
-                            "request_id=%s outcome=retry_billing attempt=%s retry=%s status=%s",
-                            request_id,
-                            attempts,
-                            billing_retries,
-                            exc.status_code,
-                        )
-                        await self._sleep(5)
-                        continue
-                    return self._fallback(request, request_id, "billing", attempts)
-
-                return self._fallback(request, request_id, f"http_{exc.status_code}", attempts)
+                    error_class, error, retry_after = RATE_LIMIT, exc, exc.retry_after_seconds
+                elif is_billing_related_error(exc):
+                    error_class, error = BILLING, exc
+                else:
+                    return self._fallback(request, request_id, f"http_{exc.status_code}", attempts)
             except OpenRouterError:
                 return self._fallback(request, request_id, "openrouter_error", attempts)
             except Exception:
                 self._logger.exception("request_id=%s outcome=unexpected_exception", request_id)
                 return self._fallback(request, request_id, "unexpected_error", attempts)
 
+            retry_number = retries.get(error_class, 0)
+            delay = self._retry_policy.next_delay(
+                error_class,
+                retries_so_far=retry_number,
+                total_delay=total_delay,
+                retry_after=retry_after,
+            )
+            if delay is None:
+                return self._fallback(request, request_id, error_class, attempts)
+            retries[error_class] = retry_number + 1
+            total_delay += delay
+            self._logger.warning(
+                "request_id=%s outcome=%s attempt=%s retry=%s delay=%.3fs error=%s",
+                request_id,
+                _RETRY_LOG_OUTCOMES.get(error_class, f"retry_{error_class}"),
+                attempts,
+                retry_number + 1,
+                delay,
+                error,
+            )
+            await self._sleep(delay)
+
+    def cache_variant(self, system_prompt: str | None = None) -> str:
+        model = getattr(self._openrouter_client, "model", None) or ""
+        if self._router is not None:
+            model = self._router.signature
+        return cache_variant(model, self._read_system_prompt() if system_prompt is None else system_prompt)
+
+    def cache_key(self, request: TranslateRequest, variant: str | None = None) -> str:
+        variant = self.cache_variant() if variant is None else variant
+        return cache_key(request.direction, request.text, variant, context_digest(request))
+
+    async def _call_upstream(
+        self,
+        request: TranslateRequest,
+        messages: list[dict[str, str]],
+        request_id: str,
+        context_mode: str | None = None,
+        route: RouteDecision | None = None,
+    ) -> tuple[str, TokenUsage | None]:
+        kwargs = route.client_kwargs() if route is not None else {}
+        routed_model = route.model if route is not None else None
+        if self._scheduler is None:
+            return await self._attempt_upstream(request, messages, request_id, context_mode, kwargs, routed_model)
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        async with self._scheduler.slot(request.chat_id, cost=1 + prompt_chars // self._scheduler_cost_chars):
+            return await self._attempt_upstream(request, messages, request_id, context_mode, kwargs, routed_model)
+
+    async def _attempt_upstream(
+        self,
+        request: TranslateRequest,
+        messages: list[dict[str, str]],
+        request_id: str,
+        context_mode: str | None,
+        kwargs: dict,
+        routed_model: str | None,
+    ) -> tuple[str, TokenUsage | None]:
+        started = time.perf_counter()
+        try:
+            result = await self._openrouter_client.translate(messages=messages, request_id=request_id, **kwargs)
+        except BaseException:
+            self._record_attempt(
+                request, started, model=routed_model, usage=None, success=False, context_mode=context_mode
+            )
+            raise
+        translated, usage = _unpack_completion(result)
+        model = (result.model if isinstance(result, UpstreamCompletion) else None) or routed_model
+        failed_check = None
+        if self._response_validator is not None:
+            failed_check = self._response_validator.check(request.text, translated, request.direction)
+        self._record_attempt(
+            request, started, model=model, usage=usage, success=failed_check is None, context_mode=context_mode
+        )
+        if failed_check is not None:
+            raise OpenRouterInvalidResponseError(check=failed_check)
+        return translated, usage
+
+    def _record_attempt(
+        self,
+        request: TranslateRequest,
+        started: float,
+        *,
+        model: str | None,
+        usage: TokenUsage | None,
+        success: bool,
+        context_mode: str | None = None,
+    ) -> None:
+        if self._usage_tracker is None:
+            return
+        self._usage_tracker.record_attempt(
+            model=model or getattr(self._openrouter_client, "model", None) or "unknown",
+            direction=request.direction,
+            chat_id=request.chat_id,
+            latency_ms=(time.perf_counter() - started) * 1000.0,
+            usage=usage,
+            success=success,
+            context_mode=context_mode,
+        )
+
     def _read_system_prompt(self) -> str:
         try:
             text = self._system_prompt_file.read_text(encoding="utf-8").strip()
@@ -184,3 +468,9 @@ class Translator:
             failure_reason=reason,
             attempts=attempts,
         )
+
+
+def _unpack_completion(result: UpstreamCompletion | str) -> tuple[str, TokenUsage | None]:
+    if isinstance(result, UpstreamCompletion):
+        return result.content, result.usage
+    return result, None
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(slots=True)
+class TokenUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost: float | None = None
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        cost = None
+        if self.cost is not None or other.cost is not None:
+            cost = (self.cost or 0.0) + (other.cost or 0.0)
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            cost=cost,
+        )
+
+
+def parse_usage(data: Any) -> TokenUsage | None:
+    if not isinstance(data, dict):
+        return None
+    usage = data.get("usage")
+    if not isinstance(usage, dict):
+        return None
+
+    details = usage.get("prompt_tokens_details")
+    cached = details.get("cached_tokens") if isinstance(details, dict) else usage.get("cached_tokens")
+    cost = usage.get("cost")
+    return TokenUsage(
+        prompt_tokens=_as_int(usage.get("prompt_tokens")),
+        completion_tokens=_as_int(usage.get("completion_tokens")),
+        cached_tokens=_as_int(cached),
+        cost=float(cost) if isinstance(cost, (int, float)) else None,
+    )
+
+
+def _as_int(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return max(0, int(value))
+
+
+# Chat ids are small numbers, so a plain hash is reversed by trying them all; the HMAC key keeps
+# hashes opaque outside this deployment. Without a configured secret a random one is used per process.
+_chat_hash_secret = secrets.token_bytes(32)
+
+
+def configure_chat_hash(secret: str | None) -> None:
+    global _chat_hash_secret
+    if secret:
+        _chat_hash_secret = secret.encode("utf-8")
+
+
+def hash_chat_id(chat_id: str | None) -> str:
+    if not chat_id:
+        return "none"
+    return hmac.new(_chat_hash_secret, chat_id.encode("utf-8"), hashlib.sha256).hexdigest()[:12]
+
+
+@dataclass(slots=True)
+class _UsageBucket:
+    attempts: int = 0
+    successes: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    upstream_ms: float = 0.0
+    success_completion_tokens: int = 0
+    success_upstream_ms: float = 0.0
+
+    def add(self, *, latency_ms: float, usage: TokenUsage | None, success: bool) -> None:
+        self.attempts += 1
+        self.upstream_ms += latency_ms
+        if success:
+            self.successes += 1
+            self.success_upstream_ms += latency_ms
+        if usage is not None:
+            self.prompt_tokens += usage.prompt_tokens
+            self.cached_tokens += usage.cached_tokens
+            self.completion_tokens += usage.completion_tokens
+            self.cost_usd += usage.cost or 0.0
+            if success:
+                self.success_completion_tokens += usage.completion_tokens
+
+    def snapshot(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 8),
+            "average_upstream_ms": round(self.upstream_ms / self.attempts, 3) if self.attempts else 0.0,
+            # Throughput of successful generations only: failed attempts count toward cost but
+            # their tokens and time are left out together so the ratio keeps one scope.
+            "tokens_per_second": _tokens_per_second(self.success_completion_tokens, self.success_upstream_ms),
+            "cost_per_successful_translation_usd": (
+                round(self.cost_usd / self.successes, 8) if self.successes else 0.0
+            ),
+        }
+
+
+def _tokens_per_second(completion_tokens: int, upstream_ms: float) -> float:
+    if upstream_ms <= 0:
+        return 0.0
+    return round(completion_tokens / (upstream_ms / 1000.0), 3)
+
+
+class UsageTracker:
+    """Aggregates upstream usage and latency per attempt, by model, direction and hashed chat."""
+
+    def __init__(self, *, max_chats: int = 1000, top_chats: int = 10) -> None:
+        self._max_chats = max_chats
+        self._top_chats = top_chats
+        self._total = _UsageBucket()
+        self._by_model: dict[str, _UsageBucket] = {}
+        self._by_direction: dict[str, _UsageBucket] = {}
+        self._by_context: dict[str, _UsageBucket] = {}
+        self._by_chat: OrderedDict[str, _UsageBucket] = OrderedDict()
+
+    def record_attempt(
+        self,
+        *,
+        model: str,
+        direction: str,
+        chat_id: str | None,
+        latency_ms: float,
+        usage: TokenUsage | None,
+        success: bool,
+        context_mode: str | None = None,
+    ) -> None:
+        chat_hash = hash_chat_id(chat_id)
+        chat_bucket = self._by_chat.get(chat_hash)
+        if chat_bucket is None:
+            chat_bucket = self._by_chat[chat_hash] = _UsageBucket()
+            if len(self._by_chat) > self._max_chats:
+                self._by_chat.popitem(last=False)
+        else:
+            self._by_chat.move_to_end(chat_hash)
+
+        for bucket in (
+            self._total,
+            self._by_model.setdefault(model, _UsageBucket()),
+            self._by_direction.setdefault(direction, _UsageBucket()),
+            chat_bucket,
+        ):
+            bucket.add(latency_ms=latency_ms, usage=usage, success=success)
+        if context_mode is not None:
+            self._by_context.setdefault(context_mode, _UsageBucket()).add(
+                latency_ms=latency_ms, usage=usage, success=success
+            )
+
+    def snapshot(self) -> dict:
+        busiest = sorted(self._by_chat.items(), key=lambda item: item[1].attempts, reverse=True)[: self._top_chats]
+        return {
+            "total": self._total.snapshot(),
+            "by_model": {model: bucket.snapshot() for model, bucket in self._by_model.items()},
+            "by_direction": {direction: bucket.snapshot() for direction, bucket in self._by_direction.items()},
+            "by_context": {mode: bucket.snapshot() for mode, bucket in self._by_context.items()},
+            "top_chats": {chat_hash: bucket.snapshot() for chat_hash, bucket in busiest},
+        }
+
+    def write_rollup(self, path: Path, *, max_bytes: int = 5_000_000, backup_count: int = 3) -> None:
+        line = json.dumps({"at": datetime.now(timezone.utc).isoformat(), **self.snapshot()}, sort_keys=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.INFO}))
+        finally:
+            handler.close()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+
+try:  # optional: brotli content-encoding
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed extras
+    brotli = None
+
+try:  # optional: MessagePack content type
+    import msgpack
+except ImportError:  # pragma: no cover - depends on installed extras
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack"})
+MAX_DECOMPRESSED_BYTES = 8 * 1024 * 1024
+MIN_COMPRESS_BYTES = 512
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def decode_body(body: bytes, content_encoding: str | None, *, max_bytes: int = MAX_DECOMPRESSED_BYTES) -> bytes:
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding in {"", "identity"}:
+        return body
+    if encoding in {"gzip", "x-gzip"}:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decompressor = zlib.decompressobj()
+    elif encoding == "br" and brotli is not None:
+        return _decode_brotli(body, max_bytes)
+    else:
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+
+    try:
+        decoded = decompressor.decompress(body, max_bytes)
+        if decompressor.unconsumed_tail:
+            raise HTTPException(status_code=413, detail="Decompressed request body too large")
+        decoded += decompressor.flush()
+    except zlib.error as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed {encoding} request body") from exc
+    if not decompressor.eof:
+        raise HTTPException(status_code=400, detail=f"Malformed {encoding} request body")
+    return decoded
+
+
+def _decode_brotli(body: bytes, max_bytes: int) -> bytes:
+    # The output buffer stops growing at the limit, so a bomb never inflates much past max_bytes.
+    decompressor = brotli.Decompressor()
+    try:
+        decoded = decompressor.process(body, output_buffer_limit=max_bytes + 1)
+    except brotli.error as exc:
+        raise HTTPException(status_code=400, detail="Malformed br request body") from exc
+    if len(decoded) > max_bytes or not decompressor.can_accept_more_data():
+        raise HTTPException(status_code=413, detail="Decompressed request body too large")
+    if not decompressor.is_finished():
+        raise HTTPException(status_code=400, detail="Malformed br request body")
+    return decoded
+
+
+def parse_model(model_cls: type[ModelT], body: bytes, content_type: str | None) -> ModelT:
+    media_type = _media_type(content_type)
+    try:
+        if media_type in MSGPACK_MEDIA_TYPES:
+            if msgpack is None:
+                raise HTTPException(status_code=415, detail="MessagePack support is not installed")
+            try:
+                payload = msgpack.unpackb(body, raw=False)
+            except (ValueError, msgpack.UnpackException) as exc:
+                raise RequestValidationError(
+                    [{"type": "msgpack_invalid", "loc": ("body",), "msg": "Invalid MessagePack body", "input": None}]
+                ) from exc
+            return model_cls.model_validate(payload)
+        if media_type and media_type != JSON_MEDIA_TYPE and not media_type.endswith("+json"):
+            raise HTTPException(status_code=415, detail=f"Unsupported Content-Type: {media_type}")
+        return model_cls.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+
+async def read_body(request: Request, *, max_bytes: int) -> bytes:
+    """Read the raw body, failing with 413 as soon as it grows past ``max_bytes``."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+    return bytes(body)
+
+
+async def read_model(request: Request, model_cls: type[ModelT], *, max_bytes: int = MAX_DECOMPRESSED_BYTES) -> ModelT:
+    body = await read_body(request, max_bytes=max_bytes)
+    body = decode_body(body, request.headers.get("content-encoding"), max_bytes=max_bytes)
+    return parse_model(model_cls, body, request.headers.get("content-type"))
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    for media_type, _ in _weighted_tokens(accept):
+        if media_type in MSGPACK_MEDIA_TYPES and msgpack is not None:
+            return MSGPACK_MEDIA_TYPE
+        if media_type in {JSON_MEDIA_TYPE, "application/*", "*/*"}:
+            return JSON_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    supported = supported_encodings()
+    for encoding, _ in _weighted_tokens(accept_encoding):
+        if encoding in supported:
+            return encoding
+        if encoding == "*":
+            return supported[0]
+    return None
+
+
+def encode_model(model: BaseModel, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(model.model_dump(mode="python"), use_bin_type=True)
+    return model.model_dump_json().encode("utf-8")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def render_model(request: Request, model: BaseModel, *, status_code: int = 200) -> Response:
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    body = encode_model(model, media_type)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None and len(body) >= MIN_COMPRESS_BYTES:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
+
+
+def _media_type(content_type: str | None) -> str:
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def _weighted_tokens(header: str | None) -> list[tuple[str, float]]:
+    tokens: list[tuple[str, float]] = []
+    for position, part in enumerate((header or "").split(",")):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            tokens.append((name, quality - position * 1e-6))
+    tokens.sort(key=lambda item: item[1], reverse=True)
+    return tokens
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from .models import TranslateRequest, TranslateResponse
+from .request_limits import RequestLimits
+
+RunTranslate = Callable[[TranslateRequest], Awaitable[TranslateResponse]]
+
+
+@dataclass(slots=True)
+class ConnectionStats:
+    connection_id: int
+    opened_at_perf: float
+    received: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    inflight: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "connection_id": self.connection_id,
+            "age_seconds": round(time.perf_counter() - self.opened_at_perf, 3),
+            "received": self.received,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "inflight": self.inflight,
+        }
+
+
+class WebSocketStats:
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._active: dict[int, ConnectionStats] = {}
+        self._connections_total = 0
+        self._received = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._rejected = 0
+
+    def open_connection(self) -> ConnectionStats:
+        connection = ConnectionStats(connection_id=next(self._ids), opened_at_perf=time.perf_counter())
+        self._active[connection.connection_id] = connection
+        self._connections_total += 1
+        return connection
+
+    def close_connection(self, connection: ConnectionStats) -> None:
+        self._active.pop(connection.connection_id, None)
+        self._received += connection.received
+        self._completed += connection.completed
+        self._failed += connection.failed
+        self._cancelled += connection.cancelled
+        self._rejected += connection.rejected
+
+    def snapshot(self) -> dict:
+        active = list(self._active.values())
+        return {
+            "connections_total": self._connections_total,
+            "connections_active": len(active),
+            "received": self._received + sum(c.received for c in active),
+            "completed": self._completed + sum(c.completed for c in active),
+            "failed": self._failed + sum(c.failed for c in active),
+            "cancelled": self._cancelled + sum(c.cancelled for c in active),
+            "rejected": self._rejected + sum(c.rejected for c in active),
+            "active": [connection.snapshot() for connection in active],
+        }
+
+
+class TranslationSocketSession:
+    """Multiplexes translate requests over one WebSocket.
+
+    Client frames: ``{"type": "translate", "id": ..., <TranslateRequest fields>}`` and
+    ``{"type": "cancel", "id": ...}``. Results are sent as ``{"type": "result", "id": ...}``
+    in completion order; requests beyond ``max_inflight`` are rejected with ``code=busy`` and a
+    translation that raises is answered with ``code=translate_failed``. Frames must be text.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        run_translate: RunTranslate,
+        stats: WebSocketStats,
+        logger,
+        max_inflight: int = 16,
+        limits: RequestLimits | None = None,
+    ) -> None:
+        self._websocket = websocket
+        self._run_translate = run_translate
+        self._stats = stats
+        self._logger = logger
+        self._max_inflight = max_inflight
+        self._limits = limits
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._send_lock = asyncio.Lock()
+        self._connection: ConnectionStats | None = None
+
+    async def run(self) -> None:
+        await self._websocket.accept()
+        self._connection = self._stats.open_connection()
+        try:
+            while True:
+                message = await self._websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                text = message.get("text")
+                if text is None:
+                    await self._send({"type": "error", "id": None, "code": "invalid_frame", "detail": "binary frames are not supported"})
+                    continue
+                if self._limits is not None and self._limits.reject_frame(text):
+                    await self._send({"type": "error", "id": None, "code": "too_large", "detail": "frame too large"})
+                    continue
+                try:
+                    frame = json.loads(text)
+                except ValueError:
+                    await self._send({"type": "error", "id": None, "code": "invalid_frame", "detail": "invalid JSON"})
+                    continue
+                await self._handle_frame(frame)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in list(self._tasks.values()):
+                task.cancel()
+            for task in list(self._tasks.values()):
+                with suppress(asyncio.CancelledError, Exception):
+                    await task
+            self._stats.close_connection(self._connection)
+            connection = self._connection
+            self._logger.info(
+                "ws connection_id=%s received=%s completed=%s failed=%s cancelled=%s rejected=%s duration_ms=%.2f",
+                connection.connection_id,
+                connection.received,
+                connection.completed,
+                connection.failed,
+                connection.cancelled,
+                connection.rejected,
+                (time.perf_counter() - connection.opened_at_perf) * 1000.0,
+            )
+
+    async def _handle_frame(self, frame: Any) -> None:
+        connection = self._connection
+        if not isinstance(frame, dict):
+            await self._send({"type": "error", "id": None, "code": "invalid_frame", "detail": "expected object"})
+            return
+        frame_type = frame.get("type", "translate")
+        client_id = frame.get("id")
+        if not isinstance(client_id, str) or not client_id:
+            await self._send({"type": "error", "id": None, "code": "missing_id", "detail": "id is required"})
+            return
+
+        if frame_type == "cancel":
+            task = self._tasks.get(client_id)
+            if task is not None and task.cancel():
+                await self._send({"type": "cancelled", "id": client_id})
+            return
+        if frame_type != "translate":
+            await self._send({"type": "error", "id": client_id, "code": "unknown_type", "detail": str(frame_type)})
+            return
+
+        connection.received += 1
+        if client_id in self._tasks:
+            connection.rejected += 1
+            await self._send({"type": "error", "id": client_id, "code": "duplicate_id", "detail": "id in flight"})
+            return
+        if len(self._tasks) >= self._max_inflight:
+            connection.rejected += 1
+            await self._send({"type": "error", "id": client_id, "code": "busy", "detail": "in-flight limit reached"})
+            return
+        try:
+            request = TranslateRequest.model_validate({k: v for k, v in frame.items() if k not in {"type", "id"}})
+            if self._limits is not None:
+                request = self._limits.apply(request)
+        except ValidationError as exc:
+            connection.rejected += 1
+            await self._send(
+                {"type": "error", "id": client_id, "code": "invalid_request", "detail": exc.errors(include_url=False, include_context=False)}
+            )
+            return
+        except HTTPException as exc:
+            connection.rejected += 1
+            await self._send({"type": "error", "id": client_id, "code": "too_large", "detail": exc.detail})
+            return
+
+        connection.inflight += 1
+        task = asyncio.create_task(self._translate(client_id, request))
+        self._tasks[client_id] = task
+        task.add_done_callback(lambda done, key=client_id: self._task_done(key, done))
+
+    async def _translate(self, client_id: str, request: TranslateRequest) -> None:
+        try:
+            response = await self._run_translate(request)
+        except Exception as exc:
+            self._connection.failed += 1
+            self._logger.error("ws connection_id=%s id=%s failed: %r", self._connection.connection_id, client_id, exc)
+            detail = exc.detail if isinstance(exc, HTTPException) else "translation failed"
+            await self._send({"type": "error", "id": client_id, "code": "translate_failed", "detail": detail})
+            return
+        self._connection.completed += 1
+        await self._send({"type": "result", "id": client_id, **response.model_dump()})
+
+    def _task_done(self, client_id: str, task: asyncio.Task) -> None:
+        connection = self._connection
+        connection.inflight -= 1
+        if self._tasks.get(client_id) is task:
+            del self._tasks[client_id]
+        if task.cancelled():
+            connection.cancelled += 1
+        elif task.exception() is not None:
+            self._logger.error(
+                "ws connection_id=%s id=%s failed: %r",
+                connection.connection_id,
+                client_id,
+                task.exception(),
+            )
+
+    async def _send(self, payload: dict) -> None:
+        async with self._send_lock:
+            await self._websocket.send_json(payload)
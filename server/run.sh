@@ -17,4 +17,5 @@ else:
 PY
 )}"
 
-exec python3 -m uvicorn app.main:app --app-dir server --host "${BIND_HOST:-0.0.0.0}" --port "$PORT"
+exec python3 -m uvicorn --factory app.main:create_app --app-dir server --host "${BIND_HOST:-0.0.0.0}" --port "$PORT" \
+  --ws-max-size "${WS_MAX_SIZE:-2097152}"
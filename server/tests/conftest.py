@@ -2,8 +2,50 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Any, Callable
+
+import pytest
 
 # Add /server to import path so tests can import app.*
 SERVER_DIR = Path(__file__).resolve().parents[1]
 if str(SERVER_DIR) not in sys.path:
     sys.path.insert(0, str(SERVER_DIR))
+
+from app.config import Settings  # noqa: E402
+
+
+@pytest.fixture
+def make_settings(tmp_path: Path) -> Callable[..., Settings]:
+    """Build test Settings under ``tmp_path``; keyword arguments override any field."""
+
+    def make(**overrides: Any) -> Settings:
+        prompt_file = tmp_path / "system_prompt.txt"
+        if not prompt_file.exists():
+            prompt_file.write_text("Prompt", encoding="utf-8")
+        values: dict[str, Any] = {
+            "bind_host": "0.0.0.0",
+            "port": 8080,
+            "openrouter_api_key": "test-key",
+            "openrouter_model": "test/model",
+            "openrouter_base_url": "https://openrouter.test/api/v1/chat/completions",
+            "request_timeout_seconds": 15,
+            "log_level": "INFO",
+            "log_file": tmp_path / "server.log",
+            "system_prompt_file": prompt_file,
+            "disable_reasoning": True,
+        }
+        values.update(overrides)
+        return Settings(**values)
+
+    return make
+
+
+@pytest.fixture
+def settings_overrides() -> dict[str, Any]:
+    """Per-feature Settings fields; test modules override this fixture."""
+    return {}
+
+
+@pytest.fixture
+def settings(make_settings: Callable[..., Settings], settings_overrides: dict[str, Any]) -> Settings:
+    return make_settings(**settings_overrides)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import logging
+
+import httpx
+import pytest
+
+from app.adaptive_timeout import AdaptiveTimeouts, length_bucket
+from app.config import Settings
+from app.error_policy import OpenRouterTimeoutError
+from app.openrouter_client import OpenRouterClient
+
+
+def test_timeout_tracks_latency_quantile_per_model_and_length_bucket():
+    timeouts = AdaptiveTimeouts(default=15.0, floor=1.0, ceiling=15.0, factor=2.0, min_samples=5)
+    assert timeouts.timeouts_for("m", 100).read == 15.0
+
+    for latency in (0.4, 0.5, 0.6, 0.7, 0.8):
+        timeouts.observe("m", 100, latency)
+    assert timeouts.timeouts_for("m", 100).read == pytest.approx(1.6)
+    assert timeouts.timeouts_for("m", 5000).read == 15.0
+    assert timeouts.timeouts_for("other", 100).read == 15.0
+    assert length_bucket(100) != length_bucket(5000)
+
+    for _ in range(5):
+        timeouts.observe("m", 100, 0.01)
+    assert timeouts.timeouts_for("m", 100).read >= 1.0
+
+    for _ in range(10):
+        timeouts.observe("m", 100, 30.0)
+    assert timeouts.timeouts_for("m", 100).read == 15.0
+
+
+@pytest.mark.asyncio
+async def test_client_applies_separate_connect_and_read_timeouts(settings: Settings, caplog):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.extensions["timeout"])
+        if len(seen) == 2:
+            raise httpx.ReadTimeout("stuck", request=request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    timeouts = AdaptiveTimeouts(default=15.0, connect=2.5, floor=1.0, ceiling=15.0, min_samples=1)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = OpenRouterClient(settings, logging.getLogger("test"), http_client=http_client, timeouts=timeouts)
+    messages = [{"role": "user", "content": "hi"}]
+
+    with caplog.at_level(logging.INFO, logger="test"):
+        await client.translate(messages=messages, request_id="t1")
+        with pytest.raises(OpenRouterTimeoutError):
+            await client.translate(messages=messages, request_id="t2")
+        samples = timeouts.snapshot()["buckets"][f"test/model|{length_bucket(2)}"]["samples"]
+        await client.translate(messages=messages, request_id="t3", observe_latency=False)
+    await http_client.aclose()
+
+    assert timeouts.snapshot()["buckets"][f"test/model|{length_bucket(2)}"]["samples"] == samples == 2
+
+    assert seen[0]["connect"] == 2.5
+    assert seen[0]["read"] == 15.0
+    assert seen[1]["connect"] == 2.5
+    assert seen[1]["read"] == 1.0
+    attempt_logs = [record.getMessage() for record in caplog.records if "upstream_attempt" in record.getMessage()]
+    assert "request_id=t2" in attempt_logs[1]
+    assert "read_timeout=1.00s" in attempt_logs[1]
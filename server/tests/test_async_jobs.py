@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.jobs import JobStore
+from app.main import create_app
+
+
+class SlowClient:
+    model = "test/model"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def translate(self, *, messages, request_id):
+        await asyncio.sleep(self.delay)
+        return "Hello there"
+
+    async def close(self):
+        return None
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None, "translation_memory_enabled": False}
+
+
+def test_slow_translation_returns_original_and_job_id_then_long_polls(settings: Settings):
+    app = create_app(settings=settings, openrouter_client=SlowClient(0.3))
+
+    with TestClient(app) as client:
+        response = client.post("/translate", json={"text": "Hallo", "direction": "incoming", "slo_ms": 20})
+        body = response.json()
+        assert response.status_code == 200
+        assert body["translated_text"] == "Hallo"
+        assert body["translation_failed"] is True
+        assert body["translation_pending"] is True
+        job_id = body["job_id"]
+
+        pending = client.get(f"/translate/result/{job_id}").json()
+        assert pending == {"job_id": job_id, "status": "pending", "result": None}
+        assert client.get("/stats").json()["jobs"]["pending"] == 1
+
+        done = client.get(f"/translate/result/{job_id}", params={"wait": 5}).json()
+        assert done["status"] == "completed"
+        assert done["result"]["translated_text"] == "Hello there"
+        assert done["result"]["translation_failed"] is False
+
+        stats = client.get("/stats").json()
+        assert stats["jobs"]["completed"] == 1
+        assert stats["successful_translations"] == 1
+        assert client.get("/translate/result/unknown").status_code == 404
+
+
+def test_translation_within_slo_is_returned_inline(settings: Settings):
+    app = create_app(settings=settings, openrouter_client=SlowClient(0.0))
+
+    with TestClient(app) as client:
+        body = client.post("/translate", json={"text": "Hallo", "direction": "incoming", "slo_ms": 2000}).json()
+
+    assert body["translated_text"] == "Hello there"
+    assert body["translation_pending"] is False
+    assert body["job_id"] is None
+
+
+async def test_finished_jobs_expire_after_retention():
+    now = {"t": 0.0}
+    store = JobStore(max_jobs=2, retention_seconds=10, clock=lambda: now["t"])
+
+    async def work():
+        return None
+
+    job = store.create("r1", asyncio.create_task(work()))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert store.get(job.job_id).status == "completed"
+
+    now["t"] = 11.0
+    assert store.get(job.job_id) is None
+    assert store.snapshot()["expired"] == 1
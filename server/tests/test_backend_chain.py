@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.backends import (
+    BackendCapabilities,
+    BackendChain,
+    BackendTier,
+    PhraseTableBackend,
+    TranslationBackend,
+    TranslationMemoryBackend,
+)
+from app.config import Settings
+from app.error_policy import OpenRouterHTTPError
+from app.main import create_app
+from app.models import TranslateRequest
+from app.openrouter_client import OpenRouterClient
+from app.response_validator import ResponseValidator
+from app.translation_memory import TranslationMemory
+from app.translator import Translator
+
+
+class FailingPrimary:
+    model = "primary/model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def translate(self, *, messages, request_id):
+        self.calls += 1
+        raise OpenRouterHTTPError(status_code=500, message="upstream down")
+
+    async def close(self):
+        return None
+
+
+class RemoteBackend:
+    def __init__(self, name: str, result: str = "", delay: float = 0.0):
+        self.name = name
+        self.result = result
+        self.delay = delay
+        self.calls = []
+
+    async def translate(self, *, messages, request_id, **options):
+        self.calls.append(options)
+        await asyncio.sleep(self.delay)
+        if not self.result:
+            raise OpenRouterHTTPError(status_code=503, message="unavailable")
+        return self.result
+
+    async def health(self) -> dict:
+        return {"ok": bool(self.result)}
+
+    def capabilities(self) -> BackendCapabilities:
+        return BackendCapabilities()
+
+
+def _translator(tmp_path: Path, chain: BackendChain, **options) -> Translator:
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    return Translator(
+        openrouter_client=FailingPrimary(),
+        system_prompt_file=prompt_file,
+        logger=logging.getLogger("test"),
+        backend_chain=chain,
+        **options,
+    )
+
+
+def test_backends_satisfy_the_protocol(tmp_path: Path, settings: Settings):
+    client = OpenRouterClient(settings, logging.getLogger("test"))
+
+    assert isinstance(client, TranslationBackend)
+    assert isinstance(PhraseTableBackend(tmp_path / "missing.json"), TranslationBackend)
+    assert isinstance(TranslationMemoryBackend(TranslationMemory()), TranslationBackend)
+    assert client.capabilities().prompt_based
+    assert not PhraseTableBackend(tmp_path / "missing.json").capabilities().remote
+
+
+@pytest.mark.asyncio
+async def test_chain_skips_slow_and_failing_tiers_and_records_hit_rates(tmp_path: Path):
+    table = tmp_path / "phrases.json"
+    table.write_text(json.dumps({"incoming": {"Guten Morgen": "good morning"}}), encoding="utf-8")
+    slow = RemoteBackend("secondary", result="late", delay=1.0)
+    broken = RemoteBackend("tertiary")
+    chain = BackendChain(
+        [BackendTier(slow, timeout_seconds=0.01), BackendTier(broken), BackendTier(PhraseTableBackend(table))]
+    )
+    translator = _translator(tmp_path, chain)
+
+    hit = await translator.translate(TranslateRequest(text="guten  morgen!", direction="incoming"), request_id="a")
+    miss = await translator.translate(TranslateRequest(text="Wie geht's?", direction="incoming"), request_id="b")
+
+    assert hit.success and hit.translated_text == "good morning" and hit.backend == "phrase_table"
+    assert hit.cache_key is None
+    assert miss.used_fallback and miss.translated_text == "Wie geht's?" and miss.backend is None
+    tiers = chain.snapshot()["tiers"]
+    assert tiers["openrouter"]["errors"] == 2
+    assert tiers["secondary"]["timeouts"] == 2
+    assert tiers["tertiary"]["errors"] == 2
+    assert tiers["phrase_table"] == {
+        "attempts": 2,
+        "hits": 1,
+        "misses": 1,
+        "errors": 0,
+        "timeouts": 0,
+        "rejected": 0,
+        "hit_rate": 0.5,
+        "average_latency_ms": tiers["phrase_table"]["average_latency_ms"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_translation_memory_tier_serves_close_matches(tmp_path: Path):
+    memory = TranslationMemory(direct_threshold=0.99)
+    memory.add("outgoing", "See you tomorrow at the station", "Bis morgen am Bahnhof")
+    secondary = RemoteBackend("secondary")
+    chain = BackendChain(
+        [BackendTier(secondary), BackendTier(TranslationMemoryBackend(memory, min_similarity=0.6))]
+    )
+    translator = _translator(tmp_path, chain)
+
+    outcome = await translator.translate(
+        TranslateRequest(text="See you tomorrow at the station!", direction="outgoing"), request_id="c"
+    )
+
+    assert outcome.success and outcome.backend == "translation_memory" and outcome.degraded
+    assert outcome.translated_text == "Bis morgen am Bahnhof"
+    assert secondary.calls == [{}]
+
+
+@pytest.mark.asyncio
+async def test_translation_memory_tier_misses_on_changed_numbers_or_negation(tmp_path: Path):
+    memory = TranslationMemory()
+    memory.add(
+        "outgoing",
+        "I will transfer you 500 euros tomorrow morning, please confirm the account",
+        "Ich überweise dir morgen früh 500 Euro, bitte bestätige das Konto",
+    )
+    backend = TranslationMemoryBackend(memory)
+
+    for text in (
+        "I will transfer you 5000 euros tomorrow morning, please confirm the account",
+        "I will not transfer you 500 euros tomorrow morning, please confirm the account",
+    ):
+        assert memory.lookup("outgoing", text)[0].similarity >= 0.9
+        outcome = await _translator(tmp_path, BackendChain([BackendTier(backend)])).translate(
+            TranslateRequest(text=text, direction="outgoing"), request_id="guard"
+        )
+        assert outcome.used_fallback and outcome.translated_text == text
+
+
+@pytest.mark.asyncio
+async def test_chain_results_go_through_the_response_validator(tmp_path: Path):
+    text = "Kannst du mir bitte morgen die Unterlagen schicken?"
+    echoing = RemoteBackend("secondary", result=text)
+    table = tmp_path / "phrases.json"
+    table.write_text(json.dumps({"incoming": {text: "Can you please send me the documents tomorrow?"}}))
+    chain = BackendChain([BackendTier(echoing), BackendTier(PhraseTableBackend(table))])
+    validator = ResponseValidator()
+
+    outcome = await _translator(tmp_path, chain, response_validator=validator).translate(
+        TranslateRequest(text=text, direction="incoming"), request_id="validated"
+    )
+
+    assert outcome.backend == "phrase_table" and not outcome.degraded
+    assert outcome.translated_text == "Can you please send me the documents tomorrow?"
+    assert chain.snapshot()["tiers"]["secondary"]["rejected"] == 1
+    assert validator.snapshot()["rejected"]["echo"] == 1
+
+
+def test_app_builds_chain_from_config_and_reports_it(tmp_path: Path, settings: Settings):
+    table = tmp_path / "phrases.json"
+    table.write_text(json.dumps({"outgoing": {"thanks": "danke"}}), encoding="utf-8")
+    settings.backends_config = {
+        "chain": [
+            {"type": "openrouter", "name": "secondary", "model": ""},
+            {"type": "translation_memory"},
+            {"type": "phrase_table", "file": str(table), "timeout_seconds": 1},
+        ]
+    }
+    settings.translation_memory_enabled = False
+    app = create_app(settings=settings, logger=logging.getLogger("test"), openrouter_client=FailingPrimary())
+
+    with TestClient(app) as client:
+        response = client.post("/translate", json={"text": "Thanks", "direction": "outgoing"})
+        stats = client.get("/stats").json()
+
+    assert response.json()["translated_text"] == "danke"
+    assert not response.json()["translation_failed"]
+    assert set(stats["backends"]["tiers"]) == {"openrouter", "phrase_table"}
+    assert stats["backends"]["tiers"]["phrase_table"]["hits"] == 1
+    assert stats["backends"]["health"]["phrase_table"] == {"ok": True, "phrases": 1}
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+from app.models import ContextMessage, TranslateRequest
+from app.summaries import ConversationSummarizer
+from app.translator import Translator
+from app.usage import UsageTracker
+
+
+class SummarizingClient:
+    model = "test/model"
+
+    def __init__(self):
+        self.translation_prompts = []
+        self.summary_models = []
+        self.summary_options = []
+
+    async def translate(self, *, messages, request_id, model=None, **options):
+        if messages[0]["content"].startswith("You maintain a running summary"):
+            self.summary_models.append(model)
+            self.summary_options.append(options)
+            return "Anna and Ben are planning dinner on Friday."
+        self.translation_prompts.append(messages)
+        return "translated"
+
+
+class RecordingScheduler:
+    def __init__(self):
+        self.classes = []
+
+    @asynccontextmanager
+    async def slot(self, chat_id, *, cost=1.0, system_class=None):
+        self.classes.append(system_class or chat_id)
+        yield
+
+
+def _context(start: int, end: int) -> list[ContextMessage]:
+    return [ContextMessage(role="me" if i % 2 else "them", text=f"line {i}") for i in range(start, end)]
+
+
+@pytest.mark.asyncio
+async def test_long_context_is_replaced_by_background_summary(tmp_path: Path):
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    client = SummarizingClient()
+    tracker = UsageTracker()
+    scheduler = RecordingScheduler()
+    summarizer = ConversationSummarizer(
+        client=client,
+        logger=__import__("logging").getLogger("test"),
+        model="cheap/model",
+        every_n_turns=5,
+        keep_raw_turns=3,
+        min_context_turns=10,
+        usage_tracker=tracker,
+        scheduler=scheduler,
+    )
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=prompt_file,
+        logger=__import__("logging").getLogger("test"),
+        usage_tracker=tracker,
+        summarizer=summarizer,
+    )
+
+    await translator.translate(
+        TranslateRequest(text="Hallo", direction="incoming", chat_id="c1", context=_context(0, 20)),
+        request_id="raw",
+    )
+    assert "- them: line 0" in client.translation_prompts[0][-1]["content"]
+    await asyncio.gather(*list(summarizer._tasks.values()))
+    assert client.summary_models == ["cheap/model"]
+    assert client.summary_options == [{"observe_latency": False}]
+    assert scheduler.classes == ["summaries"]
+
+    await translator.translate(
+        TranslateRequest(text="Und dann?", direction="incoming", chat_id="c1", context=_context(2, 22)),
+        request_id="summarized",
+    )
+    prefix, tail = client.translation_prompts[1][1]["content"], client.translation_prompts[1][-1]["content"]
+    assert "Summary of earlier messages: Anna and Ben are planning dinner on Friday." in prefix
+    assert "line" not in prefix and "line 16" not in tail
+    assert "- them: line 18" in tail
+    assert "- me: line 21" in tail
+
+    snapshot = tracker.snapshot()
+    assert set(snapshot["by_context"]) == {"raw", "summary"}
+    assert snapshot["by_direction"]["summary"]["attempts"] == 1
+    assert summarizer.snapshot()["summarized_requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_short_or_anonymous_contexts_stay_raw():
+    summarizer = ConversationSummarizer(client=SummarizingClient(), logger=None, min_context_turns=10)
+
+    short = summarizer.plan(TranslateRequest(text="x", direction="incoming", chat_id="c", context=_context(0, 5)))
+    anonymous = summarizer.plan(TranslateRequest(text="x", direction="incoming", context=_context(0, 50)))
+
+    assert short.mode == anonymous.mode == "raw"
+    assert len(anonymous.context) == 50
+    assert not summarizer._tasks
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.drafts import DraftCoordinator
+from app.main import create_app
+from app.models import TranslateRequest, TranslateResponse
+
+
+class SlowUpstream:
+    model = "test/model"
+
+    def __init__(self):
+        self.started = []
+        self.cancelled = []
+
+    async def translate(self, *, messages, request_id):
+        text = messages[-1]["content"].rsplit("\n", 1)[-1]
+        self.started.append(text)
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        return f"EN:{text}"
+
+    async def close(self):
+        return None
+
+
+def _draft(text: str) -> TranslateRequest:
+    return TranslateRequest(text=text, direction="outgoing", chat_id="c1", draft_id="d1")
+
+
+@pytest.mark.asyncio
+async def test_newer_draft_supersedes_older_and_history_is_reused():
+    calls = []
+
+    async def translate(request: TranslateRequest) -> TranslateResponse:
+        calls.append(request.text)
+        await asyncio.sleep(0.1)
+        return TranslateResponse(
+            translated_text=f"EN:{request.text}",
+            original_text=request.text,
+            direction=request.direction,
+            translation_failed=False,
+        )
+
+    drafts = DraftCoordinator(debounce_seconds=0.05)
+    first = asyncio.create_task(drafts.run(_draft("Hal"), translate))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(drafts.run(_draft("Hallo"), translate))
+
+    assert (await first).superseded is True
+    assert (await second).translated_text == "EN:Hallo"
+    assert calls == ["Hallo"]
+
+    third = asyncio.create_task(drafts.run(_draft("Hallo Welt"), translate))
+    await asyncio.sleep(0.08)
+    reused = await drafts.run(_draft("Hallo "), translate)
+    assert reused.translated_text == "EN:Hallo"
+    assert reused.original_text == "Hallo "
+    assert (await third).superseded is True
+
+    snapshot = drafts.snapshot()
+    assert snapshot["superseded_before_upstream"] == 1
+    assert snapshot["superseded_inflight"] == 1
+    assert snapshot["reused"] == 1
+    assert snapshot["upstream_calls_avoided"] == 2
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None, "translation_memory_enabled": False, "drafts_debounce_ms": 50}
+
+
+@pytest.mark.asyncio
+async def test_superseded_draft_cancels_inflight_upstream_call(settings: Settings):
+    upstream = SlowUpstream()
+    app = create_app(settings=settings, openrouter_client=upstream)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        body = {"direction": "outgoing", "chat_id": "c1", "draft_id": "d1"}
+        older = asyncio.create_task(client.post("/translate", json={**body, "text": "Wie geht"}))
+        await asyncio.sleep(0.12)
+        newer = await client.post("/translate", json={**body, "text": "Wie geht es dir?"})
+        older_body = (await older).json()
+        stats = (await client.get("/stats")).json()
+
+    assert older_body["superseded"] is True
+    assert older_body["translated_text"] == "Wie geht"
+    assert newer.json()["translated_text"] == "EN:Wie geht es dir?"
+    assert upstream.cancelled == ["Wie geht"]
+    assert stats["drafts"]["superseded_inflight"] == 1
+    assert stats["cancelled_requests"] == 1
+
+
+def test_drafts_are_outgoing_only(settings: Settings):
+    with TestClient(create_app(settings=settings, openrouter_client=SlowUpstream())) as client:
+        response = client.post("/translate", json={"text": "x", "direction": "incoming", "draft_id": "d"})
+    assert response.status_code == 422
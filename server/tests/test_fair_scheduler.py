@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.fair_scheduler import FairScheduler
+from app.models import TranslateRequest
+from app.translator import Translator
+from app.usage import hash_chat_id
+
+
+async def _run(scheduler: FairScheduler, chat_id: str | None, order: list, hold: asyncio.Event | None = None):
+    async with scheduler.slot(chat_id):
+        order.append(chat_id)
+        if hold is not None:
+            await hold.wait()
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_burst_from_one_chat_does_not_starve_another():
+    scheduler = FairScheduler(max_concurrency=1, per_chat_inflight=1, quantum=1.0)
+    order: list = []
+    gate = asyncio.Event()
+    blocker = asyncio.create_task(_run(scheduler, "busy", order, gate))
+    await asyncio.sleep(0)
+
+    burst = [asyncio.create_task(_run(scheduler, "busy", order)) for _ in range(8)]
+    await asyncio.sleep(0)
+    quiet = asyncio.create_task(_run(scheduler, "quiet", order))
+    anonymous = asyncio.create_task(_run(scheduler, None, order))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(blocker, *burst, quiet, anonymous)
+
+    assert order.index("quiet") <= 3
+    assert order.index(None) <= 4
+    snapshot = scheduler.snapshot()
+    assert snapshot["inflight"] == 0 and snapshot["queued"] == 0
+    assert snapshot["top_chats"][hash_chat_id("busy")]["granted"] == 9
+    assert "anonymous" in snapshot["top_chats"]
+    assert snapshot["top_chats"][hash_chat_id("quiet")]["wait_p99_ms"] >= 0.0
+
+
+@pytest.mark.asyncio
+async def test_single_chat_uses_all_capacity_when_alone():
+    scheduler = FairScheduler(max_concurrency=4, per_chat_inflight=1)
+    order: list = []
+    gate = asyncio.Event()
+    tasks = [asyncio.create_task(_run(scheduler, "solo", order, gate)) for _ in range(6)]
+    await asyncio.sleep(0)
+    assert scheduler.snapshot()["inflight"] == 4
+    assert scheduler.snapshot()["queued"] == 2
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert order == ["solo"] * 6
+    assert scheduler.snapshot()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_per_chat_cap_applies_under_contention_and_cancelled_waiters():
+    scheduler = FairScheduler(max_concurrency=4, per_chat_inflight=2)
+    order: list = []
+    first, gate = asyncio.Event(), asyncio.Event()
+    tasks = [asyncio.create_task(_run(scheduler, "group", order, first if i == 0 else gate)) for i in range(7)]
+    await asyncio.sleep(0)
+    assert scheduler.snapshot()["inflight"] == 4
+    assert scheduler.snapshot()["queued"] == 3
+
+    tasks[-1].cancel()
+    await asyncio.sleep(0)
+    assert scheduler.snapshot()["queued"] == 2
+
+    other = asyncio.create_task(_run(scheduler, "dm", order, gate))
+    await asyncio.sleep(0)
+    first.set()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert order[-1] == "dm"
+    assert scheduler.snapshot()["inflight"] == 4
+    assert scheduler.snapshot()["queued"] == 2
+
+    gate.set()
+    await asyncio.gather(*tasks[:-1], other)
+    assert scheduler.snapshot()["inflight"] == 0
+    assert order.count("group") == 6
+
+
+@pytest.mark.asyncio
+async def test_reserved_classes_do_not_collide_with_chat_ids():
+    scheduler = FairScheduler(max_concurrency=2, per_chat_inflight=1)
+    order: list = []
+    await _run(scheduler, "anonymous", order)
+    await _run(scheduler, None, order)
+    async with scheduler.slot(None, system_class="summaries"):
+        pass
+
+    chats = scheduler.snapshot()["top_chats"]
+    assert set(chats) == {hash_chat_id("anonymous"), "anonymous", "summaries"}
+    assert all(chats[label]["granted"] == 1 for label in chats)
+
+
+@pytest.mark.asyncio
+async def test_anonymous_requests_are_not_capped_per_chat():
+    scheduler = FairScheduler(max_concurrency=4, per_chat_inflight=1)
+    order: list = []
+    gate = asyncio.Event()
+    tasks = [asyncio.create_task(_run(scheduler, None, order, gate)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert scheduler.snapshot()["inflight"] == 4
+    assert scheduler.snapshot()["queued"] == 1
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert order == [None] * 5
+
+
+@pytest.mark.asyncio
+async def test_translator_attempts_go_through_the_scheduler(tmp_path: Path):
+    class Client:
+        model = "test/model"
+
+        async def translate(self, *, messages, request_id):
+            return "translated"
+
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    scheduler = FairScheduler()
+    translator = Translator(
+        openrouter_client=Client(),
+        system_prompt_file=prompt_file,
+        logger=__import__("logging").getLogger("test"),
+        scheduler=scheduler,
+    )
+
+    await translator.translate(TranslateRequest(text="Hallo", direction="incoming", chat_id="c"), request_id="r")
+
+    assert scheduler.snapshot()["top_chats"][hash_chat_id("c")]["granted"] == 1
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.adaptive_timeout import AdaptiveTimeouts
+from app.backends import BackendChain, BackendTier, PhraseTableBackend
+from app.config import Settings
+from app.health_probe import UPSTREAM_DEGRADED, UPSTREAM_DOWN, UPSTREAM_UP, UpstreamProber
+from app.main import create_app
+from app.models import TranslateRequest
+from app.openrouter_client import OpenRouterClient
+from app.translator import Translator
+
+
+class StubUpstream:
+    def __init__(self):
+        self.status_code = 200
+        self.payloads = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.payloads.append(json.loads(request.content))
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={"error": {"message": "unavailable"}})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Hello"}}]})
+
+
+def _client(settings: Settings, stub: StubUpstream, timeouts: AdaptiveTimeouts | None = None) -> OpenRouterClient:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(stub))
+    return OpenRouterClient(settings, logging.getLogger("test"), http_client=http_client, timeouts=timeouts)
+
+
+@pytest.mark.asyncio
+async def test_probes_track_state_skip_timeouts_and_respect_the_hourly_cap(settings: Settings):
+    stub = StubUpstream()
+    timeouts = AdaptiveTimeouts(min_samples=1)
+    prober = UpstreamProber(
+        client=_client(settings, stub, timeouts),
+        logger=logging.getLogger("test"),
+        failure_threshold=2,
+        max_probes_per_hour=4,
+    )
+
+    assert await prober.probe_once() is True
+    assert prober.state == UPSTREAM_UP
+    assert stub.payloads[0]["max_tokens"] == 16
+    assert timeouts.snapshot()["buckets"] == {}
+
+    stub.status_code = 503
+    assert await prober.probe_once() is False
+    assert prober.state == UPSTREAM_DEGRADED
+    await prober.probe_once()
+    assert prober.state == UPSTREAM_DOWN and prober.upstream_down
+
+    stub.status_code = 200
+    assert await prober.probe_once() is True
+    assert prober.state == UPSTREAM_UP
+    assert await prober.probe_once() is None
+    snapshot = prober.snapshot()
+    assert snapshot["probes"] == 4 and snapshot["failures"] == 2 and snapshot["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_translator_goes_to_fallback_backends_while_upstream_is_down(tmp_path: Path, settings: Settings):
+    stub = StubUpstream()
+    stub.status_code = 503
+    client = _client(settings, stub)
+    prober = UpstreamProber(client=client, logger=logging.getLogger("test"), failure_threshold=1)
+    await prober.probe_once()
+    table = tmp_path / "phrases.json"
+    table.write_text(json.dumps({"incoming": {"hallo": "hello"}}), encoding="utf-8")
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=tmp_path / "system_prompt.txt",
+        logger=logging.getLogger("test"),
+        backend_chain=BackendChain([BackendTier(PhraseTableBackend(table))]),
+        upstream_health=prober,
+    )
+    probes = len(stub.payloads)
+
+    outcome = await translator.translate(TranslateRequest(text="Hallo", direction="incoming"), request_id="a")
+
+    assert outcome.success and outcome.backend == "phrase_table"
+    assert len(stub.payloads) == probes
+
+
+def test_health_reports_upstream_probe_from_lifespan(settings: Settings):
+    stub = StubUpstream()
+    client = _client(settings, stub)
+    prober = UpstreamProber(client=client, logger=logging.getLogger("test"), interval_seconds=0.01)
+    app = create_app(
+        settings=settings,
+        logger=logging.getLogger("test"),
+        openrouter_client=client,
+        health_prober=prober,
+    )
+
+    with TestClient(app) as test_client:
+        for _ in range(100):
+            upstream = test_client.get("/health").json()["upstream"]
+            if upstream["probes"] >= 2:
+                break
+            time.sleep(0.01)
+
+    assert upstream["state"] == UPSTREAM_UP
+    assert upstream["reachable"] is True
+    assert upstream["last_latency_ms"] is not None
+    assert prober._task is None
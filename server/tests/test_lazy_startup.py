@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.config import Settings
+from app.openrouter_client import OpenRouterClient
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_importing_main_does_not_build_the_app(tmp_path: Path):
+    code = (
+        "import logging, app.main as main\n"
+        "assert 'app' not in vars(main)\n"
+        "assert not logging.getLogger('ai_translation_proxy').handlers\n"
+        "built = main.app\n"
+        "assert main.app is built and built.state.openrouter_client._http_client is None\n"
+        "print('ok')\n"
+    )
+    env = {**os.environ, "SERVER_LOG_FILE": str(tmp_path / "server.log"), "USAGE_ROLLUP_FILE": ""}
+    result = subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
+    assert not (tmp_path / "server.log").exists()
+
+
+@pytest.mark.asyncio
+async def test_client_creates_one_http_client_on_start(settings: Settings):
+    client = OpenRouterClient(settings, logging.getLogger("test"))
+    assert client._http_client is None
+
+    await asyncio.gather(client.start(), client.start(), client.start())
+    http_client = client._http_client
+    await client.start()
+
+    assert http_client is not None and client._http_client is http_client
+    await client.close()
+    assert client._http_client is None
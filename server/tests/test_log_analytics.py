@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.translator import TranslationOutcome
+
+TOOL = Path(__file__).resolve().parents[2] / "tools" / "analyze_logs.py"
+
+
+class LoggingTranslator:
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    async def translate(self, request_body: TranslateRequest, request_id: str):
+        failed = request_body.text == "fail"
+        if failed:
+            self._logger.warning("request_id=%s outcome=retry_timeout attempt=1 retry=1", request_id)
+            self._logger.warning("request_id=%s outcome=fallback reason=timeout direction=incoming attempts=2", request_id)
+        else:
+            self._logger.info("request_id=%s outcome=success direction=incoming attempts=1", request_id)
+        return TranslationOutcome(
+            translated_text=request_body.text,
+            original_text=request_body.text,
+            direction=request_body.direction,
+            translation_failed=failed,
+            used_fallback=failed,
+            success=not failed,
+            failure_reason="timeout" if failed else None,
+            attempts=2 if failed else 1,
+        )
+
+
+class DummyOpenRouterClient:
+    async def close(self):
+        return None
+
+
+def _logger(log_file: Path) -> logging.Logger:
+    logger = logging.getLogger(f"test_log_analytics.{log_file.parent.name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.FileHandler(log_file, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s", "%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    return logger
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None}
+
+
+def test_access_and_outcome_lines_join_into_bucket_stats(tmp_path: Path, settings: Settings):
+    log_file = tmp_path / "server.log"
+    legacy = tmp_path / "server.log.2"
+    legacy.write_text(
+        "2019-12-31 10:00:01 INFO [x] http method=POST path=/translate status=200 duration_ms=12.50\n"
+        "2019-12-31 10:00:02 INFO [x] http method=POST path=/translate status=502 duration_ms=80.00\n"
+        "2019-12-31 10:00:03 INFO [x] http method=GET path=/health status=200 duration_ms=0.43\n"
+        "2019-12-31 10:00:03 WARNING [x] request_id=abc outcome=fallback reason=timeout direction=incoming attempts=3\n",
+        encoding="utf-8",
+    )
+    rotated = tmp_path / "server.log.1"
+    rotated.write_text(
+        "2020-01-01 00:00:05 INFO [x] request_id=old1 outcome=success direction=incoming attempts=1\n"
+        "2020-01-01 00:00:05 INFO [x] http request_id=old1 method=POST path=/translate status=200 duration_ms=40.00\n",
+        encoding="utf-8",
+    )
+    logger = _logger(log_file)
+    app = create_app(
+        settings=settings,
+        logger=logger,
+        openrouter_client=DummyOpenRouterClient(),
+        translator=LoggingTranslator(logger),
+    )
+
+    with TestClient(app) as client:
+        ok = client.post("/translate", json={"text": "hallo", "direction": "incoming"})
+        client.post("/translate", json={"text": "fail", "direction": "incoming"})
+        client.get("/health")
+    for handler in logger.handlers:
+        handler.close()
+
+    result = subprocess.run(
+        [sys.executable, str(TOOL), str(log_file), str(rotated), str(legacy), "--bucket", "1d", "--json"],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert len(ok.headers["X-Request-ID"]) == 12
+    assert f"request_id={ok.headers['X-Request-ID']} outcome=success" in log_file.read_text(encoding="utf-8")
+    legacy_bucket, old, current = json.loads(result.stdout)["buckets"]
+    assert legacy_bucket["requests"] == 2 and legacy_bucket["statuses"] == {"2xx": 1, "5xx": 1}
+    assert legacy_bucket["max_ms"] == 80.0 and legacy_bucket["joined"] == 0
+    assert legacy_bucket["outcomes"] == {"fallback": 1}
+    assert old["bucket_start"] == "2020-01-01 00:00:00" and old["requests"] == 1 and old["p50_ms"] == 40.0
+    assert current["requests"] == 2 and current["joined"] == 2
+    assert current["outcomes"] == {"success": 1, "fallback": 1}
+    assert current["retries"] == {"0": 1, "1": 1}
+    assert current["fallback_reasons"] == {"timeout": 1}
+    assert current["attempts"] == {"1": 1, "2": 1}
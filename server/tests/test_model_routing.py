@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.error_policy import OpenRouterHTTPError
+from app.model_router import ModelRouter, dominant_script
+from app.models import ContextMessage, TranslateRequest
+from app.openrouter_client import OpenRouterClient
+from app.translator import Translator
+
+ROUTING = {
+    "tiers": [
+        {"name": "short", "model": "small/model", "max_chars": 40, "max_context_turns": 10, "scripts": ["latin"]},
+        {"name": "long", "model": "big/model", "disable_reasoning": False},
+    ],
+    "max_tokens": {"factor": 2.0, "min": 16, "max": 200},
+}
+
+
+class KwargsClient:
+    model = "default/model"
+
+    def __init__(self, fail_for: str | None = None):
+        self.calls = []
+        self.fail_for = fail_for
+
+    async def translate(self, *, messages, request_id, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs.get("model") == self.fail_for:
+            raise OpenRouterHTTPError(status_code=400, message="bad request")
+        return "translated"
+
+
+def test_router_classifies_by_length_script_and_context():
+    router = ModelRouter.from_config(ROUTING, default_model="default/model")
+
+    def tier(text: str, context: int = 0) -> str:
+        context_items = [ContextMessage(role="me", text="x")] * context
+        return router.route(TranslateRequest(text=text, direction="incoming", context=context_items)).tier
+
+    assert dominant_script("Привет, как дела?") == "cyrillic"
+    assert tier("ok") == "short"
+    assert tier("👍") == "short"
+    assert tier("Привет") == "long"
+    assert tier("ok", context=20) == "long"
+    assert tier("Das ist eine deutlich längere Nachricht mit mehreren Sätzen.") == "long"
+    assert router.max_tokens_for("ok") == 16 + 2
+    assert router.max_tokens_for("x" * 1000) == 200
+    assert ModelRouter.from_config({"enabled": False}, default_model="m") is None
+
+
+@pytest.mark.asyncio
+async def test_translator_sends_routed_model_and_records_tier_stats(tmp_path: Path):
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    client = KwargsClient(fail_for="big/model")
+    router = ModelRouter.from_config(ROUTING, default_model="default/model")
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=prompt_file,
+        logger=logging.getLogger("test"),
+        router=router,
+    )
+
+    short = await translator.translate(TranslateRequest(text="ok", direction="incoming"), request_id="s")
+    long = await translator.translate(TranslateRequest(text="x" * 100, direction="incoming"), request_id="l")
+
+    assert short.success and not long.success
+    assert client.calls[0] == {"model": "small/model", "max_tokens": 18}
+    assert client.calls[1] == {"model": "big/model", "max_tokens": 83, "disable_reasoning": False}
+    tiers = router.snapshot()["tiers"]
+    assert tiers["short"]["successes"] == 1
+    assert tiers["long"]["fallbacks"] == 1
+    assert tiers["long"]["fallback_rate"] == 1.0
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_model": "default/model"}
+
+
+@pytest.mark.asyncio
+async def test_client_applies_model_max_tokens_and_reasoning_overrides(settings: Settings):
+    payloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = OpenRouterClient(settings, logging.getLogger("test"), http_client=http_client)
+    messages = [{"role": "user", "content": "hi"}]
+
+    await client.translate(messages=messages, request_id="a")
+    await client.translate(messages=messages, request_id="b", model="big/model", max_tokens=99, disable_reasoning=False)
+    await http_client.aclose()
+
+    assert payloads[0]["model"] == "default/model"
+    assert "max_tokens" not in payloads[0]
+    assert payloads[0]["reasoning"] == {"enabled": False}
+    assert payloads[1]["model"] == "big/model"
+    assert payloads[1]["max_tokens"] == 99
+    assert "reasoning" not in payloads[1]
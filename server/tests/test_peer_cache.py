@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.config import Settings, load_settings
+from app.main import create_app
+from app.peer_cache import HashRing, PeerCache
+from app.result_cache import ResultCache, cache_key
+
+NODES = ["http://node-a", "http://node-b", "http://node-c"]
+
+
+class SlowUpstream:
+    model = "test/model"
+
+    def __init__(self, calls: list[str], delay: float = 0.05):
+        self.calls = calls
+        self.delay = delay
+
+    async def translate(self, *, messages, request_id):
+        self.calls.append(request_id)
+        await asyncio.sleep(self.delay)
+        return "translated"
+
+    async def close(self):
+        return None
+
+
+class NodeRouter(httpx.AsyncBaseTransport):
+    """Routes peer requests to in-process apps by host; unknown hosts refuse connections."""
+
+    def __init__(self):
+        self.apps: dict[str, httpx.ASGITransport] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = self.apps.get(f"http://{request.url.host}")
+        if transport is None:
+            raise httpx.ConnectError("connection refused", request=request)
+        return await transport.handle_async_request(request)
+
+
+def _cluster(make_settings, calls: list[str], live: list[str] | None = None):
+    router = NodeRouter()
+    peer_client = httpx.AsyncClient(transport=router)
+    apps = {}
+    for node in live or NODES:
+        app = create_app(
+            settings=make_settings(
+                peers_enabled=True,
+                peers_self_url=node,
+                peers_nodes=[peer for peer in NODES if peer != node],
+                peers_token="secret",
+                summaries_enabled=False,
+                translation_memory_enabled=False,
+            ),
+            logger=logging.getLogger("test"),
+            openrouter_client=SlowUpstream(calls),
+            peer_http_client=peer_client,
+        )
+        apps[node] = app
+        router.apps[node] = httpx.ASGITransport(app=app)
+    return apps, router, peer_client
+
+
+def test_ring_spreads_keys_and_is_stable_when_a_node_joins():
+    ring = HashRing(NODES[:2])
+    grown = HashRing(NODES)
+    keys = [f"key-{index}" for index in range(600)]
+
+    owners = [ring.owner(key) for key in keys]
+    moved = [key for key, owner in zip(keys, owners) if grown.owner(key) != owner]
+
+    assert {owner: owners.count(owner) for owner in NODES[:2]}[NODES[0]] > 150
+    assert all(grown.owner(key) == NODES[2] for key in moved)
+    assert 100 < len(moved) < 350
+
+
+@pytest.mark.asyncio
+async def test_abandoned_leases_are_pruned_once_expired():
+    now = [0.0]
+    cache = PeerCache(
+        self_url=NODES[0],
+        peers=[],
+        result_cache=ResultCache(),
+        lease_seconds=30.0,
+        clock=lambda: now[0],
+    )
+    for index in range(5):
+        assert cache.claim(f"key-{index}", "")[0] == "miss"
+    now[0] = 10.0
+    assert cache.claim("late", "")[0] == "miss"
+    assert cache.snapshot()["pending_fills"] == 6
+
+    now[0] = 31.0
+    assert cache.snapshot()["pending_fills"] == 1
+    assert cache.claim("key-0", "")[0] == "miss"
+    assert cache.claim("key-0", "")[0] == "pending"
+    now[0] = 45.0
+    assert cache.snapshot()["pending_fills"] == 1
+
+
+@pytest.mark.asyncio
+async def test_nodes_coalesce_concurrent_fills_and_share_results(make_settings):
+    calls: list[str] = []
+    apps, router, peer_client = _cluster(make_settings, calls)
+    body = {"text": "Hallo zusammen", "direction": "incoming", "chat_id": "group"}
+
+    async def post(node: str, payload: dict) -> dict:
+        async with httpx.AsyncClient(transport=router.apps[node], base_url=node) as client:
+            return (await client.post("/translate", json=payload)).json()
+
+    first = await asyncio.gather(*(post(node, body) for node in NODES))
+    again = await asyncio.gather(*(post(node, body) for node in NODES))
+
+    assert [item["translated_text"] for item in first + again] == ["translated"] * 6
+    assert len(calls) == 1
+    key = cache_key("incoming", body["text"], apps[NODES[0]].state.translator.cache_variant())
+    owner = apps[NODES[0]].state.peer_cache.owner(key)
+    assert apps[owner].state.result_cache.peek(key) is not None
+    snapshots = [app.state.peer_cache.snapshot()["owners"][owner] for app in apps.values()]
+    assert sum(item["hits"] + item["coalesced"] for item in snapshots) == 2
+    assert all(item["latency_p95_ms"] >= 0 for item in snapshots)
+    await peer_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_owner_falls_back_to_upstream(make_settings):
+    calls: list[str] = []
+    apps, router, peer_client = _cluster(make_settings, calls, live=[NODES[0]])
+    peer_cache = apps[NODES[0]].state.peer_cache
+    variant = apps[NODES[0]].state.translator.cache_variant()
+    text = next(
+        f"Nachricht {index}"
+        for index in range(100)
+        if peer_cache.owner(cache_key("incoming", f"Nachricht {index}", variant)) != NODES[0]
+    )
+
+    async with httpx.AsyncClient(transport=router.apps[NODES[0]], base_url=NODES[0]) as client:
+        response = await client.post("/translate", json={"text": text, "direction": "incoming"})
+        stats = (await client.get("/stats")).json()
+
+    assert response.json()["translated_text"] == "translated"
+    assert len(calls) == 1
+    owner = peer_cache.owner(cache_key("incoming", text, variant))
+    assert stats["peers"]["owners"][owner]["errors"] == 1
+    await peer_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_peer_endpoints_require_the_shared_token(make_settings):
+    apps, router, peer_client = _cluster(make_settings, [], live=[NODES[0]])
+
+    async with httpx.AsyncClient(transport=router.apps[NODES[0]], base_url=NODES[0]) as client:
+        denied = await client.get("/internal/peer/cache/abc")
+        forged = await client.put("/internal/peer/cache/abc", json={"translated_text": "forged", "variant": ""})
+        allowed = await client.get("/internal/peer/cache/abc", headers={"X-Peer-Token": "secret"})
+
+    assert denied.status_code == forged.status_code == 403
+    assert allowed.json() == {"status": "miss", "translated_text": None}
+    await peer_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_peer_mode_needs_a_token(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("PEERS_ENABLED", "true")
+    monkeypatch.setenv("PEER_SELF_URL", NODES[0])
+    monkeypatch.delenv("PEER_TOKEN", raising=False)
+    settings = load_settings()
+    assert settings.peers_enabled and settings.peers_token == ""
+    app = create_app(settings=settings, logger=logging.getLogger("test"), openrouter_client=SlowUpstream([]))
+    assert app.state.peer_cache is None
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=NODES[0]) as client:
+        put = await client.put("/internal/peer/cache/abc", json={"translated_text": "forged", "variant": ""})
+        put_empty = await client.put(
+            "/internal/peer/cache/abc", json={"translated_text": "forged", "variant": ""}, headers={"X-Peer-Token": ""}
+        )
+    assert put.status_code == put_empty.status_code == 404
+
+    open_cache = PeerCache(self_url=NODES[0], peers=[], result_cache=None, token="")
+    assert not open_cache.authorized(None) and not open_cache.authorized("")
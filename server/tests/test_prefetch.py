@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.prefetch import Prefetcher
+from app.result_cache import ResultCache
+from app.translator import Translator
+
+
+class CountingClient:
+    model = "test/model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def translate(self, *, messages, request_id):
+        self.calls += 1
+        return f"translated:{messages[-1]['content'].rsplit(chr(10), 1)[-1]}"
+
+    async def close(self):
+        return None
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None, "translation_memory_enabled": False}
+
+
+@pytest.mark.asyncio
+async def test_queue_dedups_per_chat_and_waits_for_idle_capacity(settings: Settings):
+    client = CountingClient()
+    cache = ResultCache()
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=settings.system_prompt_file,
+        logger=__import__("logging").getLogger("test"),
+        result_cache=cache,
+    )
+    idle = {"value": False}
+    prefetcher = Prefetcher(
+        translator=translator,
+        result_cache=cache,
+        logger=__import__("logging").getLogger("test"),
+        is_idle=lambda: idle["value"],
+        max_queue_size=2,
+        idle_poll_seconds=0.01,
+    )
+
+    summary = prefetcher.submit(
+        [
+            TranslateRequest(text="Hallo", direction="incoming", chat_id="a"),
+            TranslateRequest(text="Hallo", direction="incoming", chat_id="a"),
+            TranslateRequest(text="Wie geht's?", direction="incoming", chat_id="a"),
+            TranslateRequest(text="Tschüss", direction="incoming", chat_id="b"),
+        ]
+    )
+    assert summary == {"accepted": 2, "deduplicated": 1, "dropped": 1}
+
+    prefetcher.start()
+    await asyncio.sleep(0.05)
+    assert client.calls == 0
+
+    idle["value"] = True
+    for _ in range(100):
+        if prefetcher.snapshot()["completed"] == 2:
+            break
+        await asyncio.sleep(0.01)
+    await prefetcher.stop()
+    assert client.calls == 2
+
+    outcome = await translator.translate(TranslateRequest(text="Hallo", direction="incoming"), request_id="later")
+    assert outcome.translated_text == "translated:Hallo"
+    assert client.calls == 2
+
+    snapshot = prefetcher.snapshot()
+    assert snapshot["hits"] == 1
+    assert snapshot["hit_ratio"] == pytest.approx(0.5)
+
+
+def test_wasted_prefetches_are_counted_on_eviction():
+    cache = ResultCache(max_entries=1)
+    cache.put("a", "A", origin="prefetch")
+    cache.put("b", "B", origin="prefetch")
+    assert cache.get("b").translated_text == "B"
+
+    snapshot = cache.snapshot()
+    assert snapshot["prefetch_wasted"] == 1
+    assert snapshot["prefetch_hits"] == 1
+
+
+def test_prefetch_endpoint_fills_cache_for_interactive_translate(settings: Settings):
+    client = CountingClient()
+    app = create_app(settings=settings, openrouter_client=client)
+
+    with TestClient(app) as http:
+        response = http.post(
+            "/prefetch",
+            json={"messages": [{"text": "Guten Abend", "direction": "incoming", "chat_id": "c1"}]},
+        )
+        assert response.status_code == 202
+        assert response.json()["accepted"] == 1
+
+        deadline = time.monotonic() + 5
+        while http.get("/stats").json()["prefetch"]["completed"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        translated = http.post("/translate", json={"text": "Guten Abend", "direction": "incoming", "chat_id": "c1"})
+        assert translated.json()["translated_text"] == "translated:Guten Abend"
+        assert client.calls == 1
+
+        stats = http.get("/stats").json()
+        assert stats["prefetch"]["hits"] == 1
+        assert stats["result_cache"]["hits"] == 1
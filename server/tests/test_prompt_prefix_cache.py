@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import logging
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.models import TranslateRequest
+from app.openrouter_client import OpenRouterClient
+from app.prompt_builder import build_messages
+from app.stats import StatsTracker
+from app.translator import Translator
+
+
+def test_prefix_is_byte_stable_and_only_tail_changes():
+    context = [{"role": "them", "text": "Kommst du heute?"}, {"role": "me", "text": "Yes, around eight."}]
+    first = build_messages("System", TranslateRequest(text="See you", direction="outgoing", context=context))
+    second = build_messages(
+        "System",
+        TranslateRequest(text="Bring snacks", direction="outgoing", context=context),
+        examples=[("Bring drinks", "Bring Getränke mit")],
+    )
+
+    assert first[:2] == second[:2]
+    assert "Kommst du heute?" in first[-1]["content"]
+    assert first[-1]["content"].endswith("CURRENT_TEXT:\nSee you")
+    assert "Bring Getränke mit" in second[-1]["content"]
+    assert "Bring snacks" not in second[1]["content"]
+
+
+def test_prefix_survives_a_sliding_context_window():
+    turns = [{"role": "them" if index % 2 else "me", "text": f"Nachricht {index}"} for index in range(12)]
+    first = build_messages(
+        "System", TranslateRequest(text="Eins", direction="incoming", context=turns[:10]), summary="Plans for Friday."
+    )
+    second = build_messages(
+        "System", TranslateRequest(text="Zwei", direction="incoming", context=turns[1:11]), summary="Plans for Friday."
+    )
+
+    assert json.dumps(first[:2]).encode() == json.dumps(second[:2]).encode()
+    assert "Plans for Friday." in first[1]["content"]
+    assert "Nachricht 0" in first[-1]["content"] and "Nachricht 0" not in second[-1]["content"]
+    assert second[-1]["content"].index("Nachricht 10") < second[-1]["content"].index("CURRENT_TEXT")
+
+
+@pytest.mark.asyncio
+async def test_usage_block_is_parsed_and_reported_in_stats(settings: Settings):
+    sent_payloads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent_payloads.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "model": "moonshotai/kimi-k2.5",
+                "choices": [{"message": {"content": "Bis später"}}],
+                "usage": {
+                    "prompt_tokens": 200,
+                    "completion_tokens": 5,
+                    "prompt_tokens_details": {"cached_tokens": 150},
+                },
+            },
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = OpenRouterClient(settings, logging.getLogger("test"), http_client=http_client)
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=settings.system_prompt_file,
+        logger=logging.getLogger("test"),
+    )
+    stats = StatsTracker()
+
+    handle = await stats.record_translate_request_start()
+    outcome = await translator.translate(TranslateRequest(text="See you later", direction="outgoing"), "usage")
+    await stats.record_translate_request_end(handle, success=True, used_fallback=False, usage=outcome.usage)
+    await http_client.aclose()
+
+    assert sent_payloads[0]["usage"] == {"include": True}
+    assert outcome.translated_text == "Bis später"
+    assert outcome.usage.prompt_tokens == 200
+    assert outcome.usage.cached_tokens == 150
+
+    snapshot = await stats.stats_snapshot()
+    assert snapshot["prompt_cache_hit_ratio"] == pytest.approx(0.75)
+    assert snapshot["prompt_tokens_per_request"] == 200
+    assert snapshot["completion_tokens_per_request"] == 5
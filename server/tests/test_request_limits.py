@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.translator import TranslationOutcome
+
+
+class RecordingTranslator:
+    def __init__(self):
+        self.requests: list[TranslateRequest] = []
+
+    async def translate(self, request_body: TranslateRequest, request_id: str):
+        self.requests.append(request_body)
+        return TranslationOutcome(
+            translated_text="ok",
+            original_text=request_body.text,
+            direction=request_body.direction,
+            translation_failed=False,
+            used_fallback=False,
+            success=True,
+            attempts=1,
+        )
+
+
+class DummyOpenRouterClient:
+    async def close(self):
+        return None
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {
+        "openrouter_api_key": None,
+        "limits_max_body_bytes": 8192,
+        "limits_max_text_bytes": 1000,
+        "limits_max_context_message_bytes": 600,
+        "limits_max_context_bytes": 2000,
+    }
+
+
+def _app(settings: Settings, translator: RecordingTranslator):
+    return create_app(settings=settings, openrouter_client=DummyOpenRouterClient(), translator=translator)
+
+
+def test_oversized_bodies_are_rejected_while_streaming(settings: Settings):
+    translator = RecordingTranslator()
+    payload = json.dumps({"text": "hallo", "direction": "incoming", "chat_id": "x" * 10_000}).encode()
+
+    def chunks():
+        for start in range(0, len(payload), 1024):
+            yield payload[start : start + 1024]
+
+    with TestClient(_app(settings, translator)) as client:
+        chunked = client.post("/translate", content=chunks(), headers={"Content-Type": "application/json"})
+        declared = client.post("/translate", content=payload, headers={"Content-Type": "application/json"})
+        bomb = client.post(
+            "/translate",
+            content=gzip.compress(payload),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+        text = client.post("/translate", json={"text": "ü" * 600, "direction": "incoming"})
+        limits = client.get("/stats").json()["limits"]
+
+    assert chunked.status_code == declared.status_code == bomb.status_code == 413
+    assert text.status_code == 413 and "1000 bytes" in text.json()["detail"]
+    assert translator.requests == []
+    assert limits["rejected_bodies"] == 3 and limits["rejected_texts"] == 1
+
+
+def test_context_is_trimmed_to_the_newest_messages(settings: Settings):
+    translator = RecordingTranslator()
+    context = [{"role": "them", "text": f"{index}" + "ä" * 500} for index in range(6)]
+
+    with TestClient(_app(settings, translator)) as client:
+        response = client.post("/translate", json={"text": "hallo", "direction": "incoming", "context": context})
+        ws_error = None
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_text(json.dumps({"id": "big", "text": "x" * 9000, "direction": "incoming"}))
+            ws_error = websocket.receive_json()
+        limits = client.get("/stats").json()["limits"]
+
+    assert response.status_code == 200
+    kept = translator.requests[0].context
+    assert [message.text[0] for message in kept] == ["3", "4", "5"]
+    assert all(len(message.text.encode("utf-8")) <= 600 for message in kept)
+    assert kept[0].text.startswith("3ää")
+    assert ws_error["code"] == "too_large"
+    assert limits["trimmed_requests"] == 1
+    assert limits["truncated_context_messages"] == 3 and limits["dropped_context_messages"] == 3
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.error_policy import OpenRouterInvalidResponseError
+from app.models import TranslateRequest
+from app.model_router import ModelRouter
+from app.openrouter_client import OpenRouterClient
+from app.response_validator import ECHO, ERROR_TEXT, TRUNCATED, WRONG_LANGUAGE, ResponseValidator, find_error_marker
+from app.translator import Translator
+from app.usage import UsageTracker
+
+
+class ScriptedClient:
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.call_count = 0
+
+    async def translate(self, *, messages, request_id):
+        self.call_count += 1
+        result = self._responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _translator(tmp_path: Path, client, validator: ResponseValidator, sleeps: list[float], **options) -> Translator:
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+
+    async def fake_sleep(delay: float):
+        sleeps.append(delay)
+
+    return Translator(
+        openrouter_client=client,
+        system_prompt_file=prompt_file,
+        logger=logging.getLogger("test"),
+        sleep_func=fake_sleep,
+        response_validator=validator,
+        **options,
+    )
+
+
+def test_validator_checks():
+    validator = ResponseValidator()
+    source = "Hast du heute Abend Zeit für ein Essen?"
+
+    assert find_error_marker("Error: upstream unavailable") == "error:"
+    assert find_error_marker("Your API key is invalid") == "api key"
+    assert find_error_marker("Do you have time tonight? " * 10_000) is None
+    assert validator.check(source, "hast du heute abend zeit fur ein essen", "incoming") == WRONG_LANGUAGE
+    assert validator.check(source, "Hast du heute Abend Zeit für ein Essen!", "incoming") == ECHO
+    assert validator.check(source, "Ich habe heute keine Zeit, aber morgen gern.", "incoming") == WRONG_LANGUAGE
+    assert validator.check(source, "Do you have time for dinner tonight?", "incoming") is None
+    assert validator.check("Danke", "Danke", "incoming") is None
+    assert validator.check("Are you coming tonight?", "Kommst du heute Abend?", "outgoing") is None
+    assert validator.snapshot()["rejected"] == {ERROR_TEXT: 0, TRUNCATED: 0, ECHO: 1, WRONG_LANGUAGE: 2}
+
+
+@pytest.mark.asyncio
+async def test_client_raises_invalid_response_for_error_text(settings: Settings):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Error: quota exceeded"}}]})
+
+    client = OpenRouterClient(
+        settings,
+        logging.getLogger("test"),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    with pytest.raises(OpenRouterInvalidResponseError) as excinfo:
+        await client.translate(messages=[{"role": "user", "content": "Hallo"}], request_id="a")
+
+    assert excinfo.value.check == ERROR_TEXT
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_truncated_completion_is_retried_with_a_larger_budget(tmp_path: Path, settings: Settings):
+    budgets = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        budgets.append(json.loads(request.content)["max_tokens"])
+        if len(budgets) == 1:
+            choice = {"message": {"content": "Do you have time for"}, "finish_reason": "length"}
+        else:
+            choice = {"message": {"content": "Do you have time for dinner tonight?"}, "finish_reason": "stop"}
+        return httpx.Response(200, json={"choices": [choice]})
+
+    client = OpenRouterClient(
+        settings,
+        logging.getLogger("test"),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    validator = ResponseValidator()
+    sleeps: list[float] = []
+    translator = _translator(tmp_path, client, validator, sleeps, router=ModelRouter([], default_model="test/model"))
+
+    outcome = await translator.translate(
+        TranslateRequest(text="Hast du heute Abend Zeit für ein Essen?", direction="incoming"), request_id="cut"
+    )
+    await client.close()
+
+    assert outcome.success and outcome.translated_text == "Do you have time for dinner tonight?"
+    assert outcome.attempts == 2 and budgets[1] == 2 * budgets[0]
+    assert validator.snapshot()["rejected"][TRUNCATED] == 1
+
+
+@pytest.mark.asyncio
+async def test_echo_is_retried_as_invalid_response_then_succeeds(tmp_path: Path):
+    source = "Hast du heute Abend Zeit für ein Essen?"
+    client = ScriptedClient(
+        [
+            source,
+            OpenRouterInvalidResponseError(check=ERROR_TEXT, detail="api key"),
+            "Do you have time for dinner tonight?",
+        ]
+    )
+    validator = ResponseValidator()
+    sleeps: list[float] = []
+    tracker = UsageTracker()
+
+    outcome = await _translator(tmp_path, client, validator, sleeps, usage_tracker=tracker).translate(
+        TranslateRequest(text=source, direction="incoming"), request_id="echo"
+    )
+
+    assert outcome.success and outcome.translated_text == "Do you have time for dinner tonight?"
+    assert outcome.attempts == 3 and sleeps == [0.5, 0.5]
+    assert validator.snapshot()["rejected"] == {ERROR_TEXT: 1, TRUNCATED: 0, ECHO: 1, WRONG_LANGUAGE: 0}
+    usage = tracker.snapshot()["total"]
+    assert usage["attempts"] == 3 and usage["successes"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "text, direction",
+    [
+        ("Are you free for dinner tonight?", "incoming"),
+        ("Hast du heute Abend Zeit für ein Essen?", "outgoing"),
+        ("https://example.com/docs/meeting-notes?id=42", "incoming"),
+        ("+49 170 1234567 🙂🙂", "outgoing"),
+    ],
+)
+async def test_text_that_needs_no_translation_passes_through(tmp_path: Path, text: str, direction: str):
+    client = ScriptedClient([text])
+    validator = ResponseValidator()
+
+    outcome = await _translator(tmp_path, client, validator, []).translate(
+        TranslateRequest(text=text, direction=direction), request_id="pass"
+    )
+
+    assert outcome.success and not outcome.translation_failed
+    assert outcome.translated_text == text and client.call_count == 1
+    assert validator.snapshot()["rejected"][ECHO] == 0
+
+
+@pytest.mark.asyncio
+async def test_wrong_language_falls_back_after_invalid_response_retries(tmp_path: Path):
+    client = ScriptedClient(["Ich habe heute keine Zeit, aber morgen gern."] * 3)
+    sleeps: list[float] = []
+
+    outcome = await _translator(tmp_path, client, ResponseValidator(), sleeps).translate(
+        TranslateRequest(text="Ich habe heute keine Zeit.", direction="incoming"), request_id="lang"
+    )
+
+    assert outcome.used_fallback and outcome.failure_reason == "invalid_response"
+    assert outcome.translated_text == "Ich habe heute keine Zeit."
+    assert client.call_count == 3
+
+
+def test_config_enables_rule_and_validator():
+    config = json.loads((Path(__file__).resolve().parents[2] / "config" / "proxy.config.json").read_text())
+
+    assert "invalid_response" in config["retry"]["rules"]
+    assert ResponseValidator.from_config(config["validation"]).enabled
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from app.error_policy import OpenRouterTimeoutError
+from app.models import TranslateRequest
+from app.retry_policy import RetryBudget, RetryPolicy, RetryRule, simulate
+from app.translator import Translator
+
+
+class TimeoutClient:
+    def __init__(self):
+        self.call_count = 0
+
+    async def translate(self, *, messages, request_id):
+        self.call_count += 1
+        raise OpenRouterTimeoutError("timeout")
+
+
+def test_jitter_and_total_delay_cap_are_applied():
+    rule = RetryRule(max_retries=10, backoff="exponential", base_delay=1.0, multiplier=2.0, max_delay=8.0, jitter="full")
+    rng = random.Random(3)
+    delays = [rule.delay_for(i, retry_after=None, rng=rng) for i in range(6)]
+    assert all(0.0 <= delay <= min(8.0, 2**i) for i, delay in enumerate(delays))
+    assert len(set(delays)) == len(delays)
+
+    policy = RetryPolicy({"timeout": RetryRule(max_retries=10, backoff="fixed", base_delay=2.0, max_total_delay=5.0)})
+    assert policy.next_delay("timeout", retries_so_far=0, total_delay=0.0) == 2.0
+    assert policy.next_delay("timeout", retries_so_far=2, total_delay=4.0) is None
+    assert policy.next_delay("unknown", retries_so_far=0, total_delay=0.0) is None
+
+
+def test_from_config_overrides_defaults_per_error_class():
+    policy = RetryPolicy.from_config(
+        {"rules": {"timeout": {"max_retries": 1, "jitter": "equal"}}, "budget": {"ratio": 0.5}}
+    )
+    assert policy.rules["timeout"].max_retries == 1
+    assert policy.rules["timeout"].jitter == "equal"
+    assert policy.rules["empty_response"].schedule == (1.0, 2.0, 4.0, 8.0, 16.0)
+    assert policy.budget is not None
+
+
+def test_budget_caps_retries_to_share_of_first_attempts():
+    now = {"t": 100.0}
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0.0, window_seconds=10, clock=lambda: now["t"])
+    for _ in range(4):
+        budget.record_first_attempt()
+
+    assert [budget.try_acquire() for _ in range(3)] == [True, True, False]
+    assert budget.snapshot()["exhausted"] == 1
+
+    now["t"] += 11
+    assert budget.try_acquire() is False
+    budget.record_first_attempt()
+    budget.record_first_attempt()
+    assert budget.try_acquire() is True
+
+
+@pytest.mark.asyncio
+async def test_translator_stops_retrying_when_budget_is_exhausted(tmp_path: Path):
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    client = TimeoutClient()
+    sleeps = []
+
+    async def fake_sleep(delay: float):
+        sleeps.append(delay)
+
+    policy = RetryPolicy(budget=RetryBudget(ratio=1.0, min_retries_per_second=0.0))
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=prompt_file,
+        logger=__import__("logging").getLogger("test"),
+        sleep_func=fake_sleep,
+        retry_policy=policy,
+    )
+
+    outcome = await translator.translate(TranslateRequest(text="Hello", direction="outgoing"), request_id="budget")
+
+    assert outcome.failure_reason == "timeout"
+    assert client.call_count == 2
+    assert sleeps == [1.0]
+
+
+def test_simulator_reports_expected_latency():
+    legacy = simulate(RetryPolicy(), ["empty_response"], attempt_latency_ms=800.0)
+    assert legacy.outcome == "fallback:empty_response"
+    assert legacy.attempts == 6
+    assert legacy.mean_latency_ms == pytest.approx(6 * 800 + 31_000)
+
+    recovered = simulate(
+        RetryPolicy(),
+        ["timeout", "rate_limit", "success"],
+        attempt_latency_ms={"timeout": 15_000.0, "default": 500.0},
+        retry_after=3.0,
+    )
+    assert recovered.outcome == "success"
+    assert recovered.mean_latency_ms == pytest.approx(15_000 + 1_000 + 500 + 3_000 + 500)
+
+    jittered = simulate(
+        RetryPolicy.from_config({"rules": {"timeout": {"jitter": "full"}}}),
+        ["timeout", "timeout", "success"],
+        attempt_latency_ms=100.0,
+        trials=500,
+    )
+    assert 300 < jittered.mean_latency_ms < 300 + 2_000
+    assert jittered.p95_latency_ms >= jittered.p50_latency_ms
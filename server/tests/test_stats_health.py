@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-from pathlib import Path
 
 from fastapi.testclient import TestClient
 import pytest
@@ -46,26 +45,14 @@ class DummyOpenRouterClient:
         return None
 
 
-def _settings(tmp_path: Path) -> Settings:
-    prompt_file = tmp_path / "system_prompt.txt"
-    prompt_file.write_text("Prompt", encoding="utf-8")
-    return Settings(
-        bind_host="0.0.0.0",
-        port=8080,
-        openrouter_api_key=None,
-        openrouter_model="moonshotai/kimi-k2.5",
-        openrouter_base_url="https://openrouter.ai/api/v1/chat/completions",
-        request_timeout_seconds=15,
-        log_level="INFO",
-        log_file=tmp_path / "server.log",
-        system_prompt_file=prompt_file,
-        disable_reasoning=True,
-    )
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None}
 
 
-def test_health_and_stats_endpoints_track_translate_requests(tmp_path: Path):
+def test_health_and_stats_endpoints_track_translate_requests(settings: Settings):
     app = create_app(
-        settings=_settings(tmp_path),
+        settings=settings,
         stats=StatsTracker(),
         openrouter_client=DummyOpenRouterClient(),
         translator=FakeTranslator(),
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.stats_window import WindowedStats
+from app.translator import TranslationOutcome
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ReasonTranslator:
+    async def translate(self, request_body: TranslateRequest, request_id: str):
+        failed = request_body.text.startswith("fail:")
+        return TranslationOutcome(
+            translated_text=request_body.text if failed else "ok",
+            original_text=request_body.text,
+            direction=request_body.direction,
+            translation_failed=failed,
+            used_fallback=failed,
+            success=not failed,
+            failure_reason=request_body.text.removeprefix("fail:") if failed else None,
+            attempts=3 if failed else 1,
+        )
+
+
+class DummyOpenRouterClient:
+    async def close(self):
+        return None
+
+
+def test_windows_forget_old_buckets_and_break_down_fallbacks():
+    clock = FakeClock()
+    windows = WindowedStats(clock=clock)
+    for _ in range(8):
+        windows.record(latency_ms=100.0, success=True, used_fallback=False)
+    clock.now += 240
+    windows.record(latency_ms=4000.0, success=False, used_fallback=True, failure_reason="timeout", attempts=3)
+    windows.record(latency_ms=900.0, success=False, used_fallback=True, failure_reason="http_500", attempts=1)
+    windows.record_cancelled()
+
+    recent = windows.snapshot("1m")
+    five = windows.snapshot("5m")
+
+    assert recent["requests"] == 2 and recent["success_rate"] == 0.0
+    assert recent["fallback_reasons"] == {"timeout": 1, "http_500": 1}
+    assert recent["fallback_attempts"] == {"1": 1, "3": 1}
+    assert recent["cancelled_requests"] == 1
+    assert 4000 <= recent["latency_p99_ms"] <= 5000
+    assert five["requests"] == 10 and five["success_rate"] == 0.8
+    assert 100 <= five["latency_p50_ms"] <= 125
+
+    clock.now += 900
+    assert windows.snapshot("15m")["requests"] == 0
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None}
+
+
+def test_stats_endpoint_filters_by_window(settings: Settings):
+    app = create_app(
+        settings=settings,
+        openrouter_client=DummyOpenRouterClient(),
+        translator=ReasonTranslator(),
+    )
+
+    with TestClient(app) as client:
+        client.post("/translate", json={"text": "hallo", "direction": "incoming"})
+        client.post("/translate", json={"text": "fail:timeout", "direction": "incoming"})
+        everything = client.get("/stats").json()
+        five = client.get("/stats", params={"window": "5m"}).json()
+        invalid = client.get("/stats", params={"window": "2h"})
+
+    assert set(everything["windows"]) == {"1m", "5m", "15m"}
+    assert set(five["windows"]) == {"5m"}
+    assert five["windows"]["5m"]["requests"] == 2
+    assert five["windows"]["5m"]["fallback_reasons"] == {"timeout": 1}
+    assert five["windows"]["5m"]["fallback_attempts"] == {"3": 1}
+    assert invalid.status_code == 400
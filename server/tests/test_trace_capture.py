@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.trace import TraceRecorder
+
+
+class EchoClient:
+    model = "test/model"
+
+    async def translate(self, *, messages, request_id):
+        if "FAIL" in messages[-1]["content"]:
+            raise RuntimeError("boom")
+        return "translated"
+
+    async def close(self):
+        return None
+
+
+@pytest.fixture
+def settings_overrides(tmp_path: Path) -> dict:
+    return {
+        "openrouter_api_key": None,
+        "translation_memory_enabled": False,
+        "trace_enabled": True,
+        "trace_file": tmp_path / "traces" / "trace.jsonl",
+    }
+
+
+def test_translate_requests_are_traced_without_message_text(settings: Settings):
+
+    with TestClient(create_app(settings=settings, openrouter_client=EchoClient())) as client:
+        client.post(
+            "/translate",
+            json={
+                "text": "Geheime Nachricht",
+                "direction": "incoming",
+                "chat_id": "chat-1",
+                "context": [{"role": "them", "text": "Hallo"}],
+            },
+        )
+        client.post("/translate", json={"text": "FAIL now", "direction": "outgoing"})
+        assert client.get("/stats").json()["trace"]["recorded"] == 2
+
+    raw = settings.trace_file.read_text(encoding="utf-8")
+    assert "Geheime" not in raw and "chat-1" not in raw
+    first, second = [json.loads(line) for line in raw.splitlines()]
+    assert first["direction"] == "incoming"
+    assert first["text_chars"] == len("Geheime Nachricht")
+    assert first["context_size"] == 1
+    assert first["outcome"] == "success"
+    assert first["chat"] != "none"
+    assert second["outcome"] == "fallback"
+    assert second["failure_reason"] == "unexpected_error"
+    assert second["ts"] >= first["ts"]
+    assert second["latency_ms"] >= 0
+
+
+def test_trace_file_rotates(tmp_path: Path):
+    path = tmp_path / "trace.jsonl"
+    recorder = TraceRecorder(path, max_bytes=400, backup_count=2)
+    for _ in range(20):
+        recorder.record(TranslateRequest(text="hi", direction="incoming"), outcome="success", latency_ms=10.0)
+    recorder.close()
+
+    assert path.exists()
+    assert (tmp_path / "trace.jsonl.1").exists()
+    assert not (tmp_path / "trace.jsonl.3").exists()
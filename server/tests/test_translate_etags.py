@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.translator import Translator
+
+
+class CountingClient:
+    def __init__(self, model: str = "test/model"):
+        self.model = model
+        self.calls = 0
+
+    async def translate(self, *, messages, request_id):
+        self.calls += 1
+        return "Hello"
+
+    async def close(self):
+        return None
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None, "translation_memory_enabled": False}
+
+
+def test_etag_supports_conditional_requests_and_bulk_lookup(settings: Settings):
+    upstream = CountingClient()
+    payload = {"text": "Hallo", "direction": "incoming"}
+
+    with TestClient(create_app(settings=settings, openrouter_client=upstream)) as client:
+        first = client.post("/translate", json=payload)
+        etag = first.json()["etag"]
+        assert etag and first.headers["etag"] == f'"{etag}"'
+
+        not_modified = client.post("/translate", json=payload, headers={"If-None-Match": f'"{etag}"'})
+        assert not_modified.status_code == 304
+        assert upstream.calls == 1
+
+        lookup = client.post("/translate/lookup", json={"held": [etag, "bogus"], "missing": [etag]}).json()
+        assert lookup == {"valid": [etag], "unknown": ["bogus"], "translations": {etag: "Hello"}}
+
+        settings.system_prompt_file.write_text("Prompt B", encoding="utf-8")
+        stale = client.post("/translate/lookup", json={"held": [etag], "missing": [etag]}).json()
+        assert stale == {"valid": [], "unknown": [etag, etag], "translations": {}}
+
+        refreshed = client.post("/translate", json=payload, headers={"If-None-Match": f'"{etag}"'})
+        assert refreshed.status_code == 200
+        assert refreshed.json()["etag"] != etag
+        assert upstream.calls == 2
+
+
+def test_failed_translation_has_no_etag_and_key_tracks_model(settings: Settings):
+    request = TranslateRequest(text="Hallo", direction="incoming")
+    logger = __import__("logging").getLogger("test")
+    first = Translator(openrouter_client=CountingClient("a"), system_prompt_file=settings.system_prompt_file, logger=logger)
+    second = Translator(openrouter_client=CountingClient("b"), system_prompt_file=settings.system_prompt_file, logger=logger)
+    assert first.cache_key(request) != second.cache_key(request)
+    assert first.cache_key(request) == first.cache_key(request.model_copy(update={"text": " Hallo "}))
+
+    class FailingClient(CountingClient):
+        async def translate(self, *, messages, request_id):
+            raise RuntimeError("boom")
+
+    with TestClient(create_app(settings=settings, openrouter_client=FailingClient())) as client:
+        response = client.post("/translate", json={"text": "Hallo", "direction": "incoming"})
+    assert response.json()["etag"] is None
+    assert "etag" not in response.headers
+
+
+def test_cache_key_tracks_context_and_chat(settings: Settings):
+    upstream = CountingClient()
+    base = {"text": "Hallo", "direction": "incoming", "chat_id": "a"}
+    context_a = [{"role": "them", "text": "Wie geht's?"}]
+    context_b = [{"role": "them", "text": "Bist du krank?"}]
+
+    with TestClient(create_app(settings=settings, openrouter_client=upstream)) as client:
+        client.post("/translate", json={**base, "context": context_a})
+        assert upstream.calls == 1
+        client.post("/translate", json={**base, "context": context_a})
+        assert upstream.calls == 1
+        client.post("/translate", json={**base, "context": context_b})
+        assert upstream.calls == 2
+        client.post("/translate", json={**base, "chat_id": "b", "context": context_a})
+        assert upstream.calls == 3
+        client.post("/translate", json=base)
+        client.post("/translate", json={**base, "chat_id": "c"})
+        assert upstream.calls == 4
@@ -55,4 +55,4 @@ async def test_translate_success_with_context_and_hot_prompt_usage(tmp_path: Pat
     sent_messages = client.calls[0]["messages"]
     assert sent_messages[0]["content"] == "Custom system prompt"
     assert "Translate ONLY the CURRENT_TEXT" in sent_messages[1]["content"]
-    assert "Hast du das Dokument fertig?" in sent_messages[1]["content"]
+    assert "Hast du das Dokument fertig?" in sent_messages[-1]["content"]
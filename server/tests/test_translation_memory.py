@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.models import TranslateRequest
+from app.translation_memory import TranslationMemory
+from app.translator import Translator
+
+
+class RecordingClient:
+    def __init__(self, reply: str = "translated"):
+        self.calls = []
+        self.reply = reply
+
+    async def translate(self, *, messages, request_id):
+        self.calls.append(messages)
+        return self.reply
+
+
+def _translator(tmp_path: Path, client, memory: TranslationMemory) -> Translator:
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    return Translator(
+        openrouter_client=client,
+        system_prompt_file=prompt_file,
+        logger=__import__("logging").getLogger("test"),
+        translation_memory=memory,
+    )
+
+
+def test_lookup_scores_near_duplicates_per_direction():
+    memory = TranslationMemory()
+    memory.add("incoming", "Hi Anna, see you at 5 at the station", "A")
+    memory.add("incoming", "Completely unrelated sentence about taxes", "B")
+
+    near = memory.lookup("incoming", "hi anna,  see you at 5 at the station!")
+    assert near[0].translated_text == "A"
+    assert near[0].similarity > 0.9
+
+    assert memory.lookup("incoming", "Hi Anna, see you at 5 at the station")[0].similarity == 1.0
+    assert memory.lookup("outgoing", "Hi Anna, see you at 5 at the station") == []
+
+
+def test_memory_evicts_oldest_entries_beyond_capacity():
+    memory = TranslationMemory(max_entries=2)
+    memory.add("incoming", "first message", "1")
+    memory.add("incoming", "second message", "2")
+    memory.add("incoming", "third message", "3")
+
+    assert len(memory) == 2
+    assert all(match.translated_text != "1" for match in memory.lookup("incoming", "first message"))
+
+
+@pytest.mark.asyncio
+async def test_direct_hit_skips_upstream(tmp_path: Path):
+    memory = TranslationMemory()
+    memory.add(
+        "outgoing",
+        "Good morning everyone, the meeting starts at nine today!",
+        "Guten Morgen zusammen, das Meeting beginnt heute um neun!",
+    )
+    client = RecordingClient()
+    translator = _translator(tmp_path, client, memory)
+
+    outcome = await translator.translate(
+        TranslateRequest(text="good morning everyone, the meeting starts at nine today", direction="outgoing"),
+        request_id="tm-direct",
+    )
+
+    assert outcome.translated_text == "Guten Morgen zusammen, das Meeting beginnt heute um neun!"
+    assert outcome.success is True
+    assert outcome.attempts == 0
+    assert client.calls == []
+    assert memory.snapshot()["direct_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_middle_band_adds_few_shot_hints_and_learns(tmp_path: Path):
+    memory = TranslationMemory()
+    memory.add("outgoing", "See you tomorrow at the office, Anna", "Bis morgen im Büro, Anna")
+    client = RecordingClient("Bis morgen im Büro, Bob")
+    translator = _translator(tmp_path, client, memory)
+
+    outcome = await translator.translate(
+        TranslateRequest(text="See you tomorrow at the office, Bob", direction="outgoing"),
+        request_id="tm-hint",
+    )
+
+    assert outcome.translated_text == "Bis morgen im Büro, Bob"
+    user_prompt = client.calls[0][-1]["content"]
+    assert "Reference translations of similar earlier messages" in user_prompt
+    assert "Bis morgen im Büro, Anna" in user_prompt
+    assert memory.lookup("outgoing", "See you tomorrow at the office, Bob")[0].similarity == 1.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I will transfer you 5000 euros tomorrow morning, please confirm the account",
+        "I will NOT transfer you 500 euros tomorrow morning, please confirm the account",
+    ],
+)
+async def test_changed_numbers_or_negation_are_only_hints(tmp_path: Path, text: str):
+    memory = TranslationMemory()
+    memory.add(
+        "outgoing",
+        "I will transfer you 500 euros tomorrow morning, please confirm the account",
+        "Ich überweise dir morgen früh 500 Euro, bitte bestätige das Konto",
+    )
+    assert memory.lookup("outgoing", text)[0].similarity >= memory.direct_threshold
+    client = RecordingClient("fresh translation")
+
+    outcome = await _translator(tmp_path, client, memory).translate(
+        TranslateRequest(text=text, direction="outgoing"), request_id="tm-guard"
+    )
+
+    assert outcome.translated_text == "fresh translation" and len(client.calls) == 1
+    assert "Ich überweise dir morgen früh 500 Euro" in client.calls[0][-1]["content"]
+    assert memory.snapshot()["direct_hits"] == 0 and memory.snapshot()["guarded_hits"] == 1
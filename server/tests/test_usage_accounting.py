@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from app import usage
+from app.error_policy import OpenRouterTimeoutError
+from app.models import TranslateRequest
+from app.openrouter_client import UpstreamCompletion
+from app.translator import Translator
+from app.usage import TokenUsage, UsageTracker, hash_chat_id
+
+
+class ScriptedClient:
+    model = "test/model"
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+
+    async def translate(self, *, messages, request_id):
+        result = self._responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+async def no_sleep(_: float) -> None:
+    return None
+
+
+@pytest.mark.asyncio
+async def test_every_attempt_is_recorded_by_model_direction_and_chat(tmp_path: Path):
+    prompt_file = tmp_path / "system_prompt.txt"
+    prompt_file.write_text("Prompt", encoding="utf-8")
+    tracker = UsageTracker()
+    client = ScriptedClient(
+        [
+            OpenRouterTimeoutError("slow"),
+            UpstreamCompletion(
+                content="Hallo",
+                usage=TokenUsage(prompt_tokens=100, completion_tokens=20, cached_tokens=40, cost=0.002),
+                model="test/model",
+            ),
+        ]
+    )
+    translator = Translator(
+        openrouter_client=client,
+        system_prompt_file=prompt_file,
+        logger=__import__("logging").getLogger("test"),
+        sleep_func=no_sleep,
+        usage_tracker=tracker,
+    )
+
+    outcome = await translator.translate(
+        TranslateRequest(text="Hello", direction="outgoing", chat_id="chat-42"),
+        request_id="usage",
+    )
+    assert outcome.translated_text == "Hallo"
+
+    snapshot = tracker.snapshot()
+    total = snapshot["total"]
+    assert total["attempts"] == 2
+    assert total["successes"] == 1
+    assert total["completion_tokens"] == 20
+    assert total["cost_per_successful_translation_usd"] == pytest.approx(0.002)
+    assert total["tokens_per_second"] > 0
+    assert snapshot["by_model"]["test/model"]["attempts"] == 2
+    assert snapshot["by_direction"]["outgoing"]["prompt_tokens"] == 100
+    assert "chat-42" not in snapshot["top_chats"]
+    assert snapshot["top_chats"][hash_chat_id("chat-42")]["attempts"] == 2
+
+
+def test_rollup_appends_json_lines(tmp_path: Path):
+    tracker = UsageTracker()
+    tracker.record_attempt(
+        model="m",
+        direction="incoming",
+        chat_id=None,
+        latency_ms=500.0,
+        usage=TokenUsage(prompt_tokens=10, completion_tokens=50),
+        success=True,
+    )
+    rollup = tmp_path / "rollup" / "usage.jsonl"
+    tracker.write_rollup(rollup)
+    tracker.write_rollup(rollup)
+
+    lines = rollup.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[-1])
+    assert record["total"]["tokens_per_second"] == pytest.approx(100.0)
+    assert "at" in record
+
+
+def test_tokens_per_second_ignores_failed_attempts_on_both_sides():
+    tracker = UsageTracker()
+    for success in (True, False, False, False):
+        tracker.record_attempt(
+            model="m",
+            direction="outgoing",
+            chat_id="c",
+            latency_ms=1000.0,
+            usage=TokenUsage(prompt_tokens=10, completion_tokens=100),
+            success=success,
+        )
+
+    total = tracker.snapshot()["total"]
+    assert total["completion_tokens"] == 400
+    assert total["tokens_per_second"] == pytest.approx(100.0)
+
+
+def test_rollup_rotates_at_max_bytes(tmp_path: Path):
+    tracker = UsageTracker()
+    rollup = tmp_path / "usage.jsonl"
+    for _ in range(10):
+        tracker.write_rollup(rollup, max_bytes=600, backup_count=2)
+
+    rotated = sorted(path.name for path in tmp_path.iterdir())
+    assert rotated == ["usage.jsonl", "usage.jsonl.1", "usage.jsonl.2"]
+    assert all(path.stat().st_size <= 600 for path in tmp_path.iterdir())
+
+
+def test_chat_ids_are_hashed_with_the_deployment_secret(monkeypatch):
+    monkeypatch.setattr(usage, "_chat_hash_secret", usage._chat_hash_secret)
+    usage.configure_chat_hash("secret-a")
+    first = hash_chat_id("12345")
+    assert first == hash_chat_id("12345") != hash_chat_id("12346")
+    assert first != hashlib.sha256(b"12345").hexdigest()[:12]
+
+    usage.configure_chat_hash(None)
+    assert hash_chat_id("12345") == first
+    usage.configure_chat_hash("secret-b")
+    assert hash_chat_id("12345") != first
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.stats import StatsTracker
+from app.translator import TranslationOutcome
+
+
+class DelayedTranslator:
+    async def translate(self, request_body: TranslateRequest, request_id: str):
+        if request_body.text == "slow":
+            await asyncio.sleep(0.3)
+        elif request_body.text == "hang":
+            await asyncio.sleep(30)
+        elif request_body.text == "boom":
+            raise RuntimeError("upstream exploded")
+        return TranslationOutcome(
+            translated_text=f"x:{request_body.text}",
+            original_text=request_body.text,
+            direction=request_body.direction,
+            translation_failed=False,
+            used_fallback=False,
+            success=True,
+            attempts=1,
+        )
+
+
+class DummyOpenRouterClient:
+    async def close(self):
+        return None
+
+
+def _app(settings: Settings):
+    return create_app(
+        settings=settings,
+        stats=StatsTracker(),
+        openrouter_client=DummyOpenRouterClient(),
+        translator=DelayedTranslator(),
+    )
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None}
+
+
+def test_results_arrive_out_of_order_and_cancel_aborts_work(settings: Settings):
+    app = _app(settings)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "translate", "id": "a", "text": "slow", "direction": "incoming"})
+            ws.send_json({"type": "translate", "id": "b", "text": "fast", "direction": "incoming"})
+            first = ws.receive_json()
+            second = ws.receive_json()
+            assert (first["id"], first["translated_text"]) == ("b", "x:fast")
+            assert (second["id"], second["type"]) == ("a", "result")
+
+            ws.send_json({"type": "translate", "id": "c", "text": "hang", "direction": "outgoing"})
+            ws.send_json({"type": "cancel", "id": "c"})
+            assert ws.receive_json() == {"type": "cancelled", "id": "c"}
+
+            ws.send_json({"type": "translate", "id": "d", "direction": "sideways", "text": "x"})
+            error = ws.receive_json()
+            assert (error["id"], error["code"]) == ("d", "invalid_request")
+
+        stats = client.get("/stats").json()
+        assert stats["websocket"]["connections_total"] == 1
+        assert stats["websocket"]["completed"] == 2
+        assert stats["websocket"]["cancelled"] == 1
+        assert stats["cancelled_requests"] == 1
+        assert stats["inflight_requests"] == 0
+        assert stats["total_requests"] == 3
+
+
+def test_inflight_limit_rejects_excess_requests(settings: Settings):
+    app = _app(replace(settings, ws_max_inflight=1))
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "translate", "id": "1", "text": "slow", "direction": "incoming"})
+            ws.send_json({"type": "translate", "id": "2", "text": "fast", "direction": "incoming"})
+            rejected = ws.receive_json()
+            assert (rejected["id"], rejected["code"]) == ("2", "busy")
+            assert ws.receive_json()["id"] == "1"
+
+
+def test_failed_tasks_and_binary_frames_get_error_frames(settings: Settings):
+    app = _app(settings)
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws") as ws:
+            ws.send_bytes(b'{"id": "bin", "text": "x", "direction": "incoming"}')
+            binary = ws.receive_json()
+            assert (binary["id"], binary["code"]) == (None, "invalid_frame")
+
+            ws.send_json({"type": "translate", "id": "e", "text": "boom", "direction": "incoming"})
+            failed = ws.receive_json()
+            assert failed == {"type": "error", "id": "e", "code": "translate_failed", "detail": "translation failed"}
+
+            ws.send_json({"type": "translate", "id": "f", "text": "fast", "direction": "incoming"})
+            assert ws.receive_json()["translated_text"] == "x:fast"
+
+        stats = client.get("/stats").json()["websocket"]
+        assert (stats["completed"], stats["failed"]) == (1, 1)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import gzip
+import json
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+import pytest
+
+from app.config import Settings
+from app.main import create_app
+from app.models import TranslateRequest
+from app.stats import StatsTracker
+from app.translator import TranslationOutcome
+from app.wire import decode_body
+
+msgpack = pytest.importorskip("msgpack")
+brotli = pytest.importorskip("brotli")
+
+
+class EchoTranslator:
+    def __init__(self):
+        self.requests = []
+
+    async def translate(self, request_body: TranslateRequest, request_id: str):
+        self.requests.append(request_body)
+        return TranslationOutcome(
+            translated_text=f"x:{request_body.text}",
+            original_text=request_body.text,
+            direction=request_body.direction,
+            translation_failed=False,
+            used_fallback=False,
+            success=True,
+            attempts=1,
+        )
+
+
+class DummyOpenRouterClient:
+    async def close(self):
+        return None
+
+
+@pytest.fixture
+def settings_overrides() -> dict:
+    return {"openrouter_api_key": None}
+
+
+def _client(settings: Settings) -> tuple[TestClient, EchoTranslator]:
+    translator = EchoTranslator()
+    app = create_app(
+        settings=settings,
+        stats=StatsTracker(),
+        openrouter_client=DummyOpenRouterClient(),
+        translator=translator,
+    )
+    return TestClient(app), translator
+
+
+def _payload() -> dict:
+    return {
+        "text": "Kommst du morgen?",
+        "direction": "incoming",
+        "chat_id": "c1",
+        "context": [{"role": "them" if i % 2 else "me", "text": f"Nachricht Nummer {i}"} for i in range(100)],
+    }
+
+
+@pytest.mark.parametrize(
+    ("encoding", "compressor"),
+    [("gzip", gzip.compress), ("br", brotli.compress)],
+)
+def test_compressed_json_request_bodies_are_decoded(settings: Settings, encoding, compressor):
+    client, translator = _client(settings)
+    body = compressor(json.dumps(_payload()).encode("utf-8"))
+
+    with client:
+        response = client.post(
+            "/translate",
+            content=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": encoding},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["translated_text"] == "x:Kommst du morgen?"
+    assert len(translator.requests[0].context) == 100
+
+
+def test_msgpack_round_trip_with_negotiated_compression(settings: Settings):
+    client, translator = _client(settings)
+    payload = _payload()
+    payload["text"] = "Lange Nachricht " * 64
+
+    with client:
+        response = client.post(
+            "/translate",
+            content=msgpack.packb(payload),
+            headers={
+                "Content-Type": "application/x-msgpack",
+                "Accept": "application/x-msgpack",
+                "Accept-Encoding": "br;q=1.0, gzip;q=0.5",
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-msgpack"
+    assert response.headers["content-encoding"] == "br"
+    decoded = msgpack.unpackb(response.content)
+    assert decoded["original_text"] == payload["text"]
+    assert translator.requests[0].context[0].text == "Nachricht Nummer 0"
+
+
+def test_invalid_bodies_are_rejected(settings: Settings):
+    client, _ = _client(settings)
+
+    with client:
+        unsupported = client.post(
+            "/translate",
+            content=b"abc",
+            headers={"Content-Type": "application/json", "Content-Encoding": "zstd"},
+        )
+        bad_msgpack = client.post(
+            "/translate",
+            content=msgpack.packb({"text": "hi", "direction": "sideways"}),
+            headers={"Content-Type": "application/x-msgpack"},
+        )
+        plain = client.post("/translate", json={"text": "hi", "direction": "outgoing"})
+
+    assert unsupported.status_code == 415
+    assert bad_msgpack.status_code == 422
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+
+
+@pytest.mark.parametrize(
+    ("encoding", "compressor"),
+    [("gzip", gzip.compress), ("br", brotli.compress)],
+)
+def test_compression_bombs_stop_at_the_limit(encoding, compressor):
+    bomb = compressor(b'{"text": "' + b"a" * (64 * 1024 * 1024) + b'"}')
+    assert len(bomb) < 256 * 1024
+
+    with pytest.raises(HTTPException) as exc_info:
+        decode_body(bomb, encoding, max_bytes=1024 * 1024)
+    assert exc_info.value.status_code == 413
+
+    small = compressor(b'{"text": "hi"}')
+    assert decode_body(small, encoding, max_bytes=1024 * 1024) == b'{"text": "hi"}'
+    with pytest.raises(HTTPException) as exc_info:
+        decode_body(small[:-2], encoding, max_bytes=1024 * 1024)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Latency percentiles, retries and fallback reasons per time bucket from server.log files.
+
+Examples:
+  python tools/analyze_logs.py
+  python tools/analyze_logs.py server/server.log* --bucket 1h --since "2026-10-18 18:00" --until "2026-10-18 19:00"
+  python tools/analyze_logs.py --bucket 5m --path /translate --json
+
+Files are read oldest rotation first (server.log.3 ... server.log) in one streaming pass.
+Access lines (``http request_id=... duration_ms=...``) are joined with the translator's
+``request_id=... outcome=...`` lines by request id. Older access lines without a request id
+(``http method=... duration_ms=...``) count towards latency and status but are never joined.
+Latencies go into log-spaced histograms and pending joins are capped, so memory stays
+constant whatever the log size.
+Percentiles are upper bounds accurate to about 2%.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_LOG = REPO_ROOT / "server" / "server.log"
+BUCKETS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "6h": 21600, "1d": 86400}
+FINAL_OUTCOMES = frozenset(
+    {"success", "fallback", "cache_hit", "memory_hit", "peer_hit", "backend_fallback", "deferred"}
+)
+MAX_PENDING = 50_000
+HISTOGRAM_GROWTH = 1.02
+HISTOGRAM_BINS = 1000  # 1.02**1000 ms is far beyond any request
+
+_ACCESS = re.compile(r" http request_id=(\w+) method=\S+ path=(\S+) status=(\d+) duration_ms=([\d.]+)")
+_LEGACY_ACCESS = re.compile(r" http method=\S+ path=(\S+) status=(\d+) duration_ms=([\d.]+)")
+_OUTCOME = re.compile(r" request_id=(\S+) outcome=(\w+)")
+_FIELD = re.compile(r"(\w+)=(\S+)")
+_EPOCH = datetime(1970, 1, 1)
+
+
+class Bucket:
+    __slots__ = ("requests", "statuses", "latency", "max_ms", "outcomes", "attempts", "retries", "reasons", "joined")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.latency: dict[int, int] = {}
+        self.max_ms = 0.0
+        self.outcomes: Counter = Counter()
+        self.attempts: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.reasons: Counter = Counter()
+        self.joined = 0
+
+    def add_access(self, status: str, duration_ms: float) -> None:
+        self.requests += 1
+        self.statuses[status[0] + "xx"] += 1
+        index = 0 if duration_ms <= 1.0 else min(HISTOGRAM_BINS, math.ceil(math.log(duration_ms, HISTOGRAM_GROWTH)))
+        self.latency[index] = self.latency.get(index, 0) + 1
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def add_outcome(self, record: list) -> None:
+        outcome, attempts, reason, retries = record[1:5]
+        if outcome is None:
+            return
+        self.outcomes[outcome] += 1
+        if attempts is not None:
+            self.attempts[attempts] += 1
+        self.retries[retries] += 1
+        if reason is not None:
+            self.reasons[reason] += 1
+
+    def percentile(self, quantile: float) -> float:
+        if not self.requests:
+            return 0.0
+        target = max(1, math.ceil(quantile * self.requests))
+        seen = 0
+        for index in sorted(self.latency):
+            seen += self.latency[index]
+            if seen >= target:
+                return round(min(HISTOGRAM_GROWTH**index, self.max_ms), 2)
+        return round(self.max_ms, 2)
+
+
+class Analyzer:
+    def __init__(self, *, bucket_seconds: int, path: str | None, since: datetime | None, until: datetime | None):
+        self.bucket_seconds = bucket_seconds
+        self.path = path
+        self.since = since
+        self.until = until
+        self.buckets: dict[int, Bucket] = {}
+        # request_id -> [bucket, outcome, attempts, reason, retries, joined]; outcomes not yet settled.
+        self._pending: OrderedDict[str, list] = OrderedDict()
+        # request_id -> bucket; access lines whose outcome is logged later (deferred jobs).
+        self._awaiting: OrderedDict[str, int] = OrderedDict()
+        self._minute_cache: dict[str, int] = {}
+        self.lines = 0
+        self.skipped = 0
+
+    def feed(self, handle) -> None:
+        for line in handle:
+            self.lines += 1
+            if "request_id=" not in line:
+                if " http method=" in line:
+                    epoch = self._epoch(line)
+                    if epoch is None:
+                        self.skipped += 1
+                    else:
+                        self._legacy_access(line, epoch)
+                continue
+            epoch = self._epoch(line)
+            if epoch is None:
+                self.skipped += 1
+                continue
+            if " http request_id=" in line:
+                self._access(line, epoch)
+            elif " outcome=" in line:
+                self._outcome(line, epoch)
+
+    def finish(self) -> None:
+        for record in self._pending.values():
+            self._flush(record)
+        self._pending.clear()
+        self._awaiting.clear()
+
+    def _access(self, line: str, epoch: int) -> None:
+        match = _ACCESS.search(line)
+        if match is None:
+            self.skipped += 1
+            return
+        request_id, path, status, duration = match.groups()
+        if self.path is not None and path != self.path:
+            return
+        bucket_key = epoch - epoch % self.bucket_seconds
+        self._bucket(bucket_key).add_access(status, float(duration))
+        record = self._pending.pop(request_id, None)
+        if record is not None:
+            record[0], record[5] = bucket_key, True
+            if record[1] != "deferred":
+                self._flush(record)
+                return
+            # The job's own outcome is logged after the response; count it against this request.
+            self._bucket(bucket_key).outcomes["deferred"] += 1
+        self._awaiting[request_id] = bucket_key
+        if len(self._awaiting) > MAX_PENDING:
+            self._awaiting.popitem(last=False)
+
+    def _legacy_access(self, line: str, epoch: int) -> None:
+        match = _LEGACY_ACCESS.search(line)
+        if match is None:
+            self.skipped += 1
+            return
+        path, status, duration = match.groups()
+        if self.path is not None and path != self.path:
+            return
+        self._bucket(epoch - epoch % self.bucket_seconds).add_access(status, float(duration))
+
+    def _outcome(self, line: str, epoch: int) -> None:
+        match = _OUTCOME.search(line)
+        if match is None:
+            return
+        request_id, outcome = match.groups()
+        record = self._pending.get(request_id)
+        if record is None:
+            late_bucket = self._awaiting.pop(request_id, None)
+            if late_bucket is None:
+                record = [epoch - epoch % self.bucket_seconds, None, None, None, 0, False]
+            else:
+                record = [late_bucket, None, None, None, 0, True]
+            self._pending[request_id] = record
+            if len(self._pending) > MAX_PENDING:
+                self._flush(self._pending.popitem(last=False)[1])
+        if outcome.startswith("retry_"):
+            record[4] += 1
+            return
+        if outcome not in FINAL_OUTCOMES:
+            return
+        fields = dict(_FIELD.findall(line, match.end()))
+        record[1] = outcome
+        if "attempts" in fields:
+            record[2] = fields["attempts"]
+        if outcome == "fallback":
+            record[3] = fields.get("reason")
+        elif outcome == "backend_fallback":
+            record[3] = f"{fields.get('primary_reason')}->{fields.get('backend')}"
+        # A fallback may still be followed by backend_fallback, so only other outcomes settle a late record.
+        if record[5] and outcome not in {"fallback", "deferred"}:
+            del self._pending[request_id]
+            self._flush(record)
+
+    def _flush(self, record: list) -> None:
+        bucket = self._bucket(record[0])
+        if record[5]:
+            bucket.joined += 1
+        bucket.add_outcome(record)
+
+    def _epoch(self, line: str) -> int | None:
+        minute = line[:16]
+        base = self._minute_cache.get(minute)
+        if base is None:
+            try:
+                moment = datetime.strptime(minute, "%Y-%m-%d %H:%M")
+            except ValueError:
+                return None
+            if len(self._minute_cache) > 4096:
+                self._minute_cache.clear()
+            base = self._minute_cache[minute] = int((moment - _EPOCH).total_seconds())
+        try:
+            epoch = base + int(line[17:19])
+        except ValueError:
+            return None
+        if self.since is not None and epoch < self.since_epoch:
+            return None
+        if self.until is not None and epoch >= self.until_epoch:
+            return None
+        return epoch
+
+    @property
+    def since_epoch(self) -> int:
+        return int((self.since - _EPOCH).total_seconds())
+
+    @property
+    def until_epoch(self) -> int:
+        return int((self.until - _EPOCH).total_seconds())
+
+    def _bucket(self, key: int) -> Bucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket()
+        return bucket
+
+    def rows(self) -> list[dict]:
+        rows = []
+        for key in sorted(self.buckets):
+            bucket = self.buckets[key]
+            rows.append(
+                {
+                    "bucket_start": (_EPOCH + timedelta(seconds=key)).strftime("%Y-%m-%d %H:%M:%S"),
+                    "requests": bucket.requests,
+                    "statuses": dict(sorted(bucket.statuses.items())),
+                    "p50_ms": bucket.percentile(0.50),
+                    "p95_ms": bucket.percentile(0.95),
+                    "p99_ms": bucket.percentile(0.99),
+                    "max_ms": round(bucket.max_ms, 2),
+                    "joined": bucket.joined,
+                    "outcomes": dict(bucket.outcomes.most_common()),
+                    "attempts": dict(sorted(bucket.attempts.items(), key=lambda item: int(item[0]))),
+                    "retries": {str(count): total for count, total in sorted(bucket.retries.items())},
+                    "fallback_reasons": dict(bucket.reasons.most_common()),
+                }
+            )
+        return rows
+
+
+def ordered_log_files(paths: list[Path]) -> list[Path]:
+    def rotation(path: Path) -> int:
+        suffix = path.name.rsplit(".", 1)[-1]
+        return int(suffix) if suffix.isdigit() else 0
+
+    return sorted((path for path in paths if path.is_file()), key=rotation, reverse=True)
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"unrecognized time {value!r}; use 'YYYY-MM-DD[ HH:MM[:SS]]'")
+
+
+def _format_counts(counts: dict, limit: int = 3) -> str:
+    return ",".join(f"{key}:{value}" for key, value in list(counts.items())[:limit]) or "-"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="*", type=Path, help="log files; default server/server.log and its rotations")
+    parser.add_argument("--bucket", choices=BUCKETS, default="1h", help="time bucket size")
+    parser.add_argument("--since", default=None, help="first timestamp to include, e.g. '2026-10-18 18:00'")
+    parser.add_argument("--until", default=None, help="first timestamp to exclude")
+    parser.add_argument("--path", default="/translate", help="access-log path to include; 'all' for every path")
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    try:
+        since, until = _parse_time(args.since), _parse_time(args.until)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    paths = args.logs or sorted(DEFAULT_LOG.parent.glob(DEFAULT_LOG.name + "*"))
+    files = ordered_log_files(paths)
+    if not files:
+        parser.error("no log files found")
+
+    analyzer = Analyzer(
+        bucket_seconds=BUCKETS[args.bucket],
+        path=None if args.path == "all" else args.path,
+        since=since,
+        until=until,
+    )
+    for path in files:
+        with path.open(encoding="utf-8", errors="replace", buffering=1 << 20) as handle:
+            analyzer.feed(handle)
+    analyzer.finish()
+    rows = analyzer.rows()
+
+    if args.json:
+        print(json.dumps({"files": [str(path) for path in files], "lines": analyzer.lines, "buckets": rows}, indent=2))
+        return 0
+
+    print(
+        f"{'bucket_start':<19} {'requests':>8} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'max_ms':>9} "
+        f"{'fallback':>8}  {'retries':<18} {'top fallback reasons'}"
+    )
+    for row in rows:
+        fallbacks = row["outcomes"].get("fallback", 0) + row["outcomes"].get("backend_fallback", 0)
+        print(
+            f"{row['bucket_start']:<19} {row['requests']:>8} {row['p50_ms']:>9} {row['p95_ms']:>9} "
+            f"{row['p99_ms']:>9} {row['max_ms']:>9} {fallbacks:>8}  {_format_counts(row['retries']):<18} "
+            f"{_format_counts(row['fallback_reasons'])}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
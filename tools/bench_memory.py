@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Proxy RSS under concurrent large-payload load.
+
+Examples:
+  python tools/bench_memory.py
+  python tools/bench_memory.py --rounds 8 --concurrency 64 --max-growth-mb 25
+  python tools/bench_memory.py --max-body-bytes 1000000000 --json   # effectively unlimited, for comparison
+
+Starts a uvicorn proxy (``--factory app.main:create_app``) against a local stub upstream and sends rounds of
+concurrent requests: oversized bodies streamed without Content-Length, oversized bodies with it,
+and in-limit bodies whose context has to be trimmed. The proxy's RSS is read from
+/proc/<pid>/status (Linux) after every round. The command exits with status 1 when RSS grows by
+more than --max-growth-mb between the first and the last round.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = REPO_ROOT / "server"
+CHUNK = b"x" * 65536
+
+
+class StubUpstream(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"choices": [{"message": {"content": "stub translation"}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - signature from BaseHTTPRequestHandler
+        return
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _memory_kb(pid: int) -> dict[str, int]:
+    values = {}
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        key, _, rest = line.partition(":")
+        if key in {"VmRSS", "VmHWM"}:
+            values[key] = int(rest.split()[0])
+    return values
+
+
+async def _streamed(size: int):
+    prefix = b'{"text": "hallo", "direction": "incoming", "chat_id": "'
+    yield prefix
+    sent = len(prefix)
+    while sent < size:
+        yield CHUNK
+        sent += len(CHUNK)
+    yield b'"}'
+
+
+def _trimmed_payload(message_bytes: int) -> bytes:
+    context = [{"role": "them", "text": "ä" * (message_bytes // 2)} for _ in range(100)]
+    return json.dumps({"text": "Guten Morgen", "direction": "incoming", "context": context}, ensure_ascii=False).encode()
+
+
+async def _round(client: httpx.AsyncClient, concurrency: int, payload_mb: int, trimmed: bytes) -> dict[int, int]:
+    size = payload_mb * 1024 * 1024
+    headers = {"Content-Type": "application/json"}
+
+    async def send(index: int) -> int:
+        kind = index % 3
+        try:
+            if kind == 0:
+                response = await client.post("/translate", content=_streamed(size), headers=headers)
+            elif kind == 1:
+                response = await client.post("/translate", content=b"{" + CHUNK * (size // len(CHUNK)), headers=headers)
+            else:
+                response = await client.post("/translate", content=trimmed, headers=headers)
+        except httpx.TransportError:
+            return 0  # the proxy may close the connection before the whole upload is sent
+        return response.status_code
+
+    statuses: dict[int, int] = {}
+    for status in await asyncio.gather(*(send(index) for index in range(concurrency))):
+        statuses[status] = statuses.get(status, 0) + 1
+    return statuses
+
+
+async def _load(base_url: str, pid: int, args: argparse.Namespace) -> list[dict]:
+    trimmed = _trimmed_payload(args.context_message_bytes)
+    rounds = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        for number in range(1, args.rounds + 1):
+            started = time.perf_counter()
+            statuses = await _round(client, args.concurrency, args.payload_mb, trimmed)
+            memory = _memory_kb(pid)
+            rounds.append(
+                {
+                    "round": number,
+                    "seconds": round(time.perf_counter() - started, 2),
+                    "statuses": {str(key): value for key, value in sorted(statuses.items())},
+                    "rss_mb": round(memory["VmRSS"] / 1024, 1),
+                    "peak_rss_mb": round(memory["VmHWM"] / 1024, 1),
+                }
+            )
+    return rounds
+
+
+def run(args: argparse.Namespace) -> dict:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-memory-") as scratch:
+        env = {
+            **os.environ,
+            "PYTHONPATH": str(SERVER_DIR),
+            "OPENROUTER_API_KEY": "bench-stub",
+            "OPENROUTER_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions",
+            "SERVER_LOG_FILE": str(Path(scratch) / "server.log"),
+            "USAGE_ROLLUP_FILE": str(Path(scratch) / "usage_rollup.jsonl"),
+            "TRACE_ENABLED": "false",
+            "PEERS_ENABLED": "false",
+            "HEALTH_PROBE_ENABLED": "false",
+        }
+        if args.max_body_bytes is not None:
+            env["MAX_BODY_BYTES"] = str(args.max_body_bytes)
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "--factory", "app.main:create_app",
+                "--app-dir", str(SERVER_DIR), "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+            ],
+            env=env,
+            cwd=REPO_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.perf_counter() + 30.0
+            while True:
+                try:
+                    if httpx.get(f"{base_url}/health", timeout=2.0).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if process.poll() is not None or time.perf_counter() > deadline:
+                    raise RuntimeError("proxy did not start")
+                time.sleep(0.05)
+            baseline = _memory_kb(process.pid)
+            rounds = asyncio.run(_load(base_url, process.pid, args))
+            limits = httpx.get(f"{base_url}/stats", timeout=5.0).json().get("limits")
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            server.shutdown()
+    return {"idle_rss_mb": round(baseline["VmRSS"] / 1024, 1), "rounds": rounds, "limits": limits}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="number of load rounds")
+    parser.add_argument("--concurrency", type=int, default=48, help="concurrent requests per round")
+    parser.add_argument("--payload-mb", type=int, default=16, help="size of each oversized body")
+    parser.add_argument("--context-message-bytes", type=int, default=12_000, help="size of each context message")
+    parser.add_argument("--max-body-bytes", type=int, default=None, help="override limits.max_body_bytes for the proxy")
+    parser.add_argument("--max-growth-mb", type=float, default=20.0, help="fail if RSS grows more than this")
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    result = run(args)
+    rounds = result["rounds"]
+    growth = rounds[-1]["rss_mb"] - rounds[0]["rss_mb"]
+    failed = growth > args.max_growth_mb
+
+    if args.json:
+        print(json.dumps({**result, "growth_mb": round(growth, 1), "failed": failed}, indent=2))
+    else:
+        print(f"idle rss: {result['idle_rss_mb']} MB")
+        print(f"{'round':>5} {'seconds':>8} {'rss_mb':>8} {'peak_mb':>8}  statuses")
+        for row in rounds:
+            print(f"{row['round']:>5} {row['seconds']:>8} {row['rss_mb']:>8} {row['peak_rss_mb']:>8}  {row['statuses']}")
+        print(f"growth first->last round: {growth:.1f} MB")
+        if failed:
+            print(f"REGRESSION: RSS grew by more than {args.max_growth_mb} MB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark: time to first successful /health and first translation.
+
+Examples:
+  python tools/bench_startup.py --runs 5
+  python tools/bench_startup.py --write-baseline bench_startup.json
+  python tools/bench_startup.py --baseline bench_startup.json --tolerance 0.25
+  python tools/bench_startup.py --max-health-ms 1500 --max-translate-ms 2000 --json
+
+Each run starts a fresh uvicorn process (``--factory app.main:create_app``, as in server/run.sh) against a
+local stub upstream and polls until /health answers and /translate returns a translation.
+The command exits with status 1 when a median exceeds --max-*-ms or the baseline by more
+than --tolerance, so it can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVER_DIR = REPO_ROOT / "server"
+METRICS = ("import_ms", "health_ms", "translate_ms")
+
+
+class StubUpstream(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(
+            {
+                "model": "stub/model",
+                "choices": [{"message": {"content": "stub translation"}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 3},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # noqa: A002 - signature from BaseHTTPRequestHandler
+        return
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _measure_import(env: dict) -> float:
+    code = "import time; t = time.perf_counter(); import app.main; print((time.perf_counter() - t) * 1000)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=SERVER_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
+
+
+def _run_once(stub_url: str, scratch: Path, timeout: float) -> dict:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(SERVER_DIR),
+        "OPENROUTER_API_KEY": "bench-stub",
+        "OPENROUTER_BASE_URL": stub_url,
+        "BIND_HOST": "127.0.0.1",
+        "PROXY_PORT": str(port),
+        "SERVER_LOG_FILE": str(scratch / "server.log"),
+        "USAGE_ROLLUP_FILE": str(scratch / "usage_rollup.jsonl"),
+        "TRACE_ENABLED": "false",
+        "PEERS_ENABLED": "false",
+    }
+    import_ms = _measure_import(env)
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "--factory", "app.main:create_app",
+            "--app-dir", str(SERVER_DIR), "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        env=env,
+        cwd=REPO_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    health_ms = translate_ms = None
+    try:
+        with httpx.Client(base_url=base_url, timeout=5.0) as client:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"proxy exited with status {process.returncode}")
+                try:
+                    if health_ms is None:
+                        if client.get("/health").status_code == 200:
+                            health_ms = (time.perf_counter() - started) * 1000.0
+                        continue
+                    response = client.post("/translate", json={"text": "Guten Morgen", "direction": "incoming"})
+                    if response.status_code == 200 and not response.json()["translation_failed"]:
+                        translate_ms = (time.perf_counter() - started) * 1000.0
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    if health_ms is None or translate_ms is None:
+        raise RuntimeError(f"proxy did not serve a translation within {timeout:.0f}s")
+    return {"import_ms": import_ms, "health_ms": health_ms, "translate_ms": translate_ms}
+
+
+def run(runs: int, timeout: float) -> dict:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions"
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench-startup-") as scratch:
+            samples = [_run_once(stub_url, Path(scratch), timeout) for _ in range(runs)]
+    finally:
+        server.shutdown()
+    summary = {}
+    for metric in METRICS:
+        values = [sample[metric] for sample in samples]
+        summary[metric] = {
+            "min": round(min(values), 1),
+            "median": round(statistics.median(values), 1),
+            "max": round(max(values), 1),
+        }
+    return summary
+
+
+def regressions(summary: dict, args: argparse.Namespace) -> list[str]:
+    failures = []
+    budgets = {"health_ms": args.max_health_ms, "translate_ms": args.max_translate_ms}
+    for metric, budget in budgets.items():
+        if budget is not None and summary[metric]["median"] > budget:
+            failures.append(f"{metric} median {summary[metric]['median']}ms exceeds budget {budget}ms")
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        for metric in METRICS:
+            if metric not in baseline:
+                continue
+            limit = baseline[metric]["median"] * (1.0 + args.tolerance)
+            if summary[metric]["median"] > limit:
+                failures.append(
+                    f"{metric} median {summary[metric]['median']}ms exceeds baseline "
+                    f"{baseline[metric]['median']}ms by more than {args.tolerance:.0%}"
+                )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts to measure")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for each start")
+    parser.add_argument("--max-health-ms", type=float, default=None, help="fail if median /health time exceeds this")
+    parser.add_argument("--max-translate-ms", type=float, default=None, help="fail if median translation time exceeds this")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON from --write-baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown over the baseline")
+    parser.add_argument("--write-baseline", type=Path, default=None, help="store this run's summary as a baseline")
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    summary = run(max(1, args.runs), args.timeout)
+    failures = regressions(summary, args)
+    if args.write_baseline is not None:
+        args.write_baseline.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+
+    if args.json:
+        print(json.dumps({"summary": summary, "regressions": failures}, indent=2))
+    else:
+        print(f"{'metric':<14} {'min':>9} {'median':>9} {'max':>9}")
+        for metric in METRICS:
+            row = summary[metric]
+            print(f"{metric:<14} {row['min']:>9} {row['median']:>9} {row['max']:>9}")
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
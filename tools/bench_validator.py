@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Cost of validating one upstream translation, by output size.
+
+Usage: python tools/bench_validator.py [--sizes 200,10000,100000,1000000] [--json]
+
+Compares the full-text lowercase-and-scan error check the client used before with
+``find_error_marker`` plus the echo and wrong-language checks of ``ResponseValidator``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "server"))
+
+from app.response_validator import ResponseValidator, find_error_marker  # noqa: E402
+
+SOURCE = "Hast du heute Abend Zeit? Wir könnten zusammen essen gehen und danach ins Kino. "
+OUTPUT = "Do you have time tonight? We could go out to eat together and then to the cinema. "
+
+_PREFIXES = ("error:", "openrouter", "payment required", "insufficient balance", "rate limit", "unauthorized")
+_FRAGMENTS = ("insufficient balance", "payment required", "api key", "quota exceeded", "retry-after", "status code")
+
+
+def full_scan(text: str) -> bool:
+    normalized = text.strip().lower()
+    if not normalized:
+        return True
+    if any(normalized.startswith(prefix) for prefix in _PREFIXES):
+        return True
+    return any(fragment in normalized for fragment in _FRAGMENTS)
+
+
+def _time_us(func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def run(sizes: list[int]) -> list[dict]:
+    validator = ResponseValidator()
+    results = []
+    for size in sizes:
+        source = (SOURCE * (size // len(SOURCE) + 1))[:size]
+        output = (OUTPUT * (size // len(OUTPUT) + 1))[:size]
+        iterations = max(5, 2_000_000 // max(size, 1))
+        results.append(
+            {
+                "output_chars": size,
+                "full_scan_us": round(_time_us(lambda: full_scan(output), iterations), 2),
+                "error_marker_us": round(_time_us(lambda: find_error_marker(output), iterations), 2),
+                "validator_us": round(
+                    _time_us(lambda: (find_error_marker(output), validator.check(source, output, "incoming")), iterations),
+                    2,
+                ),
+            }
+        )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="200,10000,100000,1000000", help="comma-separated output sizes in chars")
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(",") if size.strip()])
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'output_chars':>12} {'full_scan_us':>13} {'error_marker_us':>16} {'validator_us':>13}")
+    for row in results:
+        print(
+            f"{row['output_chars']:>12} {row['full_scan_us']:>13} {row['error_marker_us']:>16} {row['validator_us']:>13}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
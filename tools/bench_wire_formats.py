@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Bytes on the wire and server CPU per request for each /translate encoding.
+
+Usage: python tools/bench_wire_formats.py [--iterations 2000] [--context 100] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "server"))
+
+from app import wire  # noqa: E402
+from app.models import TranslateRequest, TranslateResponse  # noqa: E402
+
+
+def _sample_request(context_size: int) -> dict:
+    return {
+        "text": "Hast du heute Abend Zeit? Wir könnten zusammen essen gehen und danach ins Kino.",
+        "direction": "incoming",
+        "chat_id": "-1001234567890",
+        "context": [
+            {
+                "role": "them" if i % 2 else "me",
+                "text": f"Nachricht {i}: Ich bin gleich da, warte bitte noch ein paar Minuten am Eingang.",
+            }
+            for i in range(context_size)
+        ],
+    }
+
+
+def _encodings() -> list[tuple[str, str, str | None]]:
+    media_types = [wire.JSON_MEDIA_TYPE]
+    if wire.msgpack is not None:
+        media_types.append(wire.MSGPACK_MEDIA_TYPE)
+    rows = []
+    for media_type in media_types:
+        for encoding in (None, *wire.supported_encodings()):
+            label = ("msgpack" if media_type == wire.MSGPACK_MEDIA_TYPE else "json") + (f"+{encoding}" if encoding else "")
+            rows.append((label, media_type, encoding))
+    return rows
+
+
+def run(iterations: int, context_size: int) -> list[dict]:
+    request_model = TranslateRequest.model_validate(_sample_request(context_size))
+    response_model = TranslateResponse(
+        translated_text="Do you have time tonight? We could go out to eat and then to the cinema.",
+        original_text=request_model.text,
+        direction="incoming",
+        translation_failed=False,
+    )
+
+    results = []
+    for label, media_type, encoding in _encodings():
+        request_body = wire.encode_model(request_model, media_type)
+        if encoding:
+            request_body = wire.compress(request_body, encoding)
+        response_body = wire.encode_model(response_model, media_type)
+        if encoding and len(response_body) >= wire.MIN_COMPRESS_BYTES:
+            response_body = wire.compress(response_body, encoding)
+
+        cpu_started = time.process_time()
+        for _ in range(iterations):
+            decoded = wire.decode_body(request_body, encoding)
+            wire.parse_model(TranslateRequest, decoded, media_type)
+            body = wire.encode_model(response_model, media_type)
+            if encoding and len(body) >= wire.MIN_COMPRESS_BYTES:
+                wire.compress(body, encoding)
+        cpu_us = (time.process_time() - cpu_started) / iterations * 1_000_000
+
+        results.append(
+            {
+                "encoding": label,
+                "request_bytes": len(request_body),
+                "response_bytes": len(response_body),
+                "server_cpu_us_per_request": round(cpu_us, 1),
+            }
+        )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--context", type=int, default=100, help="number of context messages per request")
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.context)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'encoding':<16} {'request_bytes':>14} {'response_bytes':>15} {'cpu_us/request':>15}")
+    for row in results:
+        print(
+            f"{row['encoding']:<16} {row['request_bytes']:>14} {row['response_bytes']:>15} "
+            f"{row['server_cpu_us_per_request']:>15}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
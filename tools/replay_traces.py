@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""Replay recorded /translate traces with their original inter-arrival times.
+
+Examples:
+  python tools/replay_traces.py server/traces/translate_trace.jsonl --speed 4
+  python tools/replay_traces.py server/traces/translate_trace.jsonl* --stub-latency-ms 1200 --stub-empty-rate 0.05
+  python tools/replay_traces.py trace.jsonl --target http://127.0.0.1:8080 --json
+
+Without --target, an in-process proxy is built from config/proxy.config.json with its upstream
+replaced by a stub that answers after a log-normal delay. Message texts and contexts are
+synthesized from the recorded lengths, so traces never need to contain real chat content.
+The report starts with the scheduler, retry and routing settings of the replay run, so that
+differences from the recorded run can be attributed to them.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import math
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "server"))
+
+from app.config import load_settings  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.openrouter_client import OpenRouterClient  # noqa: E402
+
+
+def load_traces(paths: list[Path], limit: int | None) -> list[dict]:
+    traces = []
+    for path in paths:
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    traces.append(json.loads(line))
+    traces.sort(key=lambda item: item["ts"])
+    return traces[:limit] if limit else traces
+
+
+def synthesize_request(trace: dict, rng: random.Random) -> dict:
+    def words(chars: int) -> str:
+        text = ""
+        while len(text) < chars:
+            text += "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) + " "
+        return text[:chars]
+
+    body = {
+        "text": words(max(1, int(trace.get("text_chars", 1)))),
+        "direction": trace.get("direction", "incoming"),
+        "context": [
+            {"role": "me" if index % 2 else "them", "text": words(40)}
+            for index in range(min(100, int(trace.get("context_size", 0))))
+        ],
+    }
+    if trace.get("chat") and trace["chat"] != "none":
+        body["chat_id"] = f"replay-{trace['chat']}"
+    return body
+
+
+def stub_upstream(latency_ms: float, jitter: float, empty_rate: float, rng: random.Random):
+    sigma = max(jitter, 1e-6)
+    mu = math.log(max(latency_ms, 1.0)) - sigma**2 / 2
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(rng.lognormvariate(mu, sigma) / 1000.0)
+        content = "" if rng.random() < empty_rate else "stub translation"
+        return httpx.Response(
+            200,
+            json={
+                "model": json.loads(request.content).get("model"),
+                "choices": [{"message": {"content": content}}],
+                "usage": {"prompt_tokens": len(request.content) // 4, "completion_tokens": 8},
+            },
+        )
+
+    return handler
+
+
+def build_in_process_client(args: argparse.Namespace, rng: random.Random) -> tuple[httpx.AsyncClient, object]:
+    scratch = Path(tempfile.mkdtemp(prefix="replay-"))
+    settings = dataclasses.replace(
+        load_settings(args.config),
+        openrouter_api_key="replay-stub",
+        log_file=scratch / "server.log",
+        usage_rollup_file=None,
+        trace_enabled=False,
+    )
+    logger = logging.getLogger("replay.proxy")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    upstream = httpx.AsyncClient(
+        transport=httpx.MockTransport(stub_upstream(args.stub_latency_ms, args.stub_jitter, args.stub_empty_rate, rng))
+    )
+    app = create_app(
+        settings=settings,
+        logger=logger,
+        openrouter_client=OpenRouterClient(settings, logger, http_client=upstream),
+    )
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay", timeout=None)
+    return client, app
+
+
+def describe_settings(settings) -> dict:
+    if settings.scheduler_enabled:
+        scheduler = (
+            f"max_concurrency={settings.scheduler_max_concurrency} "
+            f"per_chat_inflight={settings.scheduler_per_chat_inflight} (under contention) "
+            f"quantum={settings.scheduler_quantum:g} cost_chars={settings.scheduler_cost_chars}"
+        )
+    else:
+        scheduler = "off"
+
+    retry_cfg = settings.retry_config or {}
+    rules = " ".join(
+        f"{name}={rule.get('max_retries', '?')}" for name, rule in (retry_cfg.get("rules") or {}).items()
+    )
+    budget = retry_cfg.get("budget") or {}
+    retry = f"max_retries {rules or 'defaults'}; budget ratio={budget.get('ratio', 'default')}"
+
+    routing_cfg = settings.routing_config or {}
+    if routing_cfg.get("enabled", True) and routing_cfg.get("tiers"):
+        tiers = ", ".join(
+            f"{tier.get('name', '?')}->{tier.get('model') or settings.openrouter_model}" for tier in routing_cfg["tiers"]
+        )
+        routing = f"tiers {tiers}"
+    else:
+        routing = f"off (model {settings.openrouter_model})"
+    return {"scheduler": scheduler, "retry": retry, "routing": routing}
+
+
+async def describe_target(client: httpx.AsyncClient) -> dict:
+    unknown = "not reported by target"
+    try:
+        response = await client.get("/stats")
+        stats = response.json() if response.status_code == 200 else None
+    except (httpx.HTTPError, ValueError):
+        stats = None
+    if not isinstance(stats, dict):
+        return {"scheduler": unknown, "retry": unknown, "routing": unknown}
+    scheduler = stats.get("scheduler")
+    routing = stats.get("routing")
+    return {
+        "scheduler": (
+            f"max_concurrency={scheduler['max_concurrency']} "
+            f"per_chat_inflight={scheduler['per_chat_inflight']} (under contention)"
+            if scheduler
+            else "off"
+        ),
+        "retry": unknown,
+        "routing": (
+            "tiers " + ", ".join(f"{name}->{tier['model']}" for name, tier in routing["tiers"].items())
+            if routing
+            else "off"
+        ),
+    }
+
+
+async def replay(traces: list[dict], args: argparse.Namespace) -> tuple[list[dict], float, dict]:
+    rng = random.Random(args.seed)
+    app = None
+    if args.target:
+        client = httpx.AsyncClient(base_url=args.target, timeout=args.timeout)
+        settings = await describe_target(client)
+        settings["upstream"] = f"target {args.target}"
+    else:
+        client, app = build_in_process_client(args, rng)
+        settings = describe_settings(app.state.settings)
+        settings["upstream"] = (
+            f"stub median={args.stub_latency_ms:g}ms jitter={args.stub_jitter:g} "
+            f"empty_rate={args.stub_empty_rate:g}"
+        )
+
+    results: list[dict] = []
+
+    async def send(body: dict) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/translate", json=body)
+            failed = response.status_code != 200 or response.json().get("translation_failed", True)
+        except httpx.HTTPError:
+            failed = True
+        results.append({"latency_ms": (time.perf_counter() - started) * 1000.0, "failed": failed})
+
+    lifespan = app.router.lifespan_context(app) if app is not None else None
+    if lifespan is not None:
+        await lifespan.__aenter__()
+    try:
+        first_ts = traces[0]["ts"]
+        wall_started = time.perf_counter()
+        tasks = []
+        for trace in traces:
+            due = (trace["ts"] - first_ts) / args.speed
+            delay = due - (time.perf_counter() - wall_started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(synthesize_request(trace, rng))))
+        await asyncio.gather(*tasks)
+        wall_seconds = time.perf_counter() - wall_started
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+        await client.aclose()
+    return results, wall_seconds, settings
+
+
+def summarize(label: str, latencies: list[float], failures: int, duration_seconds: float) -> dict:
+    ordered = sorted(latencies)
+
+    def quantile(q: float) -> float:
+        if not ordered:
+            return 0.0
+        return round(ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))], 1)
+
+    return {
+        "run": label,
+        "requests": len(ordered),
+        "duration_s": round(duration_seconds, 2),
+        "fallback_rate": round(failures / len(ordered), 4) if ordered else 0.0,
+        "p50_ms": quantile(0.50),
+        "p95_ms": quantile(0.95),
+        "p99_ms": quantile(0.99),
+        "max_ms": round(ordered[-1], 1) if ordered else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traces", nargs="+", type=Path, help="trace JSONL files (rotated files included)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (2 = twice as fast)")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the first N requests")
+    parser.add_argument("--target", default=None, help="base URL of a running proxy; default is in-process")
+    parser.add_argument("--timeout", type=float, default=120.0, help="HTTP timeout when using --target")
+    parser.add_argument("--config", type=Path, default=None, help="proxy config for the in-process proxy")
+    parser.add_argument("--stub-latency-ms", type=float, default=800.0, help="median stub upstream latency")
+    parser.add_argument("--stub-jitter", type=float, default=0.3, help="log-normal sigma of stub latency")
+    parser.add_argument("--stub-empty-rate", type=float, default=0.0, help="share of empty stub completions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    traces = [item for item in load_traces(args.traces, args.limit) if item.get("outcome") != "cancelled"]
+    if not traces:
+        parser.error("no replayable traces found")
+
+    results, wall_seconds, settings = asyncio.run(replay(traces, args))
+    recorded = summarize(
+        "recorded",
+        [float(item.get("latency_ms", 0.0)) for item in traces],
+        sum(1 for item in traces if item.get("outcome") == "fallback"),
+        traces[-1]["ts"] - traces[0]["ts"],
+    )
+    replayed = summarize(
+        f"replay x{args.speed:g}",
+        [item["latency_ms"] for item in results],
+        sum(1 for item in results if item["failed"]),
+        wall_seconds,
+    )
+    rows = [recorded, replayed]
+
+    if args.json:
+        print(json.dumps({"settings": settings, "runs": rows}, indent=2))
+        return 0
+
+    for name, value in settings.items():
+        print(f"{name + ':':<11} {value}")
+    print()
+    print(
+        f"{'run':<14} {'requests':>8} {'duration_s':>10} {'fallback':>9} "
+        f"{'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'max_ms':>9}"
+    )
+    for row in rows:
+        print(
+            f"{row['run']:<14} {row['requests']:>8} {row['duration_s']:>10} {row['fallback_rate']:>9.2%} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Replay upstream error sequences against a retry policy and report the expected latency.
+
+Examples:
+  python tools/retry_simulator.py timeout,timeout,success
+  python tools/retry_simulator.py empty_response rate_limit,success --retry-after 3 --json
+  python tools/retry_simulator.py timeout --config config/proxy.config.json --timeout-ms 15000
+
+Each sequence lists the outcome of consecutive attempts (success, empty_response, timeout,
+rate_limit, billing); the last outcome repeats until the policy gives up.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "server"))
+
+from app.config import DEFAULT_CONFIG_FILE  # noqa: E402
+from app.retry_policy import TIMEOUT, RetryPolicy, simulate  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sequences", nargs="+", help="comma-separated attempt outcomes")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG_FILE, help="proxy config with a retry section")
+    parser.add_argument("--default-policy", action="store_true", help="ignore the config and use built-in defaults")
+    parser.add_argument("--attempt-ms", type=float, default=800.0, help="latency of a non-timeout attempt")
+    parser.add_argument("--timeout-ms", type=float, default=15000.0, help="latency of a timed-out attempt")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--trials", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="emit JSON instead of a table")
+    args = parser.parse_args()
+
+    retry_config = {}
+    if not args.default_policy and args.config.exists():
+        retry_config = json.loads(args.config.read_text(encoding="utf-8")).get("retry", {})
+    policy = RetryPolicy.from_config(retry_config)
+    latency = {"default": args.attempt_ms, TIMEOUT: args.timeout_ms}
+
+    rows = []
+    for raw in args.sequences:
+        sequence = [item.strip() for item in raw.split(",") if item.strip()]
+        result = simulate(
+            policy,
+            sequence,
+            attempt_latency_ms=latency,
+            retry_after=args.retry_after,
+            trials=args.trials,
+        )
+        rows.append(
+            {
+                "sequence": ",".join(sequence),
+                "outcome": result.outcome,
+                "attempts": result.attempts,
+                "mean_ms": result.mean_latency_ms,
+                "p50_ms": result.p50_latency_ms,
+                "p95_ms": result.p95_latency_ms,
+                "max_ms": result.max_latency_ms,
+            }
+        )
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    print(f"{'sequence':<40} {'outcome':<24} {'attempts':>8} {'mean_ms':>10} {'p50_ms':>10} {'p95_ms':>10}")
+    for row in rows:
+        print(
+            f"{row['sequence']:<40} {row['outcome']:<24} {row['attempts']:>8} "
+            f"{row['mean_ms']:>10.1f} {row['p50_ms']:>10.1f} {row['p95_ms']:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())